@@ -1,22 +1,21 @@
 import os
+import sys
 import ast
 from functools import wraps
-from typing import Dict, Optional, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
-from flask import Flask, request
-from flask_restx import Api, Resource, fields
+from flask import Flask, current_app, request
+from flask_restx import Api, Namespace, Resource, fields
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
 
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load environment variables
-load_dotenv()
+from common import admission, compression, json_provider, metrics, profiling, tracing
+from config import DevelopmentConfig
 
-# Initialize Flask app
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your_secret_key')
 
 # Configure Swagger UI Authorization
 authorizations = {
@@ -28,18 +27,8 @@ authorizations = {
     }
 }
 
-# Initialize API with authorization
-api = Api(
-    app,
-    version='1.0',
-    title='Authorization Service',
-    description='A service for handling authentication and authorization with JWT tokens',
-    authorizations=authorizations,
-    security='Bearer Auth'
-)
-
 # Namespace
-auth_ns = api.namespace(
+auth_ns = Namespace(
     'auth',
     description='Authorization operations including token validation'
 )
@@ -95,7 +84,7 @@ def token_required(roles: Optional[list] = None):
             try:
                 data = jwt.decode(
                     token,
-                    app.config['SECRET_KEY'],
+                    current_app.config['SECRET_KEY'],
                     algorithms=['HS256']
                 )
 
@@ -141,18 +130,72 @@ class TokenValidation(Resource):
         except IndexError:
             return {'message': 'Invalid Authorization header'}, 401
 
-        try:
-            data = jwt.decode(
-                token,
-                app.config['SECRET_KEY'],
-                algorithms=['HS256']
-            )
-            return data, 200
-        except jwt.ExpiredSignatureError:
-            return {'message': 'Token has expired'}, 401
-        except jwt.InvalidTokenError:
-            return {'message': 'Invalid token'}, 401
+        return decode_token(token, current_app.config['SECRET_KEY'])
+
+
+def decode_token(token: str, secret_key: str) -> Tuple[Dict, int]:
+    """
+    Decode a JWT token signed with ``secret_key``.
+
+    Returns:
+        Tuple[Dict, int]: Decoded token data or error message with status code
+    """
+    try:
+        return jwt.decode(token, secret_key, algorithms=['HS256']), 200
+    except jwt.ExpiredSignatureError:
+        return {'message': 'Token has expired'}, 401
+    except jwt.InvalidTokenError:
+        return {'message': 'Invalid token'}, 401
+
+
+def token_validator(app: Flask) -> Callable[[str], Optional[Dict]]:
+    """
+    In-process equivalent of ``GET /auth/validate`` for services running
+    in the same process as ``app``.
+
+    Returns:
+        Callable: Maps a token to its decoded data, or None if it is invalid
+    """
+    def validate(token: str) -> Optional[Dict]:
+        data, status = decode_token(token, app.config['SECRET_KEY'])
+        return data if status == 200 else None
+    return validate
+
+
+def create_app(config=DevelopmentConfig):
+    """
+    Build the auth service application.
+
+    Args:
+        config: Config class or import path passed to ``config.from_object``
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
+
+    # Initialize API with authorization
+    api = Api(
+        app,
+        version='1.0',
+        title='Authorization Service',
+        description='A service for handling authentication and authorization with JWT tokens',
+        authorizations=authorizations,
+        security='Bearer Auth'
+    )
+    api.add_namespace(auth_ns)
+    json_provider.init_app(app, api)
+    compression.init_app(app)
+
+    metrics.init_app(app, 'auth_service')
+    tracing.init_app(app, 'auth_service')
+    admission.init_app(app, 'auth_service')
+    profiling.init_app(app)
+
+    return app
 
 
 if __name__ == '__main__':
-    app.run(port=5006, debug=True)
+    app = create_app()
+    app.run(port=5006)
@@ -0,0 +1,29 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py (from this directory)
+import os
+import sys
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.workers import post_fork, worker_count  # noqa: F401 (gunicorn hook)
+
+wsgi_app = "app:create_app('config.ProductionConfig')"
+# Comma-separated; e.g. BIND=0.0.0.0:5006,unix:/run/travel/auth.sock
+bind = os.getenv('BIND', '0.0.0.0:5006').split(',')
+
+# Token validation is a short CPU-bound JWT decode: scale with processes
+# and keep only a couple of threads per worker for overlapping socket I/O.
+worker_class = 'gthread'
+workers = worker_count(per_cpu=2, extra=1)
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
+
+# Build the app once in the master and fork workers from it
+preload_app = True
+
+# Recycle workers gradually so no long-lived process accumulates state
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = 30
+keepalive = 5
@@ -1,5 +1,13 @@
+import os
+import sys
 import warnings
 
+# Make the shared ``common`` package importable for the service modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+
 def pytest_configure(config):
     warnings.filterwarnings(
         "ignore", 
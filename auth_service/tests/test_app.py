@@ -1,9 +1,12 @@
 import unittest
-from app import app
+from app import create_app
 import jwt
 from datetime import datetime, timedelta
 
 
+app = create_app()
+
+
 class AuthServiceTests(unittest.TestCase):
 
     def setUp(self):
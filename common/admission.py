@@ -0,0 +1,203 @@
+# common/admission.py
+"""
+Admission control: per-endpoint concurrency limits with load shedding.
+
+Every worker thread busy with an expensive endpoint (password hashing on
+``/user/login`` and ``/user/register``) is one that cannot serve a cheap
+one, so under a spike the cheap endpoints queue behind the expensive
+ones and time out as well. ``init_app`` caps how many requests of each
+configured endpoint run at once; requests over the cap wait in a small
+bounded queue and are answered with an immediate ``503`` and
+``Retry-After`` when the queue is full or their wait runs out. The
+threads left over keep serving everything else.
+
+The wait is adaptive (the "adaptive CoDel" policy): while the queue
+keeps emptying, a request may wait up to ``ADMISSION_INTERVAL_MS`` to
+absorb a burst; once the queue has not been empty for a whole interval
+it is a standing queue, i.e. the endpoint is overloaded, and waits are
+cut to ``ADMISSION_TARGET_MS`` so excess requests are shed in
+milliseconds instead of holding threads until they time out anyway.
+
+``ADMISSION_LIMITS`` is a comma-separated list of
+``endpoint=limit[:queue]`` (Flask endpoint names, as in the metrics'
+``endpoint`` label; ``*`` applies to every other endpoint) or a dict of
+the same; the queue defaults to the limit. Endpoints without a limit are
+not controlled.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+from flask import Flask, g, request
+
+from common import metrics
+
+DEFAULTS = {
+    'ADMISSION_LIMITS': '',
+    'ADMISSION_TARGET_MS': 5,
+    'ADMISSION_INTERVAL_MS': 100,
+    'ADMISSION_RETRY_AFTER': 1,
+}
+
+# Endpoint key applying to every endpoint without its own limit
+ANY_ENDPOINT = '*'
+
+REJECTED = metrics.counter(
+    'admission_rejected_total',
+    'Requests shed by admission control',
+    ['service', 'endpoint', 'reason']
+)
+QUEUE_WAIT_SECONDS = metrics.histogram(
+    'admission_queue_wait_seconds',
+    'Time admitted requests spent waiting for a concurrency slot',
+    ['service', 'endpoint']
+)
+
+
+def parse_limits(spec: Union[str, Dict, None]) -> Dict[str, Tuple[int, int]]:
+    """
+    Map each endpoint to its (limit, queue) from an ``ADMISSION_LIMITS`` value.
+
+    Raises:
+        ValueError: If an entry is malformed or a limit is not positive
+    """
+    if isinstance(spec, dict):
+        items = [(endpoint, str(value)) for endpoint, value in spec.items()]
+    else:
+        items = []
+        for part in (spec or '').split(','):
+            if part.strip():
+                endpoint, separator, value = part.partition('=')
+                if not separator:
+                    raise ValueError(f'Expected endpoint=limit[:queue], got {part!r}')
+                items.append((endpoint.strip(), value.strip()))
+    limits = {}
+    for endpoint, value in items:
+        limit, _, queue = value.partition(':')
+        limit = int(limit)
+        queue = int(queue) if queue else limit
+        if limit < 1 or queue < 0:
+            raise ValueError(f'Invalid admission limit for {endpoint}: {value!r}')
+        limits[endpoint] = (limit, queue)
+    return limits
+
+
+class AdmissionLimiter:
+    """
+    At most ``limit`` concurrent holders; up to ``queue`` more may wait.
+
+    ``acquire`` returns None once a slot is held (``release`` it
+    afterwards) or the reason it was refused: ``queue_full`` or
+    ``timeout``.
+    """
+
+    def __init__(self, limit: int, queue: int, target: float = 0.005,
+                 interval: float = 0.1, clock=time.monotonic):
+        self.limit = limit
+        self.queue = queue
+        self.target = target
+        self.interval = interval
+        self._clock = clock
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self._last_empty = clock()
+
+    def overloaded(self) -> bool:
+        """True if the queue has not been empty for a whole interval"""
+        return self.waiting > 0 and self._clock() - self._last_empty > self.interval
+
+    def acquire(self) -> Optional[str]:
+        with self._condition:
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                self._last_empty = self._clock()
+                return None
+            if self.waiting >= self.queue:
+                return 'queue_full'
+            timeout = self.target if self.overloaded() else self.interval
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.active < self.limit, timeout
+                )
+            finally:
+                self.waiting -= 1
+                if not self.waiting:
+                    self._last_empty = self._clock()
+            if not admitted:
+                return 'timeout'
+            self.active += 1
+            return None
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+def init_app(app: Flask, service: str) -> Dict[str, AdmissionLimiter]:
+    """
+    Apply ``app``'s ``ADMISSION_*`` config to its requests.
+
+    Call it after ``metrics.init_app`` so shed requests are counted as
+    503 responses.
+
+    Args:
+        app: Flask application to protect
+        service: Value of the ``service`` label on admission metrics
+
+    Returns:
+        Dict[str, AdmissionLimiter]: Limiter per configured endpoint
+    """
+    for key, value in DEFAULTS.items():
+        app.config.setdefault(key, value)
+    target = app.config['ADMISSION_TARGET_MS'] / 1000
+    interval = app.config['ADMISSION_INTERVAL_MS'] / 1000
+    retry_after = str(app.config['ADMISSION_RETRY_AFTER'])
+    limits = parse_limits(app.config['ADMISSION_LIMITS'])
+    default = limits.pop(ANY_ENDPOINT, None)
+    limiters = {
+        endpoint: AdmissionLimiter(limit, queue, target, interval)
+        for endpoint, (limit, queue) in limits.items()
+    }
+    app.extensions['admission_limiters'] = limiters
+    lock = threading.Lock()
+
+    def limiter_for(endpoint: str) -> Optional[AdmissionLimiter]:
+        limiter = limiters.get(endpoint)
+        if limiter is None and default is not None:
+            with lock:
+                limiter = limiters.setdefault(
+                    endpoint, AdmissionLimiter(*default, target, interval)
+                )
+        return limiter
+
+    @app.before_request
+    def _admit_request():
+        endpoint = request.endpoint or 'unmatched'
+        limiter = limiter_for(endpoint)
+        if limiter is None:
+            return None
+        start = time.perf_counter()
+        refused = limiter.acquire()
+        if refused is not None:
+            REJECTED.inc(service=service, endpoint=endpoint, reason=refused)
+            return (
+                {'message': 'Service overloaded, please retry later'},
+                503,
+                {'Retry-After': retry_after}
+            )
+        g._admission_limiter = limiter
+        QUEUE_WAIT_SECONDS.observe(
+            time.perf_counter() - start, service=service, endpoint=endpoint
+        )
+        return None
+
+    @app.teardown_request
+    def _release_request(exc):
+        limiter = g.pop('_admission_limiter', None)
+        if limiter is not None:
+            limiter.release()
+
+    return limiters
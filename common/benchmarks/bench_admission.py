@@ -0,0 +1,122 @@
+# common/benchmarks/bench_admission.py
+"""
+Latency of a cheap endpoint while an expensive one is flooded, with and
+without admission control.
+
+A fixed pool of ``--threads`` server threads (as in a gthread worker)
+serves a password-hash-like endpoint (PBKDF2, which releases the GIL)
+and a cheap JSON endpoint. ``--flood`` closed-loop clients hit the
+expensive endpoint back to back while ``--cheap`` clients call the cheap
+one; flooding clients pause ``--backoff`` after a 503. Reports cheap
+p50/p99 (including time queued for a server thread) and the expensive
+endpoint's throughput and share of 503s. The clients run in the same
+process, so on few cores the shed requests visibly take CPU from hashing.
+
+Usage (from the repository root):
+    python -m common.benchmarks.bench_admission --threads 8 --flood 32 --limit 2
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+from common import admission
+from loadtest.stats import percentile
+
+
+def build_app(limits: str, args) -> Flask:
+    app = Flask(__name__)
+    app.config.update(ADMISSION_LIMITS=limits, ADMISSION_TARGET_MS=args.target,
+                      ADMISSION_INTERVAL_MS=args.interval)
+
+    @app.route('/login')
+    def login():
+        hashlib.pbkdf2_hmac('sha256', b'password', b'salt', args.iterations)
+        return {'token': 'x'}
+
+    @app.route('/destinations')
+    def destinations():
+        return {'destinations': []}
+
+    admission.init_app(app, 'bench_admission')
+    return app
+
+
+def run(app: Flask, args) -> dict:
+    server = ThreadPoolExecutor(max_workers=args.threads)
+    local = threading.local()
+    stop = threading.Event()
+    cheap, statuses = [], []
+
+    def handle(path):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        return local.client.get(path).status_code
+
+    def flood():
+        while not stop.is_set():
+            status = server.submit(handle, '/login').result()
+            # Requests finishing after the window are not counted
+            if not stop.is_set():
+                statuses.append(status)
+            if status == 503:
+                time.sleep(args.backoff)
+
+    def browse():
+        while not stop.is_set():
+            start = time.perf_counter()
+            server.submit(handle, '/destinations').result()
+            if not stop.is_set():
+                cheap.append(time.perf_counter() - start)
+            time.sleep(args.pause)
+
+    clients = [threading.Thread(target=flood) for _ in range(args.flood)]
+    clients += [threading.Thread(target=browse) for _ in range(args.cheap)]
+    for client in clients:
+        client.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for client in clients:
+        client.join()
+    server.shutdown()
+    cheap.sort()
+    return {
+        'cheap_p50': percentile(cheap, 50), 'cheap_p99': percentile(cheap, 99),
+        'hashed': statuses.count(200) / args.seconds,
+        'shed': statuses.count(503) / max(1, len(statuses)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, default=8, help='server threads')
+    parser.add_argument('--flood', type=int, default=32, help='expensive-endpoint clients')
+    parser.add_argument('--cheap', type=int, default=2, help='cheap-endpoint clients')
+    parser.add_argument('--pause', type=float, default=0.005,
+                        help='pause between cheap requests (seconds)')
+    parser.add_argument('--backoff', type=float, default=0.05,
+                        help='pause of a flooding client after a 503 (seconds)')
+    parser.add_argument('--limit', type=int, default=os.cpu_count() or 1,
+                        help='concurrency limit of the expensive endpoint')
+    parser.add_argument('--queue', type=int, default=None, help='its wait queue (default: limit)')
+    parser.add_argument('--target', type=int, default=5, help='ADMISSION_TARGET_MS')
+    parser.add_argument('--interval', type=int, default=100, help='ADMISSION_INTERVAL_MS')
+    parser.add_argument('--iterations', type=int, default=200000, help='PBKDF2 iterations')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    queue = args.limit if args.queue is None else args.queue
+    print(f'{"admission":<12}{"cheap p50 ms":>14}{"cheap p99 ms":>14}'
+          f'{"hashes/s":>10}{"shed":>8}')
+    for mode, limits in (('off', ''), ('on', f'login={args.limit}:{queue}')):
+        result = run(build_app(limits, args), args)
+        print(f'{mode:<12}{result["cheap_p50"] * 1e3:>14.2f}{result["cheap_p99"] * 1e3:>14.2f}'
+              f'{result["hashed"]:>10.1f}{result["shed"]:>8.0%}')
+
+
+if __name__ == '__main__':
+    main()
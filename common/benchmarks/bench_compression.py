@@ -0,0 +1,58 @@
+# common/benchmarks/bench_compression.py
+"""
+CPU-versus-bytes trade-off of response compression on listing payloads.
+
+For each payload (see ``bench_json``) and each encoding/level, reports
+the compressed size, the ratio, the time to compress once and the time
+of a cache hit (the digest of the body plus a dictionary lookup).
+
+Usage (from the repository root):
+    python -m common.benchmarks.bench_compression --destinations 10000 --users 10000
+"""
+import argparse
+
+from common import compression, json_provider
+from common.benchmarks.bench_json import best_of, destinations_payload, users_payload
+
+LEVELS = {'gzip': (1, 4, 6, 9), 'br': (1, 4, 6, 9, 11)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backend = json_provider.get_backend()
+    bodies = {
+        '/destinations/': backend.dumps(destinations_payload(args.destinations)),
+        '/user/list': backend.dumps(users_payload(args.users)),
+    }
+    print(f'{"payload":<16} {"coding":<8} {"size":>9} {"ratio":>6}'
+          f' {"compress":>10} {"MB/s":>7} {"cached":>9}')
+    for name, body in bodies.items():
+        print(f'{name:<16} {"identity":<8} {len(body) / 1024:7.0f}KB')
+        for encoding in compression.supported_encodings()[::-1]:
+            for level in LEVELS[encoding]:
+                compressed = compression.compress(body, encoding, level)
+                elapsed = best_of(
+                    lambda: compression.compress(body, encoding, level), args.repeat
+                )
+                cache = compression.CompressedBodyCache()
+                cache.get_or_compress(body, encoding, level)
+                cached = best_of(
+                    lambda: cache.get_or_compress(body, encoding, level), args.repeat
+                )
+                print(
+                    f'{name:<16} {encoding + "-" + str(level):<8}'
+                    f' {len(compressed) / 1024:7.0f}KB'
+                    f' {len(body) / len(compressed):5.1f}x'
+                    f' {elapsed * 1000:8.2f}ms'
+                    f' {len(body) / elapsed / 2**20:7.1f}'
+                    f' {cached * 1000:7.3f}ms'
+                )
+
+
+if __name__ == '__main__':
+    main()
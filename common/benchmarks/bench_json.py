@@ -0,0 +1,94 @@
+# common/benchmarks/bench_json.py
+"""
+Encoder throughput of the JSON backends on list-endpoint payloads.
+
+Payloads mirror ``GET /destinations/`` (a list of destination records)
+and ``GET /user/list`` (email -> {name, role}). Each backend encodes the
+payload ``--repeat`` times, both directly and through the flask-restx
+``application/json`` representation.
+
+Usage (from the repository root):
+    python -m common.benchmarks.bench_json --destinations 10000 --users 100000
+"""
+import argparse
+import random
+import time
+
+from flask import Flask
+
+from common import json_provider
+
+LOCATIONS = ['Maldives', 'Japan', 'France', 'Peru', 'Kenya', 'Iceland', 'Italy']
+
+
+def destinations_payload(count: int):
+    rng = random.Random(1)
+    return [
+        {
+            'id': str(i),
+            'name': f'{rng.choice(["Sea", "City", "Hill", "Lake"])} Hotel {i}',
+            'description': 'Modern urban experience with a view of the old town',
+            'location': rng.choice(LOCATIONS),
+            'price_per_night': round(rng.uniform(40, 900), 2),
+        }
+        for i in range(count)
+    ]
+
+
+def users_payload(count: int):
+    return {
+        f'user{i}@example.com': {
+            'name': f'User {i}',
+            'role': 'Admin' if i % 10 == 0 else 'User',
+        }
+        for i in range(count)
+    }
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        '/destinations/': destinations_payload(args.destinations),
+        '/user/list': users_payload(args.users),
+    }
+    backends = ['stdlib'] + (['orjson'] if json_provider.orjson else [])
+    print(f'{"payload":<16} {"backend":<8} {"size":>9} {"encode":>10}'
+          f' {"MB/s":>8} {"response":>10}')
+    for name, payload in payloads.items():
+        baseline = None
+        for backend_name in backends:
+            backend = json_provider.get_backend(backend_name)
+            app = Flask(__name__)
+            app.config['JSON_BACKEND'] = backend_name
+            json_provider.init_app(app)
+            size = len(backend.dumps(payload))
+            encode = best_of(lambda: backend.dumps(payload), args.repeat)
+            with app.test_request_context():
+                response = best_of(
+                    lambda: json_provider.output_json(payload, 200), args.repeat
+                )
+            baseline = baseline or encode
+            print(
+                f'{name:<16} {backend_name:<8} {size / 1024:7.0f}KB'
+                f' {encode * 1000:8.2f}ms {size / encode / 2**20:8.1f}'
+                f' {response * 1000:8.2f}ms'
+                f'  x{baseline / encode:.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
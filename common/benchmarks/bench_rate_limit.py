@@ -0,0 +1,59 @@
+# common/benchmarks/bench_rate_limit.py
+"""
+Throughput of the in-process token buckets from concurrent request
+threads, by number of lock shards, and the cost of evicting idle buckets.
+
+Usage (from the repository root):
+    python -m common.benchmarks.bench_rate_limit --threads 1,4,16 --keys 100000
+"""
+import argparse
+import random
+import threading
+import time
+
+from common.rate_limit import TokenBuckets
+
+
+def run(buckets, threads, takes, keys):
+    def client(seed):
+        rng = random.Random(seed)
+        for _ in range(takes):
+            buckets.take(f'login:ip:{rng.randrange(keys)}', 0.5, 30)
+
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * takes / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', default='1,4,16')
+    parser.add_argument('--shards', default='1,16')
+    parser.add_argument('--takes', type=int, default=50000, help='takes per thread')
+    parser.add_argument('--keys', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f'{"shards":>8}{"threads":>9}{"takes/s":>12}')
+    for shards in [int(count) for count in args.shards.split(',')]:
+        for threads in [int(count) for count in args.threads.split(',')]:
+            buckets = TokenBuckets(shards, evict_every=3600)
+            rate = run(buckets, threads, args.takes, args.keys)
+            print(f'{shards:>8}{threads:>9}{rate:>12.0f}')
+
+    clock = [time.monotonic()]
+    buckets = TokenBuckets(16, evict_every=3600, clock=lambda: clock[0])
+    for key in range(args.keys):
+        buckets.take(f'login:ip:{key}', 0.5, 30)
+    clock[0] += 120
+    start = time.perf_counter()
+    evicted = buckets.evict_idle()
+    print(f'evicted {evicted} idle buckets in {(time.perf_counter() - start) * 1e3:.1f} ms'
+          f' (longest lock hold about 1/16 of that)')
+
+
+if __name__ == '__main__':
+    main()
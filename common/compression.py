@@ -0,0 +1,174 @@
+# common/compression.py
+"""
+Response compression negotiated through ``Accept-Encoding``.
+
+``init_app`` compresses eligible responses with brotli (when the
+``brotli`` package is installed) or gzip, whichever the client prefers.
+A response is left alone when it is smaller than ``COMPRESS_MIN_SIZE``,
+not of a ``COMPRESS_MIMETYPES`` type, streamed, already encoded or has
+no body. ``COMPRESS_LEVEL`` and ``COMPRESS_BR_LEVEL`` trade CPU for
+bytes (see ``common.benchmarks.bench_compression``).
+
+Listing endpoints return the same serialized body until the data
+changes, so compressed bodies are kept in an LRU cache keyed by the
+encoding, level and either the response's strong ETag or a SHA-256
+digest of the uncompressed bytes: a repeated body is compressed once
+and afterwards only looked up (or hashed). ``COMPRESS_CACHE_SIZE``
+bounds the number of entries (0 disables the cache). Compressed
+responses get the coding appended to their ETag, since the bytes differ.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import Flask, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised when brotli is absent
+    brotli = None
+
+DEFAULTS = {
+    'COMPRESS_MIN_SIZE': 500,
+    'COMPRESS_LEVEL': 6,
+    'COMPRESS_BR_LEVEL': 4,
+    'COMPRESS_CACHE_SIZE': 128,
+    'COMPRESS_MIMETYPES': (
+        'application/json', 'text/html', 'text/plain', 'text/css',
+        'application/javascript',
+    ),
+}
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Map each coding in an ``Accept-Encoding`` header to its q-value"""
+    accepted = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header: Optional[str],
+                    available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the available coding the client accepts with the highest
+    q-value, preferring earlier entries of ``available`` on ties.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    if encoding == 'gzip':
+        # Fixed mtime so identical bodies compress to identical bytes
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    raise ValueError(f'Unsupported encoding {encoding!r}')
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed bodies keyed by the input digest or ETag"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, body: bytes, encoding: str, level: int,
+                        etag: Optional[str] = None) -> bytes:
+        """
+        Compressed ``body``, reused when the same body (or strong ``etag``,
+        which must identify the body exactly) was compressed before.
+        """
+        if self.max_entries <= 0:
+            return compress(body, encoding, level)
+        identity = ('etag', etag) if etag else hashlib.sha256(body).digest()
+        key = (encoding, level, len(body), identity)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+        compressed = compress(body, encoding, level)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def init_app(app: Flask) -> CompressedBodyCache:
+    """
+    Compress ``app``'s responses according to its ``COMPRESS_*`` config.
+
+    Returns:
+        CompressedBodyCache: The cache used for compressed bodies
+    """
+    for key, value in DEFAULTS.items():
+        app.config.setdefault(key, value)
+    cache = CompressedBodyCache(app.config['COMPRESS_CACHE_SIZE'])
+    app.extensions['compression_cache'] = cache
+    mimetypes = frozenset(app.config['COMPRESS_MIMETYPES'])
+    levels = {'gzip': app.config['COMPRESS_LEVEL'], 'br': app.config['COMPRESS_BR_LEVEL']}
+
+    @app.after_request
+    def _compress_response(response):
+        if response.mimetype not in mimetypes:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+        encoding = choose_encoding(
+            request.headers.get('Accept-Encoding'), supported_encodings()
+        )
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        etag, weak = response.get_etag()
+        strong_etag = etag if etag and not weak else None
+        response.set_data(
+            cache.get_or_compress(body, encoding, levels[encoding], strong_etag)
+        )
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
+
+    return cache
@@ -0,0 +1,147 @@
+# common/json_provider.py
+"""
+Pluggable JSON encoding for the services.
+
+flask-restx encodes every resource response with the stdlib ``json``
+module, which dominates CPU on list endpoints. ``init_app`` replaces
+both the ``Api``'s ``application/json`` representation and ``app.json``
+with an encoder backed by orjson when it is installed, falling back to
+the stdlib otherwise. ``JSON_BACKEND`` (config or environment) selects
+``auto`` (default), ``orjson`` or ``stdlib``.
+
+The orjson output is compact and leaves non-ASCII characters unescaped,
+so bodies differ in whitespace from the stdlib's but decode to the same
+values; the trailing newline of flask-restx responses is kept. Compact
+``separators`` (as Flask's ``jsonify`` passes them) are what orjson
+writes anyway. Values orjson cannot encode the same way (integers beyond
+64 bits, other ``RESTX_JSON`` options) are handed to the stdlib encoder,
+and for ``app.json`` dates and dataclasses still go through Flask's own
+conversion.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask, current_app, make_response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+BACKEND_KEY = 'JSON_BACKEND'
+# The stdlib's most compact output, which is the only form orjson writes
+COMPACT_SEPARATORS = (',', ':')
+EXTENSION_KEY = 'json_backend'
+
+
+class StdlibBackend:
+    name = 'stdlib'
+
+    def dumps(self, obj: Any, indent: Optional[int] = None,
+              sort_keys: bool = False,
+              default: Optional[Callable] = None, **options) -> bytes:
+        return json.dumps(
+            obj, indent=indent, sort_keys=sort_keys, default=default, **options
+        ).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend:
+    name = 'orjson'
+    # Leave dates and dataclasses to ``default`` so Flask's formatting is kept
+    BASE_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    ) if orjson is not None else 0
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError('orjson is not installed')
+        self.fallback = StdlibBackend()
+
+    def dumps(self, obj: Any, indent: Optional[int] = None,
+              sort_keys: bool = False,
+              default: Optional[Callable] = None, **options) -> bytes:
+        if not indent and tuple(options.get('separators') or ()) == COMPACT_SEPARATORS:
+            # What Flask asks for outside debug mode; orjson's output already is
+            del options['separators']
+        if options:
+            # Stdlib-only options such as other ``separators`` or ``cls``
+            return self.fallback.dumps(obj, indent, sort_keys, default, **options)
+        flags = self.BASE_OPTIONS
+        if indent:
+            flags |= orjson.OPT_INDENT_2
+        if sort_keys:
+            flags |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=flags)
+        except orjson.JSONEncodeError as e:
+            if default is None and 'not JSON serializable' in str(e):
+                raise TypeError(str(e)) from e
+            # e.g. integers beyond 64 bits, which the stdlib encodes
+            return self.fallback.dumps(obj, indent, sort_keys, default)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def get_backend(name: Optional[str] = None):
+    """Backend for ``name`` (``auto``, ``orjson`` or ``stdlib``)"""
+    name = (name or os.getenv(BACKEND_KEY) or 'auto').lower()
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name == 'orjson':
+        return OrjsonBackend()
+    if name == 'stdlib':
+        return StdlibBackend()
+    raise ValueError(f'Unknown {BACKEND_KEY} {name!r}')
+
+
+def output_json(data, code: int, headers: Optional[Dict] = None):
+    """flask-restx representation for ``application/json``"""
+    backend = current_app.extensions[EXTENSION_KEY]
+    settings = dict(current_app.config.get('RESTX_JSON', {}))
+    if current_app.debug:
+        settings.setdefault('indent', 4)
+    response = make_response(backend.dumps(data, **settings) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``app.json`` provider encoding through the configured backend"""
+
+    def __init__(self, app: Flask, backend=None):
+        super().__init__(app)
+        self.backend = backend or get_backend()
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        indent = kwargs.pop('indent', None)
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        default = kwargs.pop('default', self.default)
+        kwargs.pop('ensure_ascii', None)
+        return self.backend.dumps(
+            obj, indent=indent, sort_keys=sort_keys, default=default, **kwargs
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self.backend.loads(s)
+
+
+def init_app(app: Flask, api=None) -> None:
+    """
+    Encode ``app``'s JSON (and ``api``'s resource responses) with the
+    backend selected by ``JSON_BACKEND``.
+    """
+    backend = get_backend(app.config.get(BACKEND_KEY))
+    app.extensions[EXTENSION_KEY] = backend
+    app.json = FastJSONProvider(app, backend)
+    if api is not None:
+        api.representations['application/json'] = output_json
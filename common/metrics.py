@@ -0,0 +1,271 @@
+# common/metrics.py
+"""
+Lightweight Prometheus-style metrics shared by all services.
+
+Metrics live in a process-wide registry and are rendered in the
+Prometheus text exposition format. ``init_app`` instruments every Flask
+endpoint (flask_restx resources included) with request counts, latency
+histograms, in-flight gauges and error counts, and serves the registry
+at ``/metrics``.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f'Missing label {e} for metric {self.name}')
+
+    def render(self) -> List[str]:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {value}'
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., overflow count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time spent inside the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        names = self.labelnames + ('le',)
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(names, key + (repr(float(bound)),))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            cumulative += state[-2]
+            labels = _format_labels(names, key + ('+Inf',))
+            yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {state[-1]}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+class Registry:
+    """Holds metrics by name; creating an existing metric returns it"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f'Metric {name} already registered as {metric.kind}')
+            return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+def request_metrics(registry: Registry = REGISTRY) -> Tuple[Counter, Counter, Histogram, Gauge]:
+    """The per-request metrics shared by every server integration"""
+    requests_total = registry.counter(
+        'http_requests_total', 'HTTP requests handled',
+        ['service', 'endpoint', 'method', 'status']
+    )
+    errors_total = registry.counter(
+        'http_request_errors_total', 'HTTP requests answered with a 5xx status',
+        ['service', 'endpoint', 'method']
+    )
+    duration = registry.histogram(
+        'http_request_duration_seconds', 'HTTP request latency',
+        ['service', 'endpoint', 'method']
+    )
+    in_flight = registry.gauge(
+        'http_requests_in_flight', 'HTTP requests currently being served',
+        ['service', 'endpoint']
+    )
+    return requests_total, errors_total, duration, in_flight
+
+
+def init_app(app: Flask, service: str, registry: Registry = REGISTRY) -> None:
+    """
+    Instrument every request of ``app`` and expose ``/metrics``.
+
+    Args:
+        app: Flask application to instrument
+        service: Value of the ``service`` label on request metrics
+        registry: Registry receiving the metrics
+    """
+    requests_total, errors_total, duration, in_flight = request_metrics(registry)
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_endpoint = request.endpoint or 'unmatched'
+        g._metrics_start = time.perf_counter()
+        in_flight.inc(service=service, endpoint=g._metrics_endpoint)
+
+    @app.after_request
+    def _record_request_metrics(response):
+        endpoint = g.get('_metrics_endpoint')
+        if endpoint is None:
+            return response
+        labels = {
+            'service': service, 'endpoint': endpoint, 'method': request.method
+        }
+        duration.observe(time.perf_counter() - g._metrics_start, **labels)
+        requests_total.inc(status=response.status_code, **labels)
+        if response.status_code >= 500:
+            errors_total.inc(**labels)
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(exc):
+        endpoint = g.pop('_metrics_endpoint', None)
+        if endpoint is not None:
+            in_flight.dec(service=service, endpoint=endpoint)
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,222 @@
+# common/profiling.py
+"""
+Opt-in, sampled per-request profiling for the Flask services.
+
+A request is profiled when it wins the ``PROFILE_SAMPLE_RATE`` draw or
+carries ``PROFILE_HEADER`` set to the shared ``PROFILE_TOKEN``. Results
+are aggregated per endpoint under ``PROFILE_DIR``:
+
+- ``cprofile`` mode writes ``<endpoint>.pstats`` (load with ``pstats``
+  or snakeviz);
+- ``sample`` mode samples the request thread's stack every
+  ``PROFILE_INTERVAL`` seconds and writes ``<endpoint>.collapsed``, the
+  folded-stack format read by flamegraph.pl and speedscope.
+
+Workers sharing ``PROFILE_DIR`` merge into the same files under an
+``flock`` on a ``<file>.lock`` sidecar, so no worker's samples are lost.
+
+When neither a sample rate nor a token is configured no hooks are
+installed at all, so unprofiled deployments pay nothing.
+"""
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from flask import Flask, g, request
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: workers are threads there
+    fcntl = None
+
+MODES = ('cprofile', 'sample')
+
+
+def _defaults() -> Dict:
+    return {
+        'PROFILE_SAMPLE_RATE': float(os.getenv('PROFILE_SAMPLE_RATE', '0')),
+        'PROFILE_HEADER': os.getenv('PROFILE_HEADER', 'X-Profile'),
+        'PROFILE_TOKEN': os.getenv('PROFILE_TOKEN', ''),
+        'PROFILE_DIR': os.getenv('PROFILE_DIR', 'profiles'),
+        'PROFILE_MODE': os.getenv('PROFILE_MODE', 'cprofile'),
+        'PROFILE_INTERVAL': float(os.getenv('PROFILE_INTERVAL', '0.001')),
+    }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}'
+
+
+class StackSampler:
+    """
+    Samples the stacks of registered threads from one daemon thread.
+
+    The thread only wakes up while at least one request is registered.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: int) -> None:
+        with self._lock:
+            self._active[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='request-stack-sampler', daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            stacks = self._active.pop(thread_id, Counter())
+            if not self._active:
+                self._wakeup.clear()
+        return stacks
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, stacks in self._active.items():
+                    frame = frames.get(thread_id)
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    if labels:
+                        stacks[';'.join(reversed(labels))] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+def _temporary_path(path: str) -> str:
+    """Per-process scratch file next to ``path``; workers share PROFILE_DIR"""
+    return f'{path}.{os.getpid()}.tmp'
+
+
+@contextmanager
+def _file_lock(path: str):
+    """
+    Hold an exclusive lock on ``<path>.lock`` so workers sharing
+    PROFILE_DIR read, merge and replace ``path`` one at a time.
+    """
+    with open(f'{path}.lock', 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RequestProfiler:
+    def __init__(self, config: Dict):
+        self.sample_rate = config['PROFILE_SAMPLE_RATE']
+        self.header = config['PROFILE_HEADER']
+        self.token = config['PROFILE_TOKEN']
+        self.directory = config['PROFILE_DIR']
+        self.mode = config['PROFILE_MODE']
+        if self.mode not in MODES:
+            raise ValueError(f'PROFILE_MODE must be one of {MODES}')
+        self.sampler = StackSampler(config['PROFILE_INTERVAL'])
+        self._write_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def should_profile(self) -> bool:
+        if self.token:
+            supplied = request.headers.get(self.header)
+            if supplied and hmac.compare_digest(supplied, self.token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> None:
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one active cProfile per interpreter;
+                # skip this request while another one is being profiled.
+                return
+            g._profiler = profiler
+        else:
+            g._profiler = threading.get_ident()
+            self.sampler.start(g._profiler)
+
+    def finish(self, profiler, endpoint: str) -> None:
+        name = endpoint.replace(os.sep, '_')
+        if self.mode == 'cprofile':
+            profiler.disable()
+            self._merge_pstats(profiler, os.path.join(self.directory, f'{name}.pstats'))
+        else:
+            stacks = self.sampler.stop(profiler)
+            self._merge_collapsed(stacks, os.path.join(self.directory, f'{name}.collapsed'))
+
+    def _merge_pstats(self, profiler: cProfile.Profile, path: str) -> None:
+        with self._write_lock, _file_lock(path):
+            stats = pstats.Stats(profiler)
+            if os.path.exists(path):
+                stats.add(path)
+            tmp_path = _temporary_path(path)
+            stats.dump_stats(tmp_path)
+            os.replace(tmp_path, path)
+
+    def _merge_collapsed(self, stacks: Counter, path: str) -> None:
+        if not stacks:
+            return
+        with self._write_lock, _file_lock(path):
+            if os.path.exists(path):
+                with open(path) as file:
+                    for line in file:
+                        stack, _, count = line.rstrip('\n').rpartition(' ')
+                        if stack:
+                            stacks[stack] += int(count)
+            tmp_path = _temporary_path(path)
+            with open(tmp_path, 'w') as file:
+                for stack, count in sorted(stacks.items()):
+                    file.write(f'{stack} {count}\n')
+            os.replace(tmp_path, path)
+
+
+def init_app(app: Flask) -> Optional[RequestProfiler]:
+    """
+    Install the profiling hooks if profiling is configured for ``app``.
+
+    Returns:
+        Optional[RequestProfiler]: The profiler, or None when disabled
+    """
+    for key, value in _defaults().items():
+        app.config.setdefault(key, value)
+
+    if not (app.config['PROFILE_SAMPLE_RATE'] > 0 or app.config['PROFILE_TOKEN']):
+        return None
+    profiler = RequestProfiler(app.config)
+
+    @app.before_request
+    def _start_profiling():
+        if profiler.should_profile():
+            profiler.start()
+
+    @app.teardown_request
+    def _finish_profiling(exc):
+        state = g.pop('_profiler', None)
+        if state is not None:
+            profiler.finish(state, request.endpoint or 'unmatched')
+
+    return profiler
@@ -0,0 +1,39 @@
+# common/projection.py
+"""
+Sparse fieldsets for listing endpoints (``?fields=id,price_per_night``).
+
+``parse_fields`` validates the query value against the fields a listing
+offers; repositories then build only the requested keys, so fields a
+client does not ask for are neither materialized nor serialized.
+"""
+from typing import Optional, Sequence, Tuple
+
+FIELDS_PARAM = 'fields'
+
+
+def parse_fields(value: Optional[str],
+                 allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ``fields`` value.
+
+    Returns:
+        The requested fields in request order without duplicates, or
+        None (all fields) when the value is missing or blank
+
+    Raises:
+        ValueError: If a requested field is not in ``allowed``
+    """
+    if value is None:
+        return None
+    requested = tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    if not requested:
+        return None
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available fields: {', '.join(allowed)}"
+        )
+    return requested
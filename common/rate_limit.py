@@ -0,0 +1,306 @@
+# common/rate_limit.py
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+A limit ``count/seconds`` is a bucket holding up to ``count`` tokens
+that refills at ``count / seconds`` tokens per second; every request
+takes one, and a request finding the bucket empty is refused with the
+time until a token is back. Buckets are keyed by arbitrary strings
+(e.g. ``login:ip:10.0.0.7``), so one limiter serves every key.
+
+``TokenBuckets`` keeps the buckets in this process, spread over
+``shards`` dicts with one lock each: requests for different keys rarely
+contend, and each update is a few float operations under that lock. A
+bucket that has refilled completely is the same as no bucket, so a
+background thread periodically drops those, one shard at a time; memory
+then tracks the keys seen in the last ``count/seconds`` window rather
+than every client ever seen.
+
+A request is usually metered by several buckets at once (its client IP
+and its target email); ``take_all`` takes a token from each of them only
+if every one has it, so a request refused by one bucket does not use up
+the others. ``init_app`` applies the limits in a ``before_request`` hook
+that is meant to run before admission control, so a throttled client is
+refused without ever taking a place in an endpoint's queue.
+
+Per-process buckets give every worker its own budget. For limits that
+hold across workers and hosts, ``RedisTokenBuckets`` keeps the buckets
+in Redis 5+ (``RATE_LIMIT_REDIS_URL``, needs the ``redis`` package) and
+updates them atomically in a script; the local buckets stand in
+whenever Redis cannot be reached, so an outage degrades to per-process
+limits rather than none or all requests failing. After a failure Redis
+is left alone for ``retry_after`` seconds, so requests during an outage
+do not each wait for a connection timeout.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - exercised when redis is absent
+    redis = None
+
+from flask import Flask, request
+
+from common import metrics
+
+logger = logging.getLogger(__name__)
+
+REJECTED = metrics.counter(
+    'rate_limit_rejected_total',
+    'Requests refused by a rate limit',
+    ['action', 'key']
+)
+
+DEFAULT_SHARDS = 16
+DEFAULT_EVICT_SECONDS = 60.0
+DEFAULT_REDIS_RETRY_SECONDS = 5.0
+
+
+def parse_limit(spec: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    (rate per second, burst) of a ``count/seconds`` limit; None if unset.
+
+    Raises:
+        ValueError: If the limit is malformed or not positive
+    """
+    if not spec:
+        return None
+    count, separator, seconds = spec.partition('/')
+    if not separator:
+        raise ValueError(f'Expected count/seconds, got {spec!r}')
+    count, seconds = float(count), float(seconds)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f'Rate limit must be positive, got {spec!r}')
+    return count / seconds, count
+
+
+class TokenBuckets:
+    """Sharded in-process token buckets"""
+
+    def __init__(self, shards: int = DEFAULT_SHARDS,
+                 evict_every: float = DEFAULT_EVICT_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        # key -> (tokens, updated at, full at)
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+        self.evict_every = evict_every
+        self._clock = clock
+        self._evictor: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets, _ in self._shards)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens from ``key``'s bucket; 0 if allowed, else seconds to wait"""
+        return self.take_all([(key, rate, burst)], cost)[0]
+
+    def take_all(self, limits: Sequence[Tuple[str, float, float]],
+                 cost: float = 1.0) -> List[float]:
+        """
+        Take ``cost`` tokens from each ``(key, rate, burst)`` bucket if all
+        of them have that many, else from none; returns the seconds to
+        wait per bucket (all 0 when taken).
+        """
+        evictor = self._evictor
+        if evictor is None or not evictor.is_alive():
+            self.start()
+        shards = {hash(key) % len(self._shards) for key, _, _ in limits}
+        # Lock the shards in index order so concurrent requests cannot deadlock
+        locks = [self._shards[index][1] for index in sorted(shards)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            now = self._clock()
+            tokens = []
+            for key, rate, burst in limits:
+                bucket = self._shards[hash(key) % len(self._shards)][0].get(key)
+                if bucket is None:
+                    tokens.append(burst)
+                else:
+                    tokens.append(min(burst, bucket[0] + (now - bucket[1]) * rate))
+            waits = [
+                max(0.0, (cost - available) / rate)
+                for available, (_, rate, _) in zip(tokens, limits)
+            ]
+            if not any(waits):
+                for available, (key, rate, burst) in zip(tokens, limits):
+                    left = available - cost
+                    self._shards[hash(key) % len(self._shards)][0][key] = (
+                        left, now, now + (burst - left) / rate
+                    )
+            return waits
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def evict_idle(self) -> int:
+        """Drop buckets that have refilled completely; returns how many"""
+        evicted = 0
+        for buckets, lock in self._shards:
+            now = self._clock()
+            with lock:
+                idle = [key for key, bucket in buckets.items() if bucket[2] <= now]
+                for key in idle:
+                    del buckets[key]
+            evicted += len(idle)
+        return evicted
+
+    def start(self) -> None:
+        """Start the eviction thread, e.g. again in a forked worker"""
+        if self._evictor is not None and self._evictor.is_alive():
+            return
+        self._evictor = threading.Thread(
+            target=self._evict_forever, name='rate-limit-evictor', daemon=True
+        )
+        self._evictor.start()
+
+    def _evict_forever(self) -> None:
+        while True:
+            time.sleep(self.evict_every)
+            self.evict_idle()
+
+
+class RedisTokenBuckets:
+    """Token buckets shared through Redis, with local buckets as the stand-in"""
+
+    # Redis keeps the time so every worker and host agrees on it; an idle
+    # bucket expires once it would have refilled completely. ARGV is the
+    # cost, then rate and burst per key.
+    SCRIPT = """
+local cost = tonumber(ARGV[1])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens, waits, refused = {}, {}, false
+for i, key in ipairs(KEYS) do
+    local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'updated')
+    tokens[i] = burst
+    if state[1] then
+        tokens[i] = math.min(burst, tonumber(state[1]) + (now - tonumber(state[2])) * rate)
+    end
+    waits[i] = '0'
+    if tokens[i] < cost then
+        waits[i] = tostring((cost - tokens[i]) / rate)
+        refused = true
+    end
+end
+if not refused then
+    for i, key in ipairs(KEYS) do
+        local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+        local left = tokens[i] - cost
+        redis.call('HSET', key, 'tokens', tostring(left), 'updated', tostring(now))
+        redis.call('PEXPIRE', key, math.ceil((burst - left) / rate * 1000) + 1000)
+    end
+end
+return waits
+"""
+
+    def __init__(self, client, prefix: str = 'ratelimit:',
+                 fallback: Optional[TokenBuckets] = None,
+                 retry_after: float = DEFAULT_REDIS_RETRY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._script = client.register_script(self.SCRIPT)
+        self.prefix = prefix
+        self.fallback = fallback if fallback is not None else TokenBuckets()
+        self.retry_after = retry_after
+        self._clock = clock
+        self._available = True
+        # While Redis is down, it is not tried again before this time
+        self._retry_at = 0.0
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisTokenBuckets':
+        if redis is None:
+            raise RuntimeError('RATE_LIMIT_REDIS_URL needs the redis package')
+        client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        return cls(client, **kwargs)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        return self.take_all([(key, rate, burst)], cost)[0]
+
+    def take_all(self, limits: Sequence[Tuple[str, float, float]],
+                 cost: float = 1.0) -> List[float]:
+        if not self._available and self._clock() < self._retry_at:
+            return self.fallback.take_all(limits, cost)
+        args = [cost]
+        for _, rate, burst in limits:
+            args += [rate, burst]
+        try:
+            waits = self._script(keys=[self.prefix + key for key, _, _ in limits], args=args)
+        except Exception as e:
+            if self._available:
+                logger.warning(f'Shared rate limit unavailable, using local buckets: {e}')
+                self._available = False
+            # Requests would otherwise each wait for the timeout while it is down
+            self._retry_at = self._clock() + self.retry_after
+            return self.fallback.take_all(limits, cost)
+        if not self._available:
+            logger.info('Shared rate limit available again')
+            self._available = True
+        return [float(wait) for wait in waits]
+
+    def start(self) -> None:
+        self.fallback.start()
+
+
+def from_config(config) -> Union[TokenBuckets, RedisTokenBuckets]:
+    """``RedisTokenBuckets`` if ``RATE_LIMIT_REDIS_URL`` is set, else ``TokenBuckets``"""
+    local = TokenBuckets(
+        config.get('RATE_LIMIT_SHARDS', DEFAULT_SHARDS),
+        config.get('RATE_LIMIT_EVICT_SECONDS', DEFAULT_EVICT_SECONDS)
+    )
+    url = config.get('RATE_LIMIT_REDIS_URL')
+    if url:
+        return RedisTokenBuckets.from_url(url, fallback=local)
+    return local
+
+
+def init_app(app: Flask, buckets: Union[TokenBuckets, RedisTokenBuckets, None],
+             limits: Dict[str, Optional[Tuple[float, float]]],
+             actions: Dict[str, str]) -> None:
+    """
+    Refuse requests with 429 once their client IP or the email in their
+    body has used up its tokens.
+
+    Call it after ``metrics.init_app`` (so refusals are counted as 429
+    responses) but before ``admission.init_app``, whose queue a refused
+    request should never enter.
+
+    Args:
+        app: Flask application to protect
+        buckets: Token buckets to take from; None disables rate limiting
+        limits: (rate, burst) per client ``ip`` and per target ``email``
+        actions: Action name (the bucket key prefix) per Flask endpoint
+    """
+    if buckets is None:
+        return
+
+    @app.before_request
+    def _limit_rate():
+        action = actions.get(request.endpoint)
+        if action is None or request.method == 'OPTIONS':
+            return None
+        data = request.get_json(silent=True)
+        email = data.get('email') if isinstance(data, dict) else None
+        keys = {'ip': request.remote_addr}
+        if isinstance(email, str):
+            keys['email'] = email.strip().lower()
+        kinds = [kind for kind in keys if limits.get(kind) is not None]
+        if not kinds:
+            return None
+        waits = buckets.take_all([
+            (f'{action}:{kind}:{keys[kind]}', *limits[kind]) for kind in kinds
+        ])
+        if not any(waits):
+            return None
+        for kind, wait in zip(kinds, waits):
+            if wait:
+                REJECTED.inc(action=action, key=kind)
+        return (
+            {'message': 'Too many attempts, please retry later'},
+            429,
+            {'Retry-After': str(math.ceil(max(waits)))}
+        )
@@ -0,0 +1,128 @@
+import threading
+import unittest
+
+from flask import Flask
+
+from common import admission, metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseLimits(unittest.TestCase):
+    def test_limits_and_queues(self):
+        """Test limits parse from a spec string or dict; the queue defaults to the limit."""
+        self.assertEqual(
+            admission.parse_limits(' user_user_login=4:8, *=64 '),
+            {'user_user_login': (4, 8), '*': (64, 64)}
+        )
+        self.assertEqual(admission.parse_limits({'metrics': '2:0'}), {'metrics': (2, 0)})
+        self.assertEqual(admission.parse_limits(''), {})
+
+    def test_invalid_limits(self):
+        """Test malformed entries and non-positive limits are rejected."""
+        for spec in ('user_user_login', 'user_user_login=0', 'login=x', 'login=2:-1'):
+            with self.assertRaises(ValueError):
+                admission.parse_limits(spec)
+
+
+class TestAdmissionLimiter(unittest.TestCase):
+    def test_full_queue_is_refused_immediately(self):
+        """Test requests over limit plus queue are refused without waiting."""
+        limiter = admission.AdmissionLimiter(1, 0)
+        self.assertIsNone(limiter.acquire())
+        self.assertEqual(limiter.acquire(), 'queue_full')
+        limiter.release()
+        self.assertIsNone(limiter.acquire())
+
+    def test_waiter_gets_released_slot(self):
+        """Test a queued request is admitted when a slot frees up in time."""
+        limiter = admission.AdmissionLimiter(1, 1, interval=5.0)
+        limiter.acquire()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+        waiter.start()
+        while not limiter.waiting:
+            pass
+        limiter.release()
+        waiter.join()
+        self.assertEqual(results, [None])
+        self.assertEqual(limiter.active, 1)
+
+    def test_wait_times_out(self):
+        """Test a queued request gives up once its wait runs out."""
+        limiter = admission.AdmissionLimiter(1, 1, interval=0.01)
+        limiter.acquire()
+        self.assertEqual(limiter.acquire(), 'timeout')
+        self.assertEqual(limiter.waiting, 0)
+
+    def test_standing_queue_is_overloaded(self):
+        """Test a queue that has not drained for an interval counts as overloaded."""
+        clock = FakeClock()
+        limiter = admission.AdmissionLimiter(1, 4, target=0.001, interval=0.1, clock=clock)
+        limiter.acquire()
+        limiter.waiting = 1  # a request already queued
+        self.assertFalse(limiter.overloaded())
+        clock.now = 0.5
+        self.assertTrue(limiter.overloaded())
+        limiter.waiting = 0
+        self.assertFalse(limiter.overloaded())
+
+
+class TestAdmissionMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(ADMISSION_LIMITS='slow=1:0', ADMISSION_RETRY_AFTER=2)
+        self.entered, self.finish = threading.Event(), threading.Event()
+
+        @self.app.route('/slow')
+        def slow():
+            self.entered.set()
+            self.finish.wait(5)
+            return {'ok': True}
+
+        @self.app.route('/fast')
+        def fast():
+            return {'ok': True}
+
+        metrics.init_app(self.app, 'admission_test')
+        self.limiters = admission.init_app(self.app, 'admission_test')
+        self.client = self.app.test_client()
+
+    def test_overload_is_shed_with_retry_after(self):
+        """Test an endpoint at its limit answers 503 fast while others still serve."""
+        holder = threading.Thread(target=self.client.get, args=('/slow',))
+        holder.start()
+        self.entered.wait(5)
+        try:
+            response = self.client.get('/slow')
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers['Retry-After'], '2')
+            self.assertEqual(self.client.get('/fast').status_code, 200)
+        finally:
+            self.finish.set()
+            holder.join()
+        self.assertEqual(self.limiters['slow'].active, 0)
+        self.assertEqual(self.client.get('/slow').status_code, 200)
+        rejected = admission.REJECTED.value(
+            service='admission_test', endpoint='slow', reason='queue_full'
+        )
+        self.assertEqual(rejected, 1)
+
+    def test_default_limit_applies_to_other_endpoints(self):
+        """Test ``*`` gives every unlisted endpoint its own limiter."""
+        app = Flask(__name__)
+        app.config['ADMISSION_LIMITS'] = '*=3'
+        app.add_url_rule('/a', 'a', lambda: 'a')
+        limiters = admission.init_app(app, 'admission_test')
+        self.assertEqual(app.test_client().get('/a').status_code, 200)
+        self.assertEqual((limiters['a'].limit, limiters['a'].queue), (3, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+from flask import Flask, Response, jsonify
+from common import compression
+
+BIG = {'items': [{'id': str(i), 'description': 'Luxurious tropical paradise'}
+                 for i in range(100)]}
+
+
+def build_app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+
+    @app.route('/big')
+    def big():
+        return jsonify(BIG)
+
+    @app.route('/tagged')
+    def tagged():
+        response = jsonify(BIG)
+        response.set_etag('v1')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify(ok=True)
+
+    @app.route('/binary')
+    def binary():
+        return Response(b'\0' * 4096, mimetype='application/octet-stream')
+
+    @app.route('/stream')
+    def stream():
+        return Response((b'{}' for _ in range(1000)), mimetype='application/json')
+
+    cache = compression.init_app(app)
+    return app, cache
+
+
+class TestNegotiation(unittest.TestCase):
+    def test_parse_accept_encoding(self):
+        """Test codings and q-values are parsed case-insensitively."""
+        self.assertEqual(
+            compression.parse_accept_encoding('GZIP;q=0.5, br, identity;q=bad'),
+            {'gzip': 0.5, 'br': 1.0, 'identity': 0.0}
+        )
+
+    def test_choose_encoding(self):
+        """Test the highest q-value wins and preference order breaks ties."""
+        self.assertEqual(compression.choose_encoding('gzip, br', ('br', 'gzip')), 'br')
+        self.assertEqual(
+            compression.choose_encoding('gzip, br;q=0.5', ('br', 'gzip')), 'gzip'
+        )
+        self.assertEqual(compression.choose_encoding('*', ('gzip',)), 'gzip')
+        self.assertIsNone(compression.choose_encoding('gzip;q=0', ('gzip',)))
+        self.assertIsNone(compression.choose_encoding(None, ('gzip',)))
+
+
+class TestMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.app, self.cache = build_app()
+        self.client = self.app.test_client()
+
+    def get(self, path, encoding='gzip'):
+        return self.client.get(path, headers={'Accept-Encoding': encoding})
+
+    @patch.object(compression, 'brotli', None)
+    def test_large_json_is_gzipped(self):
+        """Test a large JSON body is gzip-compressed when accepted."""
+        response = self.get('/big', 'br, gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.get_data())), BIG)
+        self.assertEqual(
+            int(response.headers['Content-Length']), len(response.get_data())
+        )
+
+    def test_threshold_and_ineligible_responses(self):
+        """Test small, non-JSON, streamed and unaccepted responses pass through."""
+        for path in ['/small', '/binary', '/stream']:
+            self.assertNotIn('Content-Encoding', self.get(path).headers, path)
+        self.assertNotIn('Content-Encoding', self.get('/big', 'identity').headers)
+
+    def test_min_size_and_level_are_configurable(self):
+        """Test the size threshold and level come from the app config."""
+        app, _ = build_app(COMPRESS_MIN_SIZE=1, COMPRESS_LEVEL=1)
+        response = app.test_client().get(
+            '/small', headers={'Accept-Encoding': 'gzip'}
+        )
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.get_data())), {'ok': True})
+
+    def test_repeated_bodies_are_compressed_once(self):
+        """Test identical bodies are served from the compressed-body cache."""
+        with patch.object(compression, 'compress', wraps=compression.compress) as spy:
+            first = self.get('/big').get_data()
+            second = self.get('/big').get_data()
+        self.assertEqual(first, second)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_strong_etag_keys_the_cache(self):
+        """Test tagged bodies are cached by ETag and get a per-coding ETag."""
+        with patch.object(compression.hashlib, 'sha256') as digest:
+            first = self.get('/tagged')
+            second = self.get('/tagged')
+        digest.assert_not_called()
+        self.assertEqual(first.get_data(), second.get_data())
+        self.assertEqual(first.get_etag(), ('v1-gzip', False))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_cache_is_bounded(self):
+        """Test the cache evicts least recently used bodies."""
+        cache = compression.CompressedBodyCache(max_entries=2)
+        for body in [b'a' * 10, b'b' * 10, b'c' * 10]:
+            cache.get_or_compress(body, 'gzip', 6)
+        cache.get_or_compress(b'a' * 10, 'gzip', 6)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+    @unittest.skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_preferred_when_available(self):
+        """Test brotli is chosen when both codings are accepted."""
+        response = self.get('/big', 'gzip, br')
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(
+            json.loads(compression.brotli.decompress(response.get_data())), BIG
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
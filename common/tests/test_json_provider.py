@@ -0,0 +1,101 @@
+import datetime
+import json
+import unittest
+from flask import Flask, jsonify
+from flask_restx import Api, Resource
+from flask_restx.representations import output_json as restx_output_json
+from common import json_provider
+
+PAYLOAD = {
+    'destinations': [
+        {'id': '1', 'name': 'Maldives Resort', 'price_per_night': 500.0},
+        {'id': '2', 'name': 'Zürich Lodge', 'price_per_night': 99.5},
+    ],
+    'count': 2,
+}
+
+
+def build_app(backend, debug=False, **config):
+    app = Flask(__name__)
+    app.config.update(DEBUG=debug, JSON_BACKEND=backend, **config)
+    api = Api(app)
+
+    @api.route('/payload')
+    class Payload(Resource):
+        def get(self):
+            return PAYLOAD
+
+    @app.route('/jsonify')
+    def plain():
+        return jsonify(day=datetime.date(2024, 1, 2), values={2: 'b', 1: 'a'})
+
+    json_provider.init_app(app, api)
+    return app
+
+
+class TestBackends(unittest.TestCase):
+    def test_unknown_backend(self):
+        """Test an unknown JSON_BACKEND is rejected."""
+        with self.assertRaises(ValueError):
+            json_provider.get_backend('yaml')
+
+    def test_stdlib_output_is_byte_identical(self):
+        """Test the stdlib backend reproduces flask-restx's encoding."""
+        for debug in (False, True):
+            app = build_app('stdlib', debug=debug)
+            with app.test_request_context():
+                expected = restx_output_json(PAYLOAD, 200).get_data()
+            response = app.test_client().get('/payload')
+            self.assertEqual(response.get_data(), expected)
+
+
+@unittest.skipUnless(json_provider.orjson, 'orjson is not installed')
+class TestOrjsonBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = json_provider.get_backend('orjson')
+
+    def test_resource_responses_decode_identically(self):
+        """Test orjson bodies decode to the stdlib values and keep the newline."""
+        for debug in (False, True):
+            body = build_app('orjson', debug=debug).test_client().get('/payload').get_data()
+            self.assertTrue(body.endswith(b'\n'))
+            self.assertEqual(json.loads(body), PAYLOAD)
+
+    def test_jsonify_matches_flask_default(self):
+        """Test app.json keeps Flask's date format and sorted keys."""
+        fast = build_app('orjson').test_client().get('/jsonify')
+        default = Flask(__name__)
+        with default.test_request_context():
+            expected = default.json.dumps(
+                {'day': datetime.date(2024, 1, 2), 'values': {2: 'b', 1: 'a'}}
+            )
+        self.assertEqual(fast.get_data(as_text=True), json.dumps(
+            json.loads(expected), separators=(',', ':'), sort_keys=True
+        ) + '\n')
+
+    def test_large_integers_fall_back_to_stdlib(self):
+        """Test integers beyond 64 bits are still encoded."""
+        self.assertEqual(json.loads(self.backend.dumps({'n': 2 ** 70})), {'n': 2 ** 70})
+
+    def test_unsupported_types_raise_type_error(self):
+        """Test unserializable values fail like the stdlib encoder."""
+        with self.assertRaises(TypeError):
+            self.backend.dumps({'value': object()})
+
+    def test_compact_separators_stay_on_orjson(self):
+        """Test compact separators, as Flask passes them, do not fall back to the stdlib."""
+        self.backend.fallback = None
+        body = self.backend.dumps(PAYLOAD, separators=(',', ':'))
+        self.assertEqual(body, json.dumps(
+            PAYLOAD, separators=(',', ':'), ensure_ascii=False
+        ).encode('utf-8'))
+
+    def test_stdlib_only_options_are_honoured(self):
+        """Test RESTX_JSON options orjson lacks go through the stdlib."""
+        app = build_app('orjson', RESTX_JSON={'separators': (',', '=')})
+        body = app.test_client().get('/payload').get_data()
+        self.assertIn(b'"count"=2', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from flask import Flask
+from common.metrics import Registry, init_app
+
+
+class TestMetricTypes(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_and_gauge(self):
+        """Test counters accumulate and gauges move both ways."""
+        counter = self.registry.counter('jobs_total', 'Jobs', ['kind'])
+        counter.inc(kind='a')
+        counter.inc(2, kind='a')
+        gauge = self.registry.gauge('queue_depth', 'Depth')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        self.assertEqual(counter.value(kind='a'), 3)
+        self.assertEqual(gauge.value(), 1)
+
+    def test_get_or_create_returns_same_metric(self):
+        """Test re-registering a metric name returns the existing metric."""
+        first = self.registry.counter('jobs_total', 'Jobs')
+        self.assertIs(self.registry.counter('jobs_total', 'Jobs'), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge('jobs_total', 'Jobs')
+
+    def test_missing_label_raises(self):
+        """Test observing without all label values is rejected."""
+        counter = self.registry.counter('jobs_total', 'Jobs', ['kind'])
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_histogram_rendering(self):
+        """Test histogram buckets are cumulative in the text format."""
+        histogram = self.registry.histogram(
+            'op_seconds', 'Op time', ['op'], buckets=(0.1, 1.0)
+        )
+        histogram.observe(0.05, op='x')
+        histogram.observe(0.1, op='x')
+        histogram.observe(5, op='x')
+
+        text = self.registry.render()
+        self.assertIn('# TYPE op_seconds histogram', text)
+        self.assertIn('op_seconds_bucket{op="x",le="0.1"} 2', text)
+        self.assertIn('op_seconds_bucket{op="x",le="1.0"} 2', text)
+        self.assertIn('op_seconds_bucket{op="x",le="+Inf"} 3', text)
+        self.assertIn('op_seconds_count{op="x"} 3', text)
+        self.assertEqual(histogram.count(op='x'), 3)
+
+    def test_time_context_manager(self):
+        """Test the timer records one observation per block."""
+        histogram = self.registry.histogram('block_seconds', 'Block time')
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count(), 1)
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and newlines in label values are escaped."""
+        counter = self.registry.counter('odd_total', 'Odd', ['v'])
+        counter.inc(v='a"b\nc')
+        self.assertIn('odd_total{v="a\\"b\\nc"} 1', self.registry.render())
+
+
+class TestFlaskInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        app = Flask(__name__)
+
+        @app.route('/ok')
+        def ok():
+            return 'ok'
+
+        @app.route('/fail')
+        def fail():
+            return 'no', 503
+
+        init_app(app, 'test_service', registry=self.registry)
+        self.client = app.test_client()
+
+    def test_requests_are_counted_and_timed(self):
+        """Test request counters, latency and error counts per endpoint."""
+        self.client.get('/ok')
+        self.client.get('/ok')
+        self.client.get('/fail')
+
+        requests_total = self.registry.get('http_requests_total')
+        self.assertEqual(requests_total.value(
+            service='test_service', endpoint='ok', method='GET', status=200
+        ), 2)
+        self.assertEqual(self.registry.get('http_request_errors_total').value(
+            service='test_service', endpoint='fail', method='GET'
+        ), 1)
+        self.assertEqual(self.registry.get('http_request_duration_seconds').count(
+            service='test_service', endpoint='ok', method='GET'
+        ), 2)
+        self.assertEqual(self.registry.get('http_requests_in_flight').value(
+            service='test_service', endpoint='ok'
+        ), 0)
+
+    def test_metrics_endpoint(self):
+        """Test /metrics serves the Prometheus text format."""
+        self.client.get('/ok')
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn(
+            'http_requests_total{service="test_service",endpoint="ok",'
+            'method="GET",status="200"} 1',
+            response.get_data(as_text=True)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
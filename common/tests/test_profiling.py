@@ -0,0 +1,129 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+from collections import Counter
+from flask import Flask
+from common import profiling
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestRequestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_app(self, **config):
+        app = Flask(__name__)
+        app.config['PROFILE_DIR'] = self.directory
+        app.config.update(config)
+
+        @app.route('/work')
+        def work():
+            busy_wait(0.05)
+            return 'done'
+
+        return app, profiling.init_app(app)
+
+    def test_disabled_by_default(self):
+        """Test no hooks are installed without a sample rate or token."""
+        app, profiler = self.make_app(PROFILE_SAMPLE_RATE=0, PROFILE_TOKEN='')
+        self.assertIsNone(profiler)
+        app.test_client().get('/work')
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_cprofile_mode_aggregates_pstats(self):
+        """Test sampled requests are merged into one pstats file."""
+        app, _ = self.make_app(PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='cprofile')
+        client = app.test_client()
+        client.get('/work')
+        client.get('/work')
+
+        stats = pstats.Stats(os.path.join(self.directory, 'work.pstats'))
+        calls = [
+            stat[0] for func, stat in stats.stats.items() if func[2] == 'work'
+        ]
+        self.assertEqual(calls, [2])
+
+    def test_trusted_header_triggers_profiling(self):
+        """Test only the correct token in the header profiles a request."""
+        app, _ = self.make_app(
+            PROFILE_SAMPLE_RATE=0, PROFILE_TOKEN='secret', PROFILE_MODE='cprofile'
+        )
+        client = app.test_client()
+        client.get('/work', headers={'X-Profile': 'wrong'})
+        self.assertEqual(os.listdir(self.directory), [])
+
+        client.get('/work', headers={'X-Profile': 'secret'})
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['work.pstats', 'work.pstats.lock'])
+
+    def test_sample_mode_writes_collapsed_stacks(self):
+        """Test the stack sampler writes folded stacks ending in the view."""
+        app, _ = self.make_app(
+            PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='sample', PROFILE_INTERVAL=0.001
+        )
+        app.test_client().get('/work')
+
+        with open(os.path.join(self.directory, 'work.collapsed')) as file:
+            lines = file.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any('test_profiling.py:work' in line for line in lines))
+
+    def test_scratch_files_are_per_process(self):
+        """Test merging leaves another worker's in-progress temp file alone."""
+        app, _ = self.make_app(
+            PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='sample', PROFILE_INTERVAL=0.001
+        )
+        other = os.path.join(self.directory, f'work.collapsed.{os.getpid() + 1}.tmp')
+        with open(other, 'w') as file:
+            file.write('half written')
+        app.test_client().get('/work')
+
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted([
+            'work.collapsed', 'work.collapsed.lock', os.path.basename(other)
+        ]))
+        with open(other) as file:
+            self.assertEqual(file.read(), 'half written')
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork')
+    def test_workers_merge_without_losing_samples(self):
+        """Test concurrent merges from several processes keep every count."""
+        _, profiler = self.make_app(PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='sample')
+        path = os.path.join(self.directory, 'work.collapsed')
+        children = []
+        for _ in range(4):
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    for _ in range(25):
+                        profiler._merge_collapsed(Counter({'app;work': 1}), path)
+                    status = 0
+                finally:
+                    os._exit(status)
+            children.append(pid)
+        for pid in children:
+            self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        with open(path) as file:
+            self.assertEqual(file.read(), 'app;work 100\n')
+
+    def test_invalid_mode_rejected(self):
+        """Test an unknown profiling mode fails fast."""
+        with self.assertRaises(ValueError):
+            self.make_app(PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE='bogus')
+
+
+if __name__ == '__main__':
+    unittest.main()
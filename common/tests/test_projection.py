@@ -0,0 +1,29 @@
+import unittest
+from common.projection import parse_fields
+
+ALLOWED = ('id', 'name', 'price_per_night')
+
+
+class TestParseFields(unittest.TestCase):
+    def test_missing_or_blank_means_all_fields(self):
+        """Test no fields value selects every field."""
+        for value in [None, '', ' , ']:
+            self.assertIsNone(parse_fields(value, ALLOWED))
+
+    def test_order_is_kept_and_duplicates_dropped(self):
+        """Test fields come back in request order, once each."""
+        self.assertEqual(
+            parse_fields('price_per_night, id,price_per_night', ALLOWED),
+            ('price_per_night', 'id')
+        )
+
+    def test_unknown_fields_are_rejected(self):
+        """Test unknown fields raise with the available ones listed."""
+        with self.assertRaises(ValueError) as context:
+            parse_fields('id,password', ALLOWED)
+        self.assertIn('password', str(context.exception))
+        self.assertIn('price_per_night', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from common import rate_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseLimit(unittest.TestCase):
+    def test_count_per_seconds(self):
+        """Test a count/seconds limit becomes (rate per second, burst)."""
+        self.assertEqual(rate_limit.parse_limit('30/60'), (0.5, 30.0))
+        self.assertIsNone(rate_limit.parse_limit(''))
+        self.assertIsNone(rate_limit.parse_limit(None))
+
+    def test_invalid_limits(self):
+        """Test malformed and non-positive limits are rejected."""
+        for spec in ('30', '0/60', '30/0', 'x/60'):
+            with self.assertRaises(ValueError):
+                rate_limit.parse_limit(spec)
+
+
+class TestTokenBuckets(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.buckets = rate_limit.TokenBuckets(shards=4, clock=self.clock)
+
+    def test_burst_then_refill(self):
+        """Test a bucket allows its burst, then one request per refilled token."""
+        results = [self.buckets.take('login:ip:a', 0.5, 3) for _ in range(4)]
+        self.assertEqual(results[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(results[3], 2.0)
+        self.clock.now = 1.0
+        self.assertAlmostEqual(self.buckets.take('login:ip:a', 0.5, 3), 1.0)
+        self.clock.now = 2.0
+        self.assertEqual(self.buckets.take('login:ip:a', 0.5, 3), 0.0)
+
+    def test_keys_are_independent(self):
+        """Test one key running out does not affect another."""
+        self.buckets.take('login:ip:a', 1, 1)
+        self.assertGreater(self.buckets.take('login:ip:a', 1, 1), 0)
+        self.assertEqual(self.buckets.take('login:ip:b', 1, 1), 0.0)
+
+    def test_evicts_only_refilled_buckets(self):
+        """Test idle buckets are dropped once full, and dropping one changes nothing."""
+        self.buckets.take('a', 1, 2)
+        self.buckets.take('b', 1, 2)
+        self.buckets.take('b', 1, 2)
+        self.clock.now = 1.0
+        self.assertEqual(self.buckets.evict_idle(), 1)
+        self.assertEqual(len(self.buckets), 1)
+        self.clock.now = 2.0
+        self.assertEqual(self.buckets.evict_idle(), 1)
+        self.assertEqual(len(self.buckets), 0)
+        self.assertEqual(self.buckets.take('a', 1, 2), 0.0)
+        self.assertEqual(self.buckets.take('a', 1, 2), 0.0)
+
+    def test_concurrent_takes_never_exceed_burst(self):
+        """Test racing threads together get exactly the burst."""
+        allowed = []
+
+        def client():
+            for _ in range(50):
+                if self.buckets.take('register:email:x', 1e-9, 100) == 0.0:
+                    allowed.append(1)
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(allowed), 100)
+
+    def test_take_all_takes_from_every_bucket_or_none(self):
+        """Test a request refused by one bucket leaves the others untouched."""
+        limits = [('login:ip:a', 1e-9, 3), ('login:email:x', 1e-9, 1)]
+        self.assertEqual(self.buckets.take_all(limits), [0.0, 0.0])
+        waits = self.buckets.take_all(limits)
+        self.assertEqual(waits[0], 0.0)
+        self.assertGreater(waits[1], 0)
+        # The IP bucket still has both of its remaining tokens
+        self.assertEqual(self.buckets.take('login:ip:a', 1e-9, 3), 0.0)
+        self.assertEqual(self.buckets.take('login:ip:a', 1e-9, 3), 0.0)
+        self.assertGreater(self.buckets.take('login:ip:a', 1e-9, 3), 0)
+
+    def test_eviction_thread_starts_on_first_take(self):
+        """Test the evictor runs once buckets are used, e.g. after a fork."""
+        self.buckets.take('a', 1, 1)
+        self.assertTrue(self.buckets._evictor.is_alive())
+
+
+class TestRedisTokenBuckets(unittest.TestCase):
+    def test_uses_shared_result(self):
+        """Test the wait computed by the shared script is returned."""
+        client = MagicMock()
+        client.register_script.return_value.return_value = [b'0', b'1.5']
+        buckets = rate_limit.RedisTokenBuckets(client)
+        waits = buckets.take_all([('login:ip:a', 0.5, 3), ('login:email:x', 0.1, 2)])
+        self.assertEqual(waits, [0.0, 1.5])
+        client.register_script.return_value.assert_called_once_with(
+            keys=['ratelimit:login:ip:a', 'ratelimit:login:email:x'],
+            args=[1.0, 0.5, 3, 0.1, 2]
+        )
+
+    def test_local_buckets_stand_in_when_unavailable(self):
+        """Test an unreachable backend falls back to the local buckets."""
+        client = MagicMock()
+        client.register_script.return_value.side_effect = ConnectionError('down')
+        fallback = rate_limit.TokenBuckets(clock=FakeClock())
+        buckets = rate_limit.RedisTokenBuckets(client, fallback=fallback)
+        self.assertEqual(buckets.take('a', 1, 1), 0.0)
+        self.assertGreater(buckets.take('a', 1, 1), 0)
+        self.assertEqual(len(fallback), 1)
+
+    def test_unavailable_backend_is_retried_after_backoff(self):
+        """Test a failed backend is skipped until the retry interval has passed."""
+        client = MagicMock()
+        script = client.register_script.return_value
+        script.side_effect = ConnectionError('down')
+        clock = FakeClock()
+        buckets = rate_limit.RedisTokenBuckets(client, retry_after=5.0, clock=clock)
+        for _ in range(3):
+            buckets.take('a', 1, 10)
+        self.assertEqual(script.call_count, 1)
+        clock.now = 5.0
+        script.side_effect, script.return_value = None, [b'0']
+        self.assertEqual(buckets.take('a', 1, 10), 0.0)
+        self.assertEqual(script.call_count, 2)
+        buckets.take('a', 1, 10)
+        self.assertEqual(script.call_count, 3)
+
+    def test_from_config_defaults_to_local(self):
+        """Test local buckets are used unless a shared backend is configured."""
+        buckets = rate_limit.from_config({'RATE_LIMIT_SHARDS': 2})
+        self.assertIsInstance(buckets, rate_limit.TokenBuckets)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import unittest
+from flask import Flask
+from common import tracing
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.previous = tracing.get_exporter()
+        self.exporter = tracing.InMemoryExporter()
+        tracing.set_exporter(self.exporter)
+
+    def tearDown(self):
+        tracing.set_exporter(self.previous)
+
+
+class TestTraceparent(unittest.TestCase):
+    def test_round_trip(self):
+        """Test a traceparent header parses and formats back unchanged."""
+        header = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+        context = tracing.parse_traceparent(header)
+        self.assertEqual(context.trace_id, '4bf92f3577b34da6a3ce929d0e0e4736')
+        self.assertEqual(context.span_id, '00f067aa0ba902b7')
+        self.assertTrue(context.sampled)
+        self.assertEqual(tracing.format_traceparent(context), header)
+
+    def test_invalid_headers_are_ignored(self):
+        """Test malformed or all-zero trace contexts are rejected."""
+        for header in [None, '', 'garbage',
+                       '00-00000000000000000000000000000000-00f067aa0ba902b7-01',
+                       '00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01']:
+            self.assertIsNone(tracing.parse_traceparent(header))
+
+
+class TestSpans(TracingTestCase):
+    def test_nested_spans_share_trace(self):
+        """Test child spans inherit the trace id and record their parent."""
+        with tracing.span('outer') as outer:
+            with tracing.span('inner', table='users') as inner:
+                pass
+
+        self.assertEqual([s.name for s in self.exporter.spans], ['inner', 'outer'])
+        self.assertEqual(inner.context.trace_id, outer.context.trace_id)
+        self.assertEqual(inner.parent_id, outer.context.span_id)
+        self.assertEqual(inner.attributes, {'table': 'users'})
+        self.assertIsNone(tracing.current_span())
+
+    def test_exceptions_mark_span_as_error(self):
+        """Test a failing block ends its span with an error status."""
+        with self.assertRaises(RuntimeError):
+            with tracing.span('failing'):
+                raise RuntimeError('boom')
+        self.assertEqual(self.exporter.spans[0].status, 'error')
+
+    def test_inject_only_inside_span(self):
+        """Test traceparent is added only when a span is active."""
+        self.assertEqual(tracing.inject({}), {})
+        with tracing.span('client') as active:
+            headers = tracing.inject({'Authorization': 'Bearer x'})
+        self.assertEqual(
+            headers[tracing.TRACEPARENT],
+            tracing.format_traceparent(active.context)
+        )
+
+    def test_disabled_tracing_yields_nothing(self):
+        """Test spans are skipped when no exporter is configured."""
+        tracing.set_exporter(None)
+        with tracing.span('ignored') as active:
+            self.assertIsNone(active)
+            self.assertEqual(tracing.inject({}), {})
+
+    def test_json_lines_exporter(self):
+        """Test the file exporter writes one JSON document per span."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'spans', 'out.jsonl')
+            tracing.set_exporter(tracing.JsonLinesExporter(path))
+            with tracing.span('first'):
+                pass
+            with open(path) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(records[0]['name'], 'first')
+        self.assertIsNone(records[0]['parent_id'])
+        self.assertGreaterEqual(records[0]['duration_ms'], 0)
+
+
+class TestFlaskPropagation(TracingTestCase):
+    def setUp(self):
+        super().setUp()
+        app = Flask(__name__)
+
+        @app.route('/call')
+        def call():
+            with tracing.span('downstream'):
+                return tracing.inject({})
+
+        tracing.init_app(app, 'test_service')
+        self.client = app.test_client()
+
+    def test_incoming_traceparent_is_continued(self):
+        """Test the server span joins the caller's trace and propagates it."""
+        header = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+        response = self.client.get('/call', headers={'traceparent': header})
+
+        downstream, server = self.exporter.spans
+        self.assertEqual(server.kind, 'server')
+        self.assertEqual(server.service, 'test_service')
+        self.assertEqual(server.parent_id, '00f067aa0ba902b7')
+        self.assertEqual(server.attributes['http.status_code'], 200)
+        self.assertEqual(downstream.service, 'test_service')
+        self.assertEqual(downstream.parent_id, server.context.span_id)
+        outgoing = tracing.parse_traceparent(response.json['traceparent'])
+        self.assertEqual(outgoing.trace_id, '4bf92f3577b34da6a3ce929d0e0e4736')
+        self.assertEqual(outgoing.span_id, downstream.context.span_id)
+
+    def test_new_trace_without_header(self):
+        """Test a request without trace context starts a fresh trace."""
+        self.client.get('/call')
+        server = self.exporter.spans[-1]
+        self.assertIsNone(server.parent_id)
+        self.assertEqual(
+            len(tracing.spans_for_trace(self.exporter, server.context.trace_id)), 2
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+import requests
+from common import uds
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({
+            'path': self.path,
+            'host': self.headers['Host'],
+            'connection': id(self.connection),
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StuckHandler(EchoHandler):
+    def do_GET(self):
+        self.server.release.wait(5)
+
+
+class TestSplitServiceUrl(unittest.TestCase):
+    def test_tcp_urls_pass_through(self):
+        """Test TCP service URLs keep their host and lose a trailing slash."""
+        self.assertEqual(
+            uds.split_service_url('http://localhost:5006/'),
+            (None, 'http://localhost:5006')
+        )
+
+    def test_unix_urls(self):
+        """Test both unix: spellings resolve to the socket path."""
+        for url in ['unix:/run/auth.sock', 'unix:///run/auth.sock']:
+            self.assertEqual(
+                uds.split_service_url(url), ('/run/auth.sock', uds.SOCKET_HOST)
+            )
+        with self.assertRaises(ValueError):
+            uds.split_service_url('unix:')
+
+
+class TestUnixSocketAdapter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, 'service.sock')
+        self.server = UnixHTTPServer(self.socket_path, EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.session = requests.Session()
+        self.session.mount(uds.SOCKET_HOST, uds.UnixSocketAdapter(self.socket_path))
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_requests_reach_the_socket(self):
+        """Test requests are sent over the socket with path and query intact."""
+        response = self.session.get(f'{uds.SOCKET_HOST}/auth/validate?x=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['path'], '/auth/validate?x=1')
+        self.assertEqual(response.json()['host'], 'localhost')
+
+    def test_connections_are_kept_alive(self):
+        """Test consecutive requests reuse one socket connection."""
+        first = self.session.get(f'{uds.SOCKET_HOST}/a').json()
+        second = self.session.get(f'{uds.SOCKET_HOST}/b').json()
+        self.assertEqual(first['connection'], second['connection'])
+
+    def test_stuck_server_times_out(self):
+        """Test the adapter's default timeout applies to requests without one."""
+        socket_path = os.path.join(self.directory.name, 'stuck.sock')
+        server = UnixHTTPServer(socket_path, StuckHandler)
+        server.release = threading.Event()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        session = requests.Session()
+        session.mount(uds.SOCKET_HOST, uds.UnixSocketAdapter(socket_path, timeout=0.2))
+        try:
+            with self.assertRaises(requests.Timeout):
+                session.get(f'{uds.SOCKET_HOST}/auth/validate')
+        finally:
+            server.release.set()
+            session.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_missing_socket_raises_connection_error(self):
+        """Test an absent socket surfaces as a requests connection error."""
+        session = requests.Session()
+        session.mount(uds.SOCKET_HOST, uds.UnixSocketAdapter(
+            os.path.join(self.directory.name, 'missing.sock')
+        ))
+        with self.assertRaises(requests.ConnectionError):
+            session.get(f'{uds.SOCKET_HOST}/auth/validate')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from common import workers
+
+
+class TestWorkerLifecycle(unittest.TestCase):
+    def test_callbacks_run_on_post_fork(self):
+        """Test the gunicorn hook runs every registered callback in order."""
+        app = Flask(__name__)
+        calls = []
+        workers.on_worker_start(app, lambda: calls.append('repository'))
+        workers.on_worker_start(app, lambda: calls.append('client'))
+
+        worker = MagicMock()
+        worker.app.wsgi.return_value = app
+        workers.post_fork(MagicMock(), worker)
+
+        self.assertEqual(calls, ['repository', 'client'])
+
+    def test_worker_count_uses_cpus(self):
+        """Test worker sizing scales with CPUs unless overridden."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('WEB_CONCURRENCY', None)
+            with patch('os.sched_getaffinity', return_value={0, 1, 2, 3}, create=True):
+                self.assertEqual(workers.worker_count(per_cpu=2, extra=1), 9)
+
+        with patch.dict(os.environ, {'WEB_CONCURRENCY': '3'}):
+            self.assertEqual(workers.worker_count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
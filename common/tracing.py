@@ -0,0 +1,274 @@
+# common/tracing.py
+"""
+Minimal distributed tracing with W3C trace-context propagation.
+
+Spans are started with ``span(name)``; the active span lives in a
+context variable so nested spans (repository writes, password hashing,
+outgoing calls) become its children. ``inject`` adds a ``traceparent``
+header for outgoing requests and ``init_app`` continues incoming ones,
+so a request crossing services shares one trace id.
+
+Finished spans go to a pluggable exporter. ``InMemoryExporter`` keeps
+them for tests and ad-hoc analysis, ``JsonLinesExporter`` appends one
+JSON document per span to a file. Tracing is disabled until an exporter
+is configured, either with ``set_exporter`` or through ``TRACE_EXPORTER``
+(``memory`` or ``file``, with ``TRACE_FILE`` as the file path).
+"""
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from flask import Flask, g, request
+
+TRACEPARENT = 'traceparent'
+_TRACEPARENT_RE = re.compile(
+    r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$'
+)
+
+
+class SpanContext:
+    __slots__ = ('trace_id', 'span_id', 'sampled')
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header, ignoring malformed values"""
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == '0' * 32 or span_id == '0' * 16:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def format_traceparent(context: SpanContext) -> str:
+    flags = '01' if context.sampled else '00'
+    return f'00-{context.trace_id}-{context.span_id}-{flags}'
+
+
+class Span:
+    def __init__(self, name: str, service: str, kind: str,
+                 parent: Optional[SpanContext],
+                 attributes: Optional[Dict] = None):
+        self.name = name
+        self.service = service
+        self.kind = kind
+        self.parent_id = parent.span_id if parent else None
+        self.context = SpanContext(
+            parent.trace_id if parent else secrets.token_hex(16),
+            secrets.token_hex(8),
+            parent.sampled if parent else True
+        )
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf)
+            if self.context.sampled and _exporter is not None:
+                _exporter.export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.context.trace_id,
+            'span_id': self.context.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'service': self.service,
+            'kind': self.kind,
+            'start_unix_nano': self.start_ns,
+            'end_unix_nano': self.end_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'status': self.status,
+            'attributes': self.attributes,
+        }
+
+
+class InMemoryExporter:
+    """Keeps the most recent finished spans in memory"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class JsonLinesExporter:
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line)
+
+
+_exporter = None
+_current: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def set_exporter(exporter) -> None:
+    """Route finished spans to ``exporter``; None disables tracing"""
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter():
+    return _exporter
+
+
+def configure_from_env() -> None:
+    """Install the exporter selected by ``TRACE_EXPORTER``, if any"""
+    kind = os.getenv('TRACE_EXPORTER', '').lower()
+    if kind == 'memory':
+        set_exporter(InMemoryExporter())
+    elif kind == 'file':
+        set_exporter(JsonLinesExporter(os.getenv('TRACE_FILE', 'traces/spans.jsonl')))
+    elif kind not in ('', 'none'):
+        raise ValueError(f'Unknown TRACE_EXPORTER {kind!r}')
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def start_span(name: str, kind: str = 'internal',
+               parent: Optional[SpanContext] = None,
+               service: Optional[str] = None,
+               attributes: Optional[Dict] = None) -> Span:
+    """
+    Create a span parented to ``parent`` or else the current span.
+
+    The span is not made current; ``span`` does that for a block.
+    """
+    active = _current.get()
+    if parent is None and active is not None:
+        parent = active.context
+    if service is None:
+        service = active.service if active is not None else 'unknown'
+    return Span(name, service, kind, parent, attributes)
+
+
+@contextmanager
+def span(name: str, kind: str = 'internal',
+         parent: Optional[SpanContext] = None,
+         service: Optional[str] = None, **attributes):
+    """
+    Trace the enclosed block as a child of ``parent`` or the current span.
+
+    Does nothing when tracing is disabled.
+    """
+    if _exporter is None:
+        yield None
+        return
+    new_span = start_span(name, kind, parent, service, attributes)
+    token = _current.set(new_span)
+    try:
+        yield new_span
+    except Exception as e:
+        new_span.status = 'error'
+        new_span.set_attribute('exception', repr(e))
+        raise
+    finally:
+        _current.reset(token)
+        new_span.end()
+
+
+def inject(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the current trace context to outgoing request headers"""
+    active = _current.get()
+    if active is not None:
+        headers[TRACEPARENT] = format_traceparent(active.context)
+    return headers
+
+
+def init_app(app: Flask, service: str) -> None:
+    """
+    Start a server span for every request of ``app``.
+
+    An incoming ``traceparent`` header makes the span a child of the
+    caller's span, so both services report the same trace id.
+    """
+    if _exporter is None:
+        configure_from_env()
+
+    @app.before_request
+    def _start_request_span():
+        if _exporter is None:
+            return
+        server_span = start_span(
+            f'{request.method} {request.endpoint or "unmatched"}',
+            kind='server',
+            parent=parse_traceparent(request.headers.get(TRACEPARENT)),
+            service=service,
+            attributes={'http.method': request.method, 'http.target': request.path}
+        )
+        g._trace_span = server_span
+        g._trace_token = _current.set(server_span)
+
+    @app.after_request
+    def _record_response(response):
+        server_span = g.get('_trace_span')
+        if server_span is not None:
+            server_span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                server_span.status = 'error'
+        return response
+
+    @app.teardown_request
+    def _end_request_span(exc):
+        server_span = g.pop('_trace_span', None)
+        if server_span is None:
+            return
+        if exc is not None:
+            server_span.status = 'error'
+            server_span.set_attribute('exception', repr(exc))
+        try:
+            _current.reset(g.pop('_trace_token'))
+        except ValueError:
+            # Teardown ran in a different context than before_request
+            _current.set(None)
+        server_span.end()
+
+
+def spans_for_trace(exporter: InMemoryExporter, trace_id: str) -> List[Span]:
+    """All exported spans of one trace, oldest first"""
+    return sorted(
+        (s for s in exporter.spans if s.context.trace_id == trace_id),
+        key=lambda s: s.start_ns
+    )
@@ -0,0 +1,100 @@
+# common/uds.py
+"""
+HTTP over Unix domain sockets for co-located services.
+
+A service URL is either a normal ``http://host:port`` base or
+``unix:/path/to/service.sock``, the same spelling gunicorn's ``bind``
+uses, so one value can configure both the server and its clients.
+``split_service_url`` turns it into the socket path (or None for TCP)
+and the base URL to put in front of request paths; over a socket the
+host part is only used for the ``Host`` header.
+
+``UnixSocketAdapter`` lets ``requests`` send to such a socket. It keeps
+one connection pool, so mounting it on a ``requests.Session`` gives
+keep-alive connections to the socket. ``requests`` waits forever by
+default, so the adapter applies its own ``timeout`` to requests that do
+not pass one; a stuck peer then fails the call instead of pinning the
+calling thread.
+"""
+import socket
+from typing import Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+UNIX_PREFIX = 'unix:'
+SOCKET_HOST = 'http://localhost'
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+
+def split_service_url(url: str) -> Tuple[Optional[str], str]:
+    """
+    Split a service URL into (socket path, base URL).
+
+    ``unix:/run/auth.sock`` gives ``('/run/auth.sock', 'http://localhost')``;
+    TCP URLs give ``(None, url)`` without a trailing slash.
+    """
+    if url.startswith(UNIX_PREFIX):
+        path = url[len(UNIX_PREFIX):]
+        if path.startswith('//'):
+            # Also accept the URL-like spelling unix:///run/auth.sock
+            path = path[2:]
+        if not path:
+            raise ValueError(f'No socket path in {url!r}')
+        return path, SOCKET_HOST
+    return None, url.rstrip('/')
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, *args, socket_path: str, **kwargs):
+        self.socket_path = socket_path
+        super().__init__(*args, **kwargs)
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.conn_kw['socket_path'] = socket_path
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Transport adapter sending every request to one Unix socket"""
+
+    def __init__(self, socket_path: str, pool_maxsize: int = 10,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS, **kwargs):
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.pool = UnixHTTPConnectionPool(socket_path, maxsize=pool_maxsize)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None,
+                                        cert=None):
+        return self.pool
+
+    def get_connection(self, url, proxies=None):
+        return self.pool
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self) -> None:
+        self.pool.close()
+        super().close()
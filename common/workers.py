@@ -0,0 +1,53 @@
+# common/workers.py
+"""
+Helpers for running the services under a pre-forking server (gunicorn).
+
+With ``preload_app`` the application is built once in the master and
+every worker is forked from it, so state loaded at import time is
+shared copy-on-write but anything that must not cross a fork (open
+files, connection pools, data that may have changed since the master
+loaded it) has to be re-initialized in the worker. Components register
+such callbacks with ``on_worker_start``; the gunicorn ``post_fork`` hook
+below runs them in each new worker.
+"""
+import logging
+import os
+from typing import Callable
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'worker_start_callbacks'
+
+
+def on_worker_start(app: Flask, callback: Callable[[], None]) -> None:
+    """Run ``callback`` in every worker process forked after app creation"""
+    app.extensions.setdefault(EXTENSION_KEY, []).append(callback)
+
+
+def worker_started(app: Flask) -> None:
+    for callback in app.extensions.get(EXTENSION_KEY, []):
+        callback()
+
+
+def worker_count(per_cpu: int = 2, extra: int = 1) -> int:
+    """
+    Number of worker processes: ``WEB_CONCURRENCY`` if set, otherwise
+    ``per_cpu`` per usable CPU plus ``extra``.
+    """
+    configured = os.getenv('WEB_CONCURRENCY')
+    if configured:
+        return int(configured)
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return cpus * per_cpu + extra
+
+
+def post_fork(server, worker) -> None:
+    """gunicorn hook: re-initialize per-worker state of the preloaded app"""
+    app = worker.app.wsgi()
+    worker_started(app)
+    logger.info(f'Worker {worker.pid} initialized')
@@ -1,41 +1,84 @@
 # app.py
 
+import os
+import sys
 from flask import Flask
 from flask_restx import Api
 from flask_cors import CORS
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import admission, compression, json_provider, metrics, profiling, tracing, workers
+from config import DevelopmentConfig
+from models.catalogue_store import CatalogueStore
+from models.destination_repository import DestinationRepository
 from routes.destination_routes import register_destination_routes
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__)
-CORS(app)  # Enable CORS if needed
-
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your_secret_key')
-
-# Configure Swagger UI with Bearer Token Authorization
-authorizations = {
-    'Bearer Auth': {
-        'type': 'apiKey',
-        'in': 'header',
-        'name': 'Authorization'
-    },
-}
-
-# Initialize Flask-RESTX API with security configuration
-api = Api(
-    app,
-    version='1.0',
-    title='Destination Service',
-    description='Travel Destination Management',
-    authorizations=authorizations,
-    security='Bearer Auth'  # This makes sure the Authorization header is expected
-)
-
-# Register destination routes
-register_destination_routes(api)
+from services.auth_service import InProcessAuthService
+
+
+def create_app(config=DevelopmentConfig, validate_token=None):
+    """
+    Build the destination service application.
+
+    Args:
+        config: Config class or import path passed to ``config.from_object``
+        validate_token: In-process token validator (token -> decoded data
+            or None) used instead of calling the auth service over HTTP
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS if needed
+    app.config.from_object(config)
+
+    # Configure Swagger UI with Bearer Token Authorization
+    authorizations = {
+        'Bearer Auth': {
+            'type': 'apiKey',
+            'in': 'header',
+            'name': 'Authorization'
+        },
+    }
+
+    # Initialize Flask-RESTX API with security configuration
+    api = Api(
+        app,
+        version='1.0',
+        title='Destination Service',
+        description='Travel Destination Management',
+        authorizations=authorizations,
+        security='Bearer Auth'  # This makes sure the Authorization header is expected
+    )
+
+    # Recover the catalogue from disk when a data directory is configured
+    repository = None
+    if app.config.get('DESTINATION_DATA_DIR'):
+        store = CatalogueStore(
+            app.config['DESTINATION_DATA_DIR'],
+            compact_every=app.config['DESTINATION_COMPACT_EVERY'],
+            fsync=app.config['DESTINATION_JOURNAL_FSYNC']
+        )
+        repository = DestinationRepository(store=store)
+        workers.on_worker_start(app, repository.reload)
+
+    auth_service = None
+    if validate_token is not None:
+        auth_service = InProcessAuthService(validate_token)
+
+    # Register destination routes
+    register_destination_routes(api, repository, auth_service)
+    json_provider.init_app(app, api)
+    compression.init_app(app)
+    metrics.init_app(app, 'destination_service')
+    tracing.init_app(app, 'destination_service')
+    admission.init_app(app, 'destination_service')
+    profiling.init_app(app)
+
+    return app
+
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5001)
+    app = create_app()
+    app.run(port=5001)
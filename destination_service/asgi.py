@@ -0,0 +1,207 @@
+# asgi.py
+"""
+Asyncio-native variant of the destination service.
+
+Serves the same API as the Flask app (``GET /destinations/``, admin-only
+``DELETE /destinations/<id>`` and ``/metrics``) on top of the same
+``DestinationRepository``, but validates admin tokens with a non-blocking
+HTTP client. A request waiting on the auth service then costs a suspended
+coroutine rather than a server thread, so one process keeps serving
+listings while many deletes are in flight.
+
+Run it with uvicorn from this directory:
+    uvicorn --factory asgi:create_asgi_app --port 5001
+
+As with the Flask app, ``DESTINATION_DATA_DIR`` keeps the catalogue in a
+``CatalogueStore``. One process owns the journal, so run a single uvicorn
+worker when it is set.
+"""
+import os
+import sys
+import time
+from urllib.parse import parse_qs
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import json_provider, metrics, projection, tracing
+from config import DevelopmentConfig
+from models.catalogue_store import CatalogueStore
+from models.destination_repository import DestinationRepository
+from services.async_auth_service import AsyncAuthService
+
+SERVICE = 'destination_service'
+PREFIX = '/destinations/'
+JSON = json_provider.get_backend()
+
+
+class DestinationASGIApp:
+    def __init__(self, repository=None, auth_service=None,
+                 registry=metrics.REGISTRY, store=None):
+        self.repository = repository or DestinationRepository()
+        self.auth_service = auth_service or AsyncAuthService()
+        # Closed on shutdown: the store the app opened for ``repository``
+        self.store = store
+        self.registry = registry
+        (self.requests_total, self.errors_total,
+         self.duration, self.in_flight) = metrics.request_metrics(registry)
+        if tracing.get_exporter() is None:
+            tracing.configure_from_env()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.auth_service.aclose()
+                if self.store is not None:
+                    self.store.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _route(self, method, path):
+        """Resolve a request to (endpoint name, handler, path argument)"""
+        if path in (PREFIX, PREFIX.rstrip('/')):
+            if method == 'GET':
+                return 'destinations_destination_list', self._list, None
+            return 'destinations_destination_list', None, None
+        if path.startswith(PREFIX) and '/' not in path[len(PREFIX):]:
+            if method == 'DELETE':
+                return ('destinations_destination_resource', self._delete,
+                        path[len(PREFIX):])
+            return 'destinations_destination_resource', None, None
+        if path == '/metrics':
+            return 'metrics', self._metrics if method == 'GET' else None, None
+        return 'unmatched', None, None
+
+    async def _http(self, scope, send):
+        method, path = scope['method'], scope['path']
+        headers = {
+            key.decode('latin-1').lower(): value.decode('latin-1')
+            for key, value in scope.get('headers', [])
+        }
+        endpoint, handler, argument = self._route(method, path)
+        labels = {'service': SERVICE, 'endpoint': endpoint, 'method': method}
+        start = time.perf_counter()
+        self.in_flight.inc(service=SERVICE, endpoint=endpoint)
+        status = 500
+        try:
+            with tracing.span(
+                f'{method} {endpoint}', kind='server',
+                parent=tracing.parse_traceparent(headers.get(tracing.TRACEPARENT)),
+                service=SERVICE,
+                **{'http.method': method, 'http.target': path}
+            ) as server_span:
+                if handler is None and endpoint == 'unmatched':
+                    status, body, content_type = _json(404, {'message': 'Not Found'})
+                elif handler is None:
+                    status, body, content_type = _json(
+                        405, {'message': 'Method Not Allowed'}
+                    )
+                elif argument is None:
+                    status, body, content_type = await handler(scope, headers)
+                else:
+                    status, body, content_type = await handler(scope, headers, argument)
+                if server_span is not None:
+                    server_span.set_attribute('http.status_code', status)
+                    if status >= 500:
+                        server_span.status = 'error'
+            await send({
+                'type': 'http.response.start',
+                'status': status,
+                'headers': [
+                    (b'content-type', content_type.encode('latin-1')),
+                    (b'content-length', str(len(body)).encode('latin-1')),
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': body})
+        finally:
+            self.in_flight.dec(service=SERVICE, endpoint=endpoint)
+            self.duration.observe(time.perf_counter() - start, **labels)
+            self.requests_total.inc(status=status, **labels)
+            if status >= 500:
+                self.errors_total.inc(**labels)
+
+    async def _list(self, scope, headers):
+        """Retrieve all destinations"""
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        try:
+            fields = projection.parse_fields(
+                _arg(query, projection.FIELDS_PARAM), self.repository.FIELDS
+            )
+            limit = None
+            if _arg(query, 'limit'):
+                try:
+                    limit = int(_arg(query, 'limit'))
+                except ValueError:
+                    raise ValueError('Query parameter limit must be a number')
+                if limit < 1:
+                    raise ValueError('limit must be at least 1')
+            destinations = self.repository.get_all(
+                fields, _arg(query, 'currency'), location=_arg(query, 'location'),
+                sort=_arg(query, 'sort'), limit=limit
+            )
+        except ValueError as e:
+            return _json(400, {'message': str(e)})
+        return _json(200, destinations)
+
+    async def _delete(self, scope, headers, destination_id):
+        """Delete a destination (Admin only)"""
+        auth_header = headers.get('authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return _json(401, {'message': 'Invalid authorization header'})
+
+        token = auth_header.split(' ')[1]
+
+        if not await self.auth_service.validate_admin_token(token):
+            return _json(403, {'message': 'Admin access required'})
+
+        if self.repository.delete(destination_id):
+            return _json(200, {'message': 'Destination deleted'})
+
+        return _json(404, {'message': 'Destination not found'})
+
+    async def _metrics(self, scope, headers):
+        return 200, self.registry.render().encode('utf-8'), metrics.CONTENT_TYPE
+
+
+def _arg(query, name):
+    """First value of a query parameter, or None"""
+    return query.get(name, [None])[0]
+
+
+def _json(status, data):
+    """Serialize a response body the way flask-restx does"""
+    return status, JSON.dumps(data) + b'\n', 'application/json'
+
+
+def create_asgi_app(repository=None, auth_service=None, config=DevelopmentConfig):
+    """
+    Build the ASGI destination service.
+
+    Args:
+        repository: Destination store; by default a ``DestinationRepository``
+            recovered from ``config.DESTINATION_DATA_DIR`` when that is set,
+            else a fresh in-memory one
+        auth_service: Object with an async ``validate_admin_token``
+        config: Config class to read the persistence settings from
+
+    Returns:
+        DestinationASGIApp: The ASGI application callable
+    """
+    store = None
+    if repository is None and getattr(config, 'DESTINATION_DATA_DIR', None):
+        store = CatalogueStore(
+            config.DESTINATION_DATA_DIR,
+            compact_every=config.DESTINATION_COMPACT_EVERY,
+            fsync=config.DESTINATION_JOURNAL_FSYNC
+        )
+        repository = DestinationRepository(store=store)
+    return DestinationASGIApp(repository, auth_service, store=store)
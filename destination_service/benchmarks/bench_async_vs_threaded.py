@@ -0,0 +1,229 @@
+# benchmarks/bench_async_vs_threaded.py
+"""
+Throughput and tail latency of the threaded (gunicorn gthread) and the
+asyncio (uvicorn) destination service under auth-bound load.
+
+A stub auth service on port 5006 answers ``/auth/validate`` as Admin
+after ``--auth-delay`` seconds, standing in for a slow or remote auth
+service. Each server is then driven with admin deletes of unknown ids
+(one validation round trip each, no state change) mixed with listings,
+at a concurrency well above the gthread pool size.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_async_vs_threaded --concurrency 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.dirname(SERVICE_DIR)
+sys.path.append(ROOT)
+
+from loadtest.stats import summarize  # noqa: E402
+
+AUTH_PORT = 5006
+
+
+def serve_stub_auth(delay: float) -> None:
+    """Answer every request as Admin after ``delay`` seconds (keep-alive aware)"""
+    body = json.dumps({'role': 'Admin'}).encode()
+    response = (
+        b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+        b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+    )
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                await asyncio.sleep(delay)
+                writer.write(response)
+                await writer.drain()
+                if b'connection: close' in head.lower():
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(
+            handle, '127.0.0.1', AUTH_PORT, backlog=1024
+        )
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def server_commands(port: int, workers: int, threads: int):
+    bind = f'127.0.0.1:{port}'
+    return {
+        'gthread': [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+            '--bind', bind, '--workers', str(workers), '--threads', str(threads),
+            '--log-level', 'warning',
+        ],
+        'asyncio': [
+            sys.executable, '-m', 'uvicorn', '--factory', 'asgi:create_asgi_app',
+            '--host', '127.0.0.1', '--port', str(port),
+            '--workers', str(workers), '--log-level', 'warning',
+            '--no-access-log',
+        ],
+    }
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} did not become ready')
+
+
+class Connection:
+    """
+    One keep-alive HTTP/1.1 connection per simulated client.
+
+    Deliberately minimal: a pooled client library spends more CPU per
+    request than the servers under test once hundreds of requests are in
+    flight, and on a small machine that would be what gets measured.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, headers: str = '') -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        self.writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n{headers}\r\n'.encode()
+        )
+        try:
+            head = await self.reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.close()
+            raise
+        status = int(head.split(b' ', 2)[1])
+        length = 0
+        close = False
+        for line in head.lower().split(b'\r\n'):
+            if line.startswith(b'content-length:'):
+                length = int(line.split(b':', 1)[1])
+            elif line == b'connection: close':
+                close = True
+        await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return status
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def drive(port: int, concurrency: int, duration: float,
+                delete_share: float):
+    latencies = {'delete': [], 'list': []}
+    errors = {'delete': 0, 'list': 0}
+    auth_header = 'Authorization: Bearer benchmark\r\n'
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        connection = Connection('127.0.0.1', port)
+        sent = 0
+        while time.perf_counter() < deadline:
+            sent += 1
+            is_delete = (sent * 37 + index) % 100 < delete_share * 100
+            kind = 'delete' if is_delete else 'list'
+            start = time.perf_counter()
+            try:
+                if is_delete:
+                    status = await connection.request(
+                        'DELETE', f'/destinations/missing-{index}-{sent}',
+                        auth_header
+                    )
+                    ok = status == 404
+                else:
+                    ok = await connection.request('GET', '/destinations/') == 200
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                ok = False
+            latencies[kind].append(time.perf_counter() - start)
+            errors[kind] += not ok
+        connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        kind: summarize(latencies[kind], errors[kind], elapsed)
+        for kind in latencies
+    }
+
+
+def run(name: str, command, args) -> None:
+    base_url = f'http://127.0.0.1:{args.port}'
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env)
+    try:
+        wait_ready(f'{base_url}/destinations/')
+        asyncio.run(drive(args.port, args.concurrency, 1.0, args.delete_share))
+        results = asyncio.run(
+            drive(args.port, args.concurrency, args.duration, args.delete_share)
+        )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    for kind, summary in results.items():
+        print(
+            f'{name:<8} {kind:<7} {summary["rps"]:9.1f} req/s'
+            f'  p50 {summary["p50_ms"]:8.1f} ms'
+            f'  p99 {summary["p99_ms"]:8.1f} ms'
+            f'  errors {summary["errors"]}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--auth-delay', type=float, default=0.05,
+                        help='Seconds the stub auth service takes per validation')
+    parser.add_argument('--delete-share', type=float, default=0.5)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--port', type=int, default=5101)
+    parser.add_argument('--only', choices=['gthread', 'asyncio'])
+    args = parser.parse_args()
+
+    # Own process, so the stub does not compete with the load generator
+    auth = multiprocessing.Process(
+        target=serve_stub_auth, args=(args.auth_delay,), daemon=True
+    )
+    auth.start()
+    try:
+        commands = server_commands(args.port, args.workers, args.threads)
+        for name, command in commands.items():
+            if args.only in (None, name):
+                run(name, command, args)
+    finally:
+        auth.terminate()
+
+
+if __name__ == '__main__':
+    main()
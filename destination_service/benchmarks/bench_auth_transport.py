@@ -0,0 +1,141 @@
+# benchmarks/bench_auth_transport.py
+"""
+Per-call cost of admin token validation over loopback TCP versus a Unix
+domain socket.
+
+Starts the real auth service under gunicorn bound to both a TCP port and
+a socket in a scratch directory, then times validation calls from
+``threads`` client threads, each variant for ``--calls`` calls:
+
+- ``tcp-new``: a fresh TCP connection per call (``requests.get``, the
+  client's behaviour on TCP)
+- ``tcp-keepalive`` / ``uds-keepalive``: pooled keep-alive connections
+- ``uds-new``: a fresh socket connection per call
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_auth_transport --calls 5000 --threads 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import requests
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.dirname(SERVICE_DIR)
+sys.path.append(ROOT)
+
+from common import uds  # noqa: E402
+from loadtest.stats import summarize  # noqa: E402
+
+SECRET_KEY = 'transport-benchmark'
+
+
+def start_auth(port: int, socket_path: str) -> subprocess.Popen:
+    env = dict(
+        os.environ, PYTHONPATH=ROOT, SECRET_KEY=SECRET_KEY, WEB_CONCURRENCY='1',
+        GUNICORN_MAX_REQUESTS='0',
+        BIND=f'127.0.0.1:{port},unix:{socket_path}'
+    )
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--log-level', 'warning'],
+        cwd=os.path.join(ROOT, 'auth_service'), env=env
+    )
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} did not become ready')
+
+
+def unix_session(socket_path: str, pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    session.mount(uds.SOCKET_HOST, uds.UnixSocketAdapter(socket_path, pool_maxsize))
+    return session
+
+
+def run_variant(call, calls: int, threads: int):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(count: int):
+        nonlocal errors
+        local, failed = [], 0
+        for _ in range(count):
+            start = time.perf_counter()
+            try:
+                ok = call().json().get('role') == 'Admin'
+            except requests.RequestException:
+                ok = False
+            local.append(time.perf_counter() - start)
+            failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for future in [pool.submit(worker, calls // threads) for _ in range(threads)]:
+            future.result()
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--port', type=int, default=5106)
+    args = parser.parse_args()
+
+    token = jwt.encode({'role': 'Admin', 'email': 'admin@example.com'},
+                       SECRET_KEY, algorithm='HS256')
+    headers = {'Authorization': f'Bearer {token}'}
+    close = dict(headers, Connection='close')
+    tcp_url = f'http://127.0.0.1:{args.port}/auth/validate'
+    unix_url = f'{uds.SOCKET_HOST}/auth/validate'
+
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'auth.sock')
+        server = start_auth(args.port, socket_path)
+        try:
+            wait_ready(tcp_url)
+            tcp = requests.Session()
+            tcp.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=args.threads))
+            unix = unix_session(socket_path, args.threads)
+            variants = {
+                'tcp-new': lambda: requests.get(tcp_url, headers=headers),
+                'tcp-keepalive': lambda: tcp.get(tcp_url, headers=headers),
+                'uds-new': lambda: unix.get(unix_url, headers=close),
+                'uds-keepalive': lambda: unix.get(unix_url, headers=headers),
+            }
+            for name, call in variants.items():
+                run_variant(call, min(args.calls, 200), args.threads)
+                summary = run_variant(call, args.calls, args.threads)
+                print(
+                    f'{name:<14} {summary["rps"]:8.1f} calls/s'
+                    f'  mean {summary["mean_ms"] * 1000:7.0f} us'
+                    f'  p50 {summary["p50_ms"] * 1000:7.0f} us'
+                    f'  p99 {summary["p99_ms"] * 1000:7.0f} us'
+                    f'  errors {summary["errors"]}'
+                )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
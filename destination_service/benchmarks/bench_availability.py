@@ -0,0 +1,96 @@
+# benchmarks/bench_availability.py
+"""
+Date-range availability queries over the bitmap calendar, against a
+per-destination scan of booked nights.
+
+Each destination gets a random set of bookings over a two-year window;
+queries are stays of 1-14 nights (and one of 90) at random dates.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_availability --destinations 100000 --days 730
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.availability import AvailabilityCalendar  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--bookings', type=int, default=20,
+                        help='Average bookings per destination')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    today = date.today()
+    calendar = AvailabilityCalendar(args.days, today=lambda: today)
+    booked = []
+
+    start = time.perf_counter()
+    for i in range(args.destinations):
+        calendar.add(str(i))
+    added = time.perf_counter() - start
+    total = 0
+    start = time.perf_counter()
+    for i in range(args.destinations):
+        nights = set()
+        for _ in range(rng.randint(0, 2 * args.bookings)):
+            first = rng.randrange(args.days)
+            last = min(args.days, first + rng.randint(1, 7))
+            calendar.set_available(str(i), today + timedelta(days=first),
+                                   today + timedelta(days=last), False)
+            nights.update(range(first, last))
+            total += 1
+        booked.append(nights)
+    booking = time.perf_counter() - start
+    print(f'calendar: {args.destinations} destinations x {args.days} days,'
+          f' {calendar.bits.nbytes / 2**20:.1f} MiB;'
+          f' add {added / args.destinations * 1e6:.1f} us/destination,'
+          f' {total} bookings at {booking / max(total, 1) * 1e6:.1f} us each')
+
+    for nights in (1, 7, 14, 90):
+        intersect, latencies, results = [], [], 0
+        for _ in range(args.queries):
+            first = rng.randrange(args.days - nights)
+            begin = today + timedelta(days=first)
+            end = begin + timedelta(days=nights)
+            start = time.perf_counter()
+            calendar.free_bitmap(begin, end)
+            intersect.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            results += len(calendar.available(begin, end))
+            latencies.append(time.perf_counter() - start)
+        intersect.sort()
+        latencies.sort()
+        print(f'stay of {nights:>2} nights: bitmap AND p50'
+              f' {percentile(intersect, 50) * 1e3:6.3f} ms;'
+              f' with ids p50 {percentile(latencies, 50) * 1e3:6.3f} ms'
+              f' p99 {percentile(latencies, 99) * 1e3:6.3f} ms'
+              f'  avg free {results / args.queries:,.0f}')
+
+    scan_times = []
+    for _ in range(3):
+        first = rng.randrange(args.days - 7)
+        stay = set(range(first, first + 7))
+        start = time.perf_counter()
+        expected = [str(i) for i, nights in enumerate(booked) if not nights & stay]
+        scan_times.append(time.perf_counter() - start)
+        begin = today + timedelta(days=first)
+        assert calendar.available(begin, begin + timedelta(days=7)) == expected
+    print(f'per-destination scan, 7 nights: {sum(scan_times) / 3 * 1e3:.1f} ms/query'
+          ' (results match)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_cheapest.py
+"""
+"Cheapest N in location X" through the per-location price index, the
+partial sort used across locations, and the full-list-plus-sort the
+front end used to do.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_cheapest --destinations 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.destination_repository import DestinationRepository  # noqa: E402
+
+
+def measure(label, func, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f'{label:<44} p50 {percentile(latencies, 50) * 1e3:9.3f} ms'
+          f'  p99 {percentile(latencies, 99) * 1e3:9.3f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=1000000)
+    parser.add_argument('--locations', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    locations = [f'L{i}' for i in range(args.locations)]
+    repository = DestinationRepository()
+    start = time.perf_counter()
+    for i in range(args.destinations):
+        repository.add({
+            'id': f'd{i}', 'name': f'Hotel {i}', 'description': '',
+            'location': rng.choice(locations),
+            'price_per_night': round(rng.uniform(20, 900), 2),
+        })
+    print(f'load: {len(repository.prices)} destinations'
+          f' in {time.perf_counter() - start:.1f}s')
+
+    fields = ('id', 'price_per_night')
+    measure(f'index: location=X sort=price limit={args.limit}',
+            lambda: repository.get_all(fields, location=rng.choice(locations),
+                                       sort='price', limit=args.limit),
+            args.queries)
+    measure(f'index: location=X sort=-price limit={args.limit}',
+            lambda: repository.get_all(fields, location=rng.choice(locations),
+                                       sort='-price', limit=args.limit),
+            args.queries)
+    measure(f'partial sort: all locations limit={args.limit}',
+            lambda: repository.get_all(fields, sort='price', limit=args.limit), 20)
+
+    def full_list_and_sort():
+        location = rng.choice(locations)
+        matches = [d for d in repository.get_all(fields + ('location',))
+                   if d['location'] == location]
+        return sorted(matches, key=lambda d: d['price_per_night'])[:args.limit]
+
+    measure('baseline: full list + filter + sort', full_list_and_sort, 3)
+
+    start = time.perf_counter()
+    repository.reprice(5, locations[0])
+    print(f'reprice one location (stats + index rebuild): '
+          f'{(time.perf_counter() - start) * 1e3:.0f} ms')
+    start = time.perf_counter()
+    repository.reprice(5)
+    print(f'reprice everything (stats + index rebuild): '
+          f'{(time.perf_counter() - start) * 1e3:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_concurrency.py
+"""
+Read throughput and latency of the destination repository as reader
+threads are added, with a writer adding and deleting destinations
+throughout: lock-free optimistic reads against every read taking the
+write lock.
+
+Under the GIL, CPU-bound reads do not scale with threads either way; the
+difference shows when writes are slow, e.g. with ``--fsync``, where each
+write holds the lock through an fsync of the journal.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_concurrency --destinations 100000 --threads 1,2,4,8
+    python -m benchmarks.bench_concurrency --fsync
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.catalogue_store import CatalogueStore  # noqa: E402
+from models.destination_repository import DestinationRepository  # noqa: E402
+
+
+def destination(number, locations, rng):
+    return {'id': f'd{number}', 'name': f'Hotel {number}', 'description': '',
+            'location': rng.choice(locations),
+            'price_per_night': round(rng.uniform(20, 900), 2),
+            'latitude': rng.uniform(-60, 70), 'longitude': rng.uniform(-180, 180)}
+
+
+def run(repository, threads, seconds, write_interval, args, locations):
+    stop = threading.Event()
+    latencies = [[] for _ in range(threads)]
+    writes = [0]
+
+    def read(index):
+        rng = random.Random(index)
+        own = latencies[index]
+        while not stop.is_set():
+            start = time.perf_counter()
+            if rng.random() < 0.5:
+                repository.get_all(('id', 'price_per_night'), location=rng.choice(locations),
+                                   sort='price', limit=10)
+            else:
+                repository.near(rng.uniform(-60, 70), rng.uniform(-180, 180), 500, limit=10)
+            own.append(time.perf_counter() - start)
+
+    def write():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            number = rng.randrange(args.destinations)
+            if rng.random() < 0.5:
+                repository.delete(f'd{number}')
+            else:
+                repository.add(destination(number, locations, rng))
+            writes[0] += 1
+            time.sleep(write_interval)
+
+    workers = [threading.Thread(target=read, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=write))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    merged = sorted(latency for own in latencies for latency in own)
+    return len(merged) / seconds, percentile(merged, 99), writes[0] / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=100000)
+    parser.add_argument('--threads', default='1,2,4,8')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--write-interval', type=float, default=0.001,
+                        help='pause between writes (seconds)')
+    parser.add_argument('--fsync', action='store_true',
+                        help='journal every write to disk with fsync')
+    parser.add_argument('--locations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    locations = [f'L{i}' for i in range(args.locations)]
+    repository = DestinationRepository()
+    for number in range(args.destinations):
+        repository.add(destination(number, locations, rng))
+    directory = None
+    if args.fsync:
+        # Attached after loading so only the measured writes are journaled
+        directory = tempfile.mkdtemp(prefix='catalogue-')
+        repository.store = CatalogueStore(directory, compact_every=10 ** 9, fsync=True)
+    optimistic = repository._read
+
+    def locked(read):
+        with repository._lock:
+            return read()
+
+    print(f'{"reads":<12}{"threads":>8}{"reads/s":>12}{"p99 ms":>10}{"writes/s":>10}')
+    for mode, reader in (('lock-free', optimistic), ('locked', locked)):
+        repository._read = reader
+        for threads in [int(count) for count in args.threads.split(',')]:
+            throughput, p99, write_rate = run(
+                repository, threads, args.seconds, args.write_interval, args, locations
+            )
+            print(f'{mode:<12}{threads:>8}{throughput:>12.0f}{p99 * 1e3:>10.3f}'
+                  f'{write_rate:>10.0f}')
+    if directory is not None:
+        repository.store.close()
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
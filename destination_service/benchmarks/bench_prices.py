@@ -0,0 +1,81 @@
+# benchmarks/bench_prices.py
+"""
+Currency conversion and bulk repricing over the NumPy price column,
+against the per-record Python loops they replace.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_prices --destinations 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.destination_repository import DestinationRepository  # noqa: E402
+
+
+def timed(func, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return percentile(latencies, 50) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=1000000)
+    parser.add_argument('--locations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    repository = DestinationRepository()
+    start = time.perf_counter()
+    for i in range(args.destinations):
+        repository.add({
+            'id': f'd{i}', 'name': f'Hotel {i}', 'description': '',
+            'location': f'L{rng.randrange(args.locations)}',
+            'price_per_night': round(rng.uniform(20, 900), 2),
+        })
+    print(f'load: {len(repository.prices)} destinations'
+          f' in {time.perf_counter() - start:.1f}s')
+
+    rate = repository.rates.rate('EUR')
+    records = [dict(d, price_per_night=p) for d, p in zip(
+        repository.destinations.values(),
+        repository.prices.prices_at(repository.prices.live_slots()).tolist()
+    )]
+    slots = repository.prices.live_slots()
+
+    loop = timed(lambda: [round(r['price_per_night'] * rate, 2) for r in records],
+                 args.repeat)
+    column = timed(lambda: repository.prices.prices_at(slots, rate).tolist(), args.repeat)
+    print(f'convert prices: python loop {loop:8.1f} ms   column {column:8.1f} ms')
+
+    def loop_reprice():
+        for record in records:
+            record['price_per_night'] = round(record['price_per_night'] * 1.05, 2)
+
+    loop = timed(loop_reprice, args.repeat)
+    column = timed(lambda: repository.prices.scale(1.05), args.repeat)
+    print(f'reprice all:    python loop {loop:8.1f} ms   column {column:8.1f} ms')
+    full = timed(lambda: repository.reprice(5), args.repeat)
+    print(f'reprice + stats rebuild: {full:8.1f} ms')
+    location = timed(lambda: repository.reprice(5, 'L0'), args.repeat)
+    print(f'reprice one location + stats rebuild: {location:8.1f} ms')
+
+    plain = timed(lambda: repository.get_all(), args.repeat)
+    converted = timed(lambda: repository.get_all(currency='EUR'), args.repeat)
+    print(f'get_all: base {plain:8.1f} ms   currency=EUR {converted:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
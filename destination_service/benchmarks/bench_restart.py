@@ -0,0 +1,111 @@
+# benchmarks/bench_restart.py
+"""
+Restart time of a persisted catalogue: writing a snapshot, and
+recovering from it (memory-mapped snapshot plus journal replay) compared
+with rebuilding the catalogue one ``add`` at a time.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_restart --destinations 1000000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.availability import AvailabilityCalendar  # noqa: E402
+from models.catalogue_store import CatalogueSnapshot, CatalogueStore  # noqa: E402
+from models.destination_repository import DestinationRepository  # noqa: E402
+from models.suggest_index import SuggestIndex  # noqa: E402
+
+
+def synthetic_snapshot(count, locations, rng):
+    records, prices = [], np.empty(count)
+    for i in range(count):
+        record = {'id': f'd{i}', 'name': f'Hotel {i}', 'description': '',
+                  'location': rng.choice(locations)}
+        if i % 2:
+            record['latitude'] = rng.uniform(-60, 70)
+            record['longitude'] = rng.uniform(-180, 180)
+        records.append(record)
+        prices[i] = round(rng.uniform(20, 900), 2)
+    calendar = AvailabilityCalendar(capacity=count)
+    ids = [record['id'] for record in records]
+    for destination_id in ids:
+        calendar.slots[destination_id] = len(calendar.ids)
+        calendar.ids.append(destination_id)
+    calendar.bits[:, :count // 64] = ~np.uint64(0)
+    terms = SuggestIndex()
+    for record in records:
+        terms.add(record)
+    return CatalogueSnapshot(records, prices, date.today(), calendar.ids, calendar.bits,
+                             terms.export())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--destinations', type=int, default=1000000)
+    parser.add_argument('--journal', type=int, default=10000,
+                        help='changes made after the snapshot')
+    parser.add_argument('--baseline', type=int, default=100000,
+                        help='destinations to time per-record add() on')
+    parser.add_argument('--locations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    locations = [f'L{i}' for i in range(args.locations)]
+    snapshot = synthetic_snapshot(args.destinations, locations, rng)
+    directory = tempfile.mkdtemp(prefix='catalogue-')
+    try:
+        store = CatalogueStore(directory)
+        store.attach(lambda: snapshot, threading.Lock())
+        start = time.perf_counter()
+        store.compact()
+        size = sum(os.path.getsize(os.path.join(directory, name))
+                   for name in os.listdir(directory))
+        print(f'snapshot write: {args.destinations} destinations, {size / 1e6:.0f} MB'
+              f' in {time.perf_counter() - start:.1f}s')
+
+        store = CatalogueStore(directory, compact_every=10 ** 9)
+        repository = DestinationRepository(store=store)
+        start = time.perf_counter()
+        for i in range(args.journal):
+            repository.add({'id': f'd{rng.randrange(args.destinations)}',
+                            'name': f'Renamed {i}', 'location': rng.choice(locations),
+                            'price_per_night': round(rng.uniform(20, 900), 2)})
+        store.close()
+        print(f'journal: {args.journal} upserts'
+              f' in {time.perf_counter() - start:.1f}s')
+
+        start = time.perf_counter()
+        store = CatalogueStore(directory)
+        recovered = DestinationRepository(store=store)
+        elapsed = time.perf_counter() - start
+        store.close()
+        print(f'recovery: {len(recovered.prices)} destinations'
+              f' (snapshot + {args.journal} journal entries) in {elapsed:.1f}s')
+
+        records = snapshot.records[:args.baseline]
+        prices = snapshot.prices[:args.baseline].tolist()
+        rebuilt = DestinationRepository()
+        start = time.perf_counter()
+        for record, price in zip(records, prices):
+            rebuilt.add({**record, 'price_per_night': price})
+        per_record = (time.perf_counter() - start) / len(records)
+        print(f'baseline: add() per record {per_record * 1e6:.0f} us, about'
+              f' {per_record * args.destinations:.0f}s for {args.destinations}')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_spatial.py
+"""
+Build cost, memory and "near me" query latency of the grid index.
+
+Points are clustered around random "cities" (the way hotels are), with a
+share spread uniformly over the globe. Queries are centred on random
+cities; a handful are checked against an exhaustive scan, which is also
+timed as the baseline.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_spatial --points 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.spatial_index import GeoGridIndex, haversine_km  # noqa: E402
+
+
+def generate(count: int, cities: int, seed: int):
+    rng = random.Random(seed)
+    centres = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(cities)]
+    points = []
+    for i in range(count):
+        if i % 5 == 0:
+            lat, lon = rng.uniform(-89, 89), rng.uniform(-180, 180)
+        else:
+            clat, clon = rng.choice(centres)
+            lat = max(-90.0, min(90.0, rng.gauss(clat, 0.3)))
+            lon = (rng.gauss(clon, 0.3) + 180.0) % 360.0 - 180.0
+        points.append((str(i), lat, lon))
+    return centres, points
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--points', type=int, default=1000000)
+    parser.add_argument('--cities', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--cell', type=float, default=0.5, help='Cell size in degrees')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    centres, points = generate(args.points, args.cities, args.seed)
+    rng = random.Random(args.seed + 1)
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = GeoGridIndex(args.cell)
+    for point_id, lat, lon in points:
+        index.add(point_id, lat, lon)
+    build = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'build: {len(index)} points in {build:.2f}s'
+          f' ({len(index) / build:,.0f}/s), {memory / 2**20:.0f} MiB'
+          f' ({memory / len(index):.0f} B/point), cell {args.cell} deg')
+
+    for radius in (10, 50, 200, 1000):
+        latencies, results = [], 0
+        for _ in range(args.queries):
+            lat, lon = rng.choice(centres)
+            start = time.perf_counter()
+            results += len(index.nearest(lat, lon, radius, 10))
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f'nearest radius={radius:>5} km limit=10:'
+              f' p50 {percentile(latencies, 50) * 1e3:7.3f} ms'
+              f' p99 {percentile(latencies, 99) * 1e3:7.3f} ms'
+              f' avg results {results / args.queries:.1f}')
+
+    scan_times = []
+    for _ in range(3):
+        lat, lon = rng.choice(centres)
+        start = time.perf_counter()
+        expected = sorted(
+            (d, pid) for pid, plat, plon in points
+            if (d := haversine_km(lat, lon, plat, plon)) <= 50
+        )[:10]
+        scan_times.append(time.perf_counter() - start)
+        assert index.nearest(lat, lon, 50, 10) == expected
+    print(f'exhaustive scan radius=50 km: {sum(scan_times) / 3 * 1e3:.0f} ms/query'
+          ' (results match)')
+
+    victims = rng.sample(points, min(100000, len(points)))
+    start = time.perf_counter()
+    for point_id, _, _ in victims:
+        index.remove(point_id)
+    elapsed = time.perf_counter() - start
+    print(f'remove: {len(victims)} points in {elapsed:.2f}s'
+          f' ({len(victims) / elapsed:,.0f}/s)')
+
+
+if __name__ == '__main__':
+    main()
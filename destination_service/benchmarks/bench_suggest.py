@@ -0,0 +1,111 @@
+# benchmarks/bench_suggest.py
+"""
+Autocomplete latency of the suggest index, exact and with typos, against
+a scan of every record the way ``get_all()`` would serve it.
+
+Names are built from a word list plus a number so most are distinct;
+queries are prefixes of 2-12 characters of names in the index, and the
+fuzzy ones get one character swapped after the first.
+
+Usage (from the destination_service directory):
+    python -m benchmarks.bench_suggest --entries 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loadtest.stats import percentile  # noqa: E402
+from models.suggest_index import SuggestIndex, normalize  # noqa: E402
+
+WORDS = [
+    'grand', 'hotel', 'palace', 'inn', 'resort', 'lodge', 'villa', 'suites',
+    'harbour', 'garden', 'royal', 'city', 'beach', 'mountain', 'lake', 'river',
+    'tower', 'plaza', 'central', 'park', 'boutique', 'sunset', 'ocean', 'forest',
+]
+
+
+def generate(count, locations, seed):
+    rng = random.Random(seed)
+    places = [f'{rng.choice(WORDS).title()}{chr(97 + i % 26)}land {i}'
+              for i in range(locations)]
+    return [
+        {
+            'id': str(i),
+            'name': ' '.join(rng.choice(WORDS).title() for _ in range(3)) + f' {i}',
+            'location': rng.choice(places),
+        }
+        for i in range(count)
+    ]
+
+
+def typo(text, rng):
+    if len(text) < 3:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def measure(label, func, queries):
+    latencies, results = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        results += len(func(query))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f'{label:<26} p50 {percentile(latencies, 50) * 1e3:7.3f} ms'
+          f'  p99 {percentile(latencies, 99) * 1e3:7.3f} ms'
+          f'  avg results {results / len(queries):.1f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=1000000)
+    parser.add_argument('--locations', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    destinations = generate(args.entries, args.locations, args.seed)
+    rng = random.Random(args.seed + 1)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SuggestIndex()
+    for destination in destinations:
+        index.add(destination)
+    build = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'build: {len(index)} terms in {build:.1f}s, {memory / 2**20:.0f} MiB')
+
+    samples = rng.sample(destinations, args.queries)
+    queries = [d['name'][:rng.randint(2, 12)] for d in samples]
+    typos = [typo(query, rng) for query in queries]
+    measure('exact limit=10', lambda q: index.suggest(q, 10), queries)
+    measure('fuzzy=1 (typo) limit=10', lambda q: index.suggest(q, 10, 1), typos)
+    measure('fuzzy=2 (typo) limit=10', lambda q: index.suggest(q, 10, 2), typos)
+
+    def scan(query):
+        query = normalize(query)
+        return [d for d in destinations if normalize(d['name']).startswith(query)][:10]
+
+    measure('full scan (baseline)', scan, queries[:3])
+
+    victims = rng.sample(destinations, min(100000, len(destinations)))
+    start = time.perf_counter()
+    for destination in victims:
+        index.remove(destination)
+    elapsed = time.perf_counter() - start
+    print(f'remove: {len(victims)} destinations in {elapsed:.2f}s'
+          f' ({len(victims) / elapsed:,.0f}/s)')
+
+
+if __name__ == '__main__':
+    main()
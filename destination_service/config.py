@@ -0,0 +1,35 @@
+# config.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class Config:
+    SECRET_KEY = os.getenv('SECRET_KEY', 'your_secret_key')
+    DEBUG = False
+    # auto: orjson when installed, else the stdlib json module
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    # Responses below COMPRESS_MIN_SIZE bytes are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', '4'))
+    # Per-endpoint concurrency limits, endpoint=limit[:queue],... (see common.admission)
+    ADMISSION_LIMITS = os.getenv('ADMISSION_LIMITS', '')
+    # Longest queue wait normally, and once an endpoint's queue stops draining
+    ADMISSION_INTERVAL_MS = int(os.getenv('ADMISSION_INTERVAL_MS', '100'))
+    ADMISSION_TARGET_MS = int(os.getenv('ADMISSION_TARGET_MS', '5'))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+    # Open change streams per process; each holds a server thread
+    DESTINATION_MAX_STREAMS = int(os.getenv('DESTINATION_MAX_STREAMS', '8'))
+    # Snapshot and journal directory; unset keeps the catalogue in memory only
+    DESTINATION_DATA_DIR = os.getenv('DESTINATION_DATA_DIR')
+    # Journal entries after which a new snapshot is written
+    DESTINATION_COMPACT_EVERY = int(os.getenv('DESTINATION_COMPACT_EVERY', '100000'))
+    # fsync every journal append (survives power loss, not just crashes)
+    DESTINATION_JOURNAL_FSYNC = os.getenv('DESTINATION_JOURNAL_FSYNC', 'false').lower() == 'true'
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class ProductionConfig(Config):
+    DEBUG = False
@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py (from this directory)
+import os
+import sys
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.workers import post_fork, worker_count  # noqa: F401 (gunicorn hook)
+
+wsgi_app = "app:create_app('config.ProductionConfig')"
+# Comma-separated; e.g. BIND=0.0.0.0:5001,unix:/run/travel/destination.sock
+bind = os.getenv('BIND', '0.0.0.0:5001').split(',')
+
+# Each process holds its own copy of the catalogue, so writes made in one
+# worker would be invisible to the others (and a persisted catalogue has a
+# single writer: one process owns the journal). Scale with threads instead:
+# admin deletes spend most of their time waiting on the auth service.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+if os.getenv('DESTINATION_DATA_DIR'):
+    workers = 1
+threads = int(os.getenv('GUNICORN_THREADS', str(max(16, worker_count(per_cpu=4, extra=0)))))
+
+# Build the app once in the master and fork workers from it
+preload_app = True
+
+# Recycle workers gradually so no long-lived process accumulates state,
+# but only when the catalogue is persisted: a recycled worker re-forks the
+# master's boot-time catalogue and, without DESTINATION_DATA_DIR to reload
+# from, would silently undo every delete, reprice and availability change.
+max_requests = 0
+if os.getenv('DESTINATION_DATA_DIR'):
+    max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = 30
+keepalive = 5
@@ -0,0 +1,204 @@
+# models/availability.py
+"""
+Per-day availability of every destination as bitmaps.
+
+The calendar is a ``(days, words)`` uint64 matrix: row ``d`` is a bitset
+over destinations (one bit per slot) that is set where the destination
+is free that night. "Which destinations are free from A to B" is then
+the AND of rows A..B-1, i.e. ``days x destinations / 64`` word
+operations in one ``np.bitwise_and.reduce``, and booking or blocking a
+range for one destination updates one column of words. 100k
+destinations over two years take about 9 MB plus growth headroom.
+
+The window covers ``days`` nights starting today and slides forward as
+dates pass; new nights start out free for every destination. Slots of
+deleted destinations are cleared and reused. Sliding rewrites the
+bitmap, so an owner that reads without locking passes
+``auto_advance=False`` and calls ``advance`` while holding its write lock.
+"""
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+HORIZON_DAYS = 730
+
+_ONE = np.uint64(1)
+
+
+class AvailabilityCalendar:
+    def __init__(self, days: int = HORIZON_DAYS,
+                 today: Callable[[], date] = date.today, capacity: int = 1024,
+                 auto_advance: bool = True):
+        self.days = days
+        self._today = today
+        self.auto_advance = auto_advance
+        self.start = today()
+        words = max(1, -(-capacity // 64))
+        self.bits = np.zeros((days, words), dtype=np.uint64)
+        # Bits of allocated slots, the state of a newly opened night
+        self._live = np.zeros(words, dtype=np.uint64)
+        self.ids: List[Optional[str]] = []
+        self.slots: Dict[str, int] = {}
+        self._free: List[int] = []
+
+    @classmethod
+    def restore(cls, start: date, ids: List[Optional[str]], bits: np.ndarray,
+                today: Callable[[], date] = date.today,
+                auto_advance: bool = True) -> 'AvailabilityCalendar':
+        """Calendar from a saved ``start``, slot ``ids`` and bitmap"""
+        calendar = cls(bits.shape[0], today, capacity=64, auto_advance=auto_advance)
+        calendar.start = start
+        calendar.bits = bits
+        calendar.ids = list(ids)
+        calendar.slots = {
+            destination_id: slot for slot, destination_id in enumerate(ids)
+            if destination_id is not None
+        }
+        calendar._free = [slot for slot, destination_id in enumerate(ids)
+                          if destination_id is None]
+        live = np.zeros(64 * bits.shape[1], dtype=np.uint8)
+        live[list(calendar.slots.values())] = 1
+        calendar._live = np.packbits(live, bitorder='little').view('<u8').astype(np.uint64)
+        calendar.advance()
+        return calendar
+
+    def export(self) -> Tuple[date, List[Optional[str]], np.ndarray]:
+        """Copy of (start, slot ids, bitmap) for ``restore``"""
+        return self.start, list(self.ids), self.bits.copy()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, destination_id) -> bool:
+        return destination_id in self.slots
+
+    @property
+    def end(self) -> date:
+        """First date after the window"""
+        return self.start + timedelta(days=self.days)
+
+    def behind(self) -> bool:
+        """True if the window no longer starts today"""
+        return self._today() > self.start
+
+    def advance(self) -> None:
+        """Slide the window so it starts today"""
+        shift = (self._today() - self.start).days
+        if shift <= 0:
+            return
+        if shift < self.days:
+            self.bits[:-shift] = self.bits[shift:]
+            self.bits[-shift:] = self._live
+        else:
+            self.bits[:] = self._live
+        self.start += timedelta(days=shift)
+
+    def _range(self, start: date, end: date) -> Tuple[int, int]:
+        """
+        Row range of the nights from ``start`` up to ``end`` (exclusive).
+
+        Raises:
+            ValueError: If the range is empty or outside the window
+        """
+        if self.auto_advance:
+            self.advance()
+        if end <= start:
+            raise ValueError('to must be after from')
+        if start < self.start or end > self.end:
+            raise ValueError(
+                f'Dates must be between {self.start.isoformat()} and {self.end.isoformat()}'
+            )
+        return (start - self.start).days, (end - self.start).days
+
+    @staticmethod
+    def _bit(slot: int) -> Tuple[int, np.uint64]:
+        return slot >> 6, _ONE << np.uint64(slot & 63)
+
+    def add(self, destination_id: str) -> None:
+        """Track a destination, free on every night; no-op if tracked"""
+        if destination_id in self.slots:
+            return
+        if self._free:
+            slot = self._free.pop()
+            self.ids[slot] = destination_id
+        else:
+            slot = len(self.ids)
+            if slot >= 64 * self.bits.shape[1]:
+                self._grow()
+            self.ids.append(destination_id)
+        self.slots[destination_id] = slot
+        word, bit = self._bit(slot)
+        self._live[word] |= bit
+        self.bits[:, word] |= bit
+
+    def _grow(self) -> None:
+        days, words = self.bits.shape
+        bits = np.zeros((days, 2 * words), dtype=np.uint64)
+        bits[:, :words] = self.bits
+        live = np.zeros(2 * words, dtype=np.uint64)
+        live[:words] = self._live
+        self.bits, self._live = bits, live
+
+    def remove(self, destination_id: str) -> bool:
+        slot = self.slots.pop(destination_id, None)
+        if slot is None:
+            return False
+        word, bit = self._bit(slot)
+        self._live[word] &= ~bit
+        self.bits[:, word] &= ~bit
+        self.ids[slot] = None
+        self._free.append(slot)
+        return True
+
+    def remove_many(self, destination_ids: List[str]) -> None:
+        """``remove`` for many destinations, clearing their columns in one pass"""
+        slots = [self.slots.pop(destination_id) for destination_id in destination_ids
+                 if destination_id in self.slots]
+        if not slots:
+            return
+        slots = np.array(slots, dtype=np.uint64)
+        words = (slots >> np.uint64(6)).astype(np.intp)
+        clear = np.zeros_like(self._live)
+        np.bitwise_or.at(clear, words, _ONE << (slots & np.uint64(63)))
+        touched = np.unique(words)
+        self._live[touched] &= ~clear[touched]
+        self.bits[:, touched] &= ~clear[touched]
+        for slot in slots.tolist():
+            self.ids[slot] = None
+        self._free.extend(slots.tolist())
+
+    def set_available(self, destination_id: str, start: date, end: date,
+                      available: bool) -> None:
+        """
+        Mark the nights from ``start`` to ``end`` (exclusive) free or taken.
+
+        Raises:
+            KeyError: If the destination is not tracked
+            ValueError: If the range is invalid
+        """
+        first, last = self._range(start, end)
+        word, bit = self._bit(self.slots[destination_id])
+        if available:
+            self.bits[first:last, word] |= bit
+        else:
+            self.bits[first:last, word] &= ~bit
+
+    def is_available(self, destination_id: str, start: date, end: date) -> bool:
+        first, last = self._range(start, end)
+        word, bit = self._bit(self.slots[destination_id])
+        return bool(np.all(self.bits[first:last, word] & bit))
+
+    def free_bitmap(self, start: date, end: date) -> np.ndarray:
+        """Bitset (uint64 words) of the slots free on every night of the range"""
+        first, last = self._range(start, end)
+        return np.bitwise_and.reduce(self.bits[first:last], axis=0)
+
+    def available(self, start: date, end: date) -> List[str]:
+        """Ids of the destinations free on every night of the range"""
+        free = self.free_bitmap(start, end)
+        slots = np.flatnonzero(np.unpackbits(
+            free.astype('<u8', copy=False).view(np.uint8), bitorder='little'
+        ))
+        ids = self.ids
+        return [ids[slot] for slot in slots.tolist()]
@@ -0,0 +1,321 @@
+# models/catalogue_store.py
+"""
+Snapshot-plus-journal persistence of the destination catalogue.
+
+Every change is appended to a journal as one JSON line before the write
+returns; a background thread compacts the journal into a new snapshot
+once it holds ``compact_every`` entries. Files in ``directory``::
+
+    CURRENT                          generation of the newest complete snapshot
+    snapshot-<g>.json                records (prices stripped) in catalogue order,
+                                     autocomplete terms, availability slot ids
+    snapshot-<g>.prices.npy          their prices, float64
+    snapshot-<g>.availability.npy    the availability bitmap
+    journal-<g>.log                  changes made after snapshot <g> was taken
+
+Compaction captures the catalogue and switches to a new journal while
+holding the repository's write lock, then writes the snapshot outside
+it, so writes only wait for the in-memory copy. The snapshot becomes
+current by atomically replacing ``CURRENT``; older files are deleted
+afterwards. A crash at any point leaves either the old snapshot and all
+journals since, or the new snapshot, so recovery replays every journal
+from the current generation on. A torn last line of the newest journal
+(a crash mid-append) is dropped; a bad entry anywhere else is corruption
+and fails recovery with ``ValueError``.
+
+Recovery memory-maps the snapshot: the JSON document is parsed straight
+from the mapping and the arrays are loaded with ``np.load(mmap_mode=...)``
+instead of being read into Python objects one by one, and the sorted
+autocomplete terms are stored so restoring them normalizes no text.
+"""
+import glob
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from common import json_provider, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+PERSIST_SECONDS = metrics.histogram(
+    'repository_persist_duration_seconds',
+    'Time spent writing a repository to durable storage',
+    ['repository']
+)
+
+_GENERATION = re.compile(r'(?:journal|snapshot)-(\d+)\.')
+
+
+@dataclass
+class CatalogueSnapshot:
+    records: List[Dict]
+    prices: np.ndarray
+    calendar_start: date
+    calendar_ids: List[Optional[str]]
+    calendar_bits: np.ndarray
+    # SuggestIndex.export(): keys in order, display texts, counts
+    suggest_terms: Tuple[List[str], List[str], List[int]]
+
+
+class CatalogueStore:
+    def __init__(self, directory: str, compact_every: int = 100000,
+                 fsync: bool = False, backend=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.json = backend or json_provider.get_backend()
+        self._capture: Optional[Callable[[], CatalogueSnapshot]] = None
+        self._state_lock = None
+        self._thread: Optional[threading.Thread] = None
+        self._journal = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Re-read the generations from disk and forget any open journal,
+        e.g. in a forked worker whose parent's view may be stale: another
+        worker may have appended and compacted since.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            # Same process: stop compacting the state being replaced
+            self.close()
+        self.snapshot_generation = self._read_current()
+        self.journal_generation = max(
+            self._generations('journal-*.log') + [self.snapshot_generation, 1]
+        )
+        self.entries = 0
+        # Locks and the journal file may have been inherited mid-use
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = None
+        self._journal_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _generations(self, pattern: str) -> List[int]:
+        return sorted(
+            int(_GENERATION.search(os.path.basename(path)).group(1))
+            for path in glob.glob(self._path(pattern))
+        )
+
+    def _read_current(self) -> int:
+        try:
+            with open(self._path('CURRENT')) as current:
+                return int(current.read().strip())
+        except FileNotFoundError:
+            return 0
+
+    def is_empty(self) -> bool:
+        """True if nothing was ever stored here (no snapshot, no journal entries)"""
+        return not self.snapshot_generation and not any(
+            os.path.getsize(path) for path in glob.glob(self._path('journal-*.log'))
+        )
+
+    # Recovery
+
+    def load(self) -> Tuple[Optional[CatalogueSnapshot], Iterator[Dict]]:
+        """The current snapshot (None if there is none) and the journal entries after it"""
+        snapshot = None
+        if self.snapshot_generation:
+            snapshot = self._load_snapshot(self.snapshot_generation)
+        return snapshot, self._replay()
+
+    def _load_snapshot(self, generation: int) -> CatalogueSnapshot:
+        base = self._path(f'snapshot-{generation}')
+        with tracing.span('catalogue_store.load_snapshot', generation=generation):
+            with open(f'{base}.json', 'rb') as snapshot_file, \
+                    mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if self.json.name == 'orjson':
+                    with memoryview(mapped) as view:
+                        data = self.json.loads(view)
+                else:
+                    data = self.json.loads(mapped[:])
+            calendar, terms = data['availability'], data['suggest']
+            return CatalogueSnapshot(
+                records=data['records'],
+                prices=np.load(f'{base}.prices.npy', mmap_mode='r'),
+                calendar_start=date.fromisoformat(calendar['start']),
+                calendar_ids=calendar['ids'],
+                # Copy-on-write: pages are read lazily and never written back
+                calendar_bits=np.load(f'{base}.availability.npy', mmap_mode='c'),
+                suggest_terms=(terms['keys'], terms['texts'], terms['counts']),
+            )
+
+    def _replay(self) -> Iterator[Dict]:
+        generations = [
+            generation for generation in self._generations('journal-*.log')
+            if generation >= self.snapshot_generation
+        ]
+        for generation in generations:
+            path = self._path(f'journal-{generation}.log')
+            newest = generation == generations[-1]
+            with open(path, 'rb') as journal:
+                offset = 0
+                for line in journal:
+                    try:
+                        entry = self.json.loads(line)
+                    except ValueError:
+                        # Only the end of the newest journal can be a write
+                        # torn by a crash; replaying later entries over a
+                        # gap anywhere else would build a catalogue that
+                        # never existed.
+                        if not newest or line.endswith(b'\n'):
+                            raise ValueError(
+                                f'Corrupt journal entry in {path} at byte {offset}'
+                            )
+                        logger.warning('Truncating %s at byte %d', path, offset)
+                        journal.close()
+                        os.truncate(path, offset)
+                        break
+                    offset += len(line)
+                    self.entries += 1
+                    yield entry
+
+    # Journal
+
+    def append(self, entry: Dict) -> None:
+        """Durably record one change (flushed; fsynced if configured)"""
+        line = self.json.dumps(entry) + b'\n'
+        if self._thread is None or not self._thread.is_alive():
+            # First write in this process (e.g. a freshly forked worker)
+            self.start()
+        with self._journal_lock:
+            if self._journal is None:
+                self._journal = open(
+                    self._path(f'journal-{self.journal_generation}.log'), 'ab'
+                )
+            self._journal.write(line)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self.entries += 1
+            due = self.entries >= self.compact_every
+        if due:
+            self._wake.set()
+
+    def _rotate(self) -> int:
+        """Start a new journal; returns its generation"""
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self.journal_generation += 1
+            self.entries = 0
+            return self.journal_generation
+
+    # Compaction
+
+    def attach(self, capture: Callable[[], CatalogueSnapshot], lock) -> None:
+        """
+        Set the source of snapshots: ``capture`` is called with ``lock``
+        (the repository's write lock) held and must not be slow.
+        """
+        self._capture = capture
+        self._state_lock = lock
+
+    def start(self) -> None:
+        """Start the compaction thread (again, e.g. in a forked worker)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._journal_lock:
+            # Reopen rather than share a file object inherited across fork
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name='catalogue-compaction', daemon=True
+        )
+        self._thread.start()
+        if self.entries >= self.compact_every:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # A compaction that is due still runs when closing
+            if self.entries >= self.compact_every:
+                try:
+                    self.compact()
+                except Exception:
+                    logger.exception('Catalogue compaction failed')
+            if self._stopped:
+                return
+
+    def compact(self) -> int:
+        """Write a snapshot of the catalogue and drop older files; returns its generation"""
+        with self._compact_lock:
+            with self._state_lock:
+                snapshot = self._capture()
+                generation = self._rotate()
+            with tracing.span('catalogue_store.compact', generation=generation), \
+                    PERSIST_SECONDS.time(repository='destinations'):
+                self._write_snapshot(generation, snapshot)
+            self._remove_before(generation)
+            return generation
+
+    def _write_atomic(self, path: str, write: Callable) -> None:
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as output:
+            write(output)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temporary, path)
+
+    def _write_snapshot(self, generation: int, snapshot: CatalogueSnapshot) -> None:
+        base = self._path(f'snapshot-{generation}')
+        self._write_atomic(f'{base}.prices.npy',
+                           lambda output: np.save(output, snapshot.prices))
+        self._write_atomic(f'{base}.availability.npy',
+                           lambda output: np.save(output, snapshot.calendar_bits))
+        document = self.json.dumps({
+            'generation': generation,
+            'created': time.time(),
+            'records': snapshot.records,
+            'availability': {
+                'start': snapshot.calendar_start.isoformat(),
+                'ids': snapshot.calendar_ids,
+            },
+            'suggest': dict(zip(('keys', 'texts', 'counts'), snapshot.suggest_terms)),
+        })
+        self._write_atomic(f'{base}.json', lambda output: output.write(document))
+        self._write_atomic(self._path('CURRENT'),
+                           lambda output: output.write(str(generation).encode()))
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self.snapshot_generation = generation
+
+    def _remove_before(self, generation: int) -> None:
+        for pattern in ('journal-*.log', 'snapshot-*'):
+            for path in glob.glob(self._path(pattern)):
+                match = _GENERATION.search(os.path.basename(path))
+                if match and int(match.group(1)) < generation:
+                    os.remove(path)
+
+    def close(self) -> None:
+        """Stop the compaction thread and close the journal"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
@@ -0,0 +1,76 @@
+# models/change_log.py
+"""
+Bounded, sequence-numbered log of catalogue changes for delta sync.
+
+Every upsert or delete gets the next sequence number and is kept in a
+ring buffer of the last ``capacity`` changes. A client that has synced
+up to sequence ``s`` asks for the changes after it; if some of those
+have already been dropped (or the log was reset, e.g. by a bulk
+reprice), it has to re-download the full listing instead.
+
+Sequence numbers start from the wall clock in microseconds, so they
+keep increasing across restarts: a cursor from an earlier process is
+always older than the new log and gets a resync rather than silently
+skipping changes. Readers can block in ``wait`` until something newer
+than their cursor is recorded, which is what the event stream uses.
+"""
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional
+
+DEFAULT_CAPACITY = 10000
+
+
+class ChangeLog:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, clock=time.time):
+        self.capacity = capacity
+        self._clock = clock
+        self._changes = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self.latest = int(clock() * 1e6)
+        # Changes after this sequence are all still in the log
+        self._floor = self.latest
+
+    def record(self, op: str, destination_id: str,
+               destination: Optional[Dict] = None) -> int:
+        """Append an ``upsert`` (with the new record) or ``delete``; returns its sequence"""
+        with self._condition:
+            self.latest += 1
+            change = {'seq': self.latest, 'op': op, 'id': destination_id}
+            if destination is not None:
+                change['destination'] = destination
+            if len(self._changes) == self.capacity:
+                self._floor = self._changes[0]['seq']
+            self._changes.append(change)
+            self._condition.notify_all()
+            return self.latest
+
+    def reset(self) -> int:
+        """Drop every change, forcing all existing cursors to resync"""
+        with self._condition:
+            self.latest = max(self.latest + 1, int(self._clock() * 1e6))
+            self._floor = self.latest
+            self._changes.clear()
+            self._condition.notify_all()
+            return self.latest
+
+    def since(self, sequence: int,
+              limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Up to ``limit`` changes after ``sequence``, oldest first; None if
+        some of them were dropped (or ``sequence`` is not from this log).
+        """
+        with self._condition:
+            if sequence < self._floor or sequence > self.latest:
+                return None
+            # Sequences in the log are consecutive, ending at ``latest``
+            skip = len(self._changes) - (self.latest - sequence)
+            end = None if limit is None else skip + limit
+            return list(islice(self._changes, skip, end))
+
+    def wait(self, sequence: int, timeout: float) -> bool:
+        """Block until a change after ``sequence`` is recorded; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.latest > sequence, timeout)
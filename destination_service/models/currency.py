@@ -0,0 +1,91 @@
+# models/currency.py
+"""
+Exchange rates for showing prices in the user's currency.
+
+Rates are read from a local JSON file (``CURRENCY_RATES_FILE``, by
+default ``currency_rates.json`` next to the service) of the form::
+
+    {"base": "USD", "as_of": "2026-10-01", "rates": {"EUR": 0.86, ...}}
+
+where each rate is the amount of that currency one unit of ``base``
+buys. Stored prices are in ``base``. The table is cached in memory and
+the file's mtime is checked at most every ``check_interval`` seconds, so
+updating the file takes effect without a restart and without touching
+the disk on every request.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+CURRENCY_RATES_FILE = os.getenv(
+    'CURRENCY_RATES_FILE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'currency_rates.json')
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateTable:
+    def __init__(self, path: Optional[str] = None, check_interval: float = 60.0):
+        self.path = path or CURRENCY_RATES_FILE
+        self.check_interval = check_interval
+        self.base = 'USD'
+        self.as_of: Optional[str] = None
+        self._rates: Dict[str, float] = {'USD': 1.0}
+        self._mtime: Optional[float] = None
+        self._checked = float('-inf')
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked < self.check_interval:
+                return
+            self._checked = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if mtime == self._mtime:
+                    return
+                with open(self.path, encoding='utf-8') as rates_file:
+                    data = json.load(rates_file)
+                base = data.get('base', 'USD').upper()
+                rates = {code.upper(): float(rate)
+                         for code, rate in data.get('rates', {}).items()}
+                invalid = sorted(code for code, rate in rates.items()
+                                 if not math.isfinite(rate) or rate <= 0)
+                if invalid:
+                    raise ValueError(f'rates must be positive numbers: {", ".join(invalid)}')
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                logger.warning('Could not load currency rates from %s: %s', self.path, e)
+                return
+            rates[base] = 1.0
+            self.base, self.as_of, self._rates = base, data.get('as_of'), rates
+            self._mtime = mtime
+
+    @property
+    def currencies(self):
+        self._refresh()
+        return sorted(self._rates)
+
+    def rate(self, currency: str) -> float:
+        """
+        Units of ``currency`` per unit of the base currency.
+
+        Raises:
+            ValueError: If the currency is not in the table
+        """
+        self._refresh()
+        rate = self._rates.get(currency.upper())
+        if rate is None:
+            raise ValueError(
+                f'Unknown currency: {currency}. '
+                f'Available currencies: {", ".join(sorted(self._rates))}'
+            )
+        return rate
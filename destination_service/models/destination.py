@@ -1,16 +1,23 @@
 class Destination:
-    def __init__(self, id, name, description, location, price_per_night):
+    def __init__(self, id, name, description, location, price_per_night,
+                 latitude=None, longitude=None):
         self.id = id
         self.name = name
         self.description = description
         self.location = location
         self.price_per_night = price_per_night
+        self.latitude = latitude
+        self.longitude = longitude
 
     def to_dict(self):
-        return {
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'location': self.location,
             'price_per_night': self.price_per_night
-        }
\ No newline at end of file
+        }
+        if self.latitude is not None:
+            data['latitude'] = self.latitude
+            data['longitude'] = self.longitude
+        return data
@@ -1,26 +1,544 @@
 # models/destination_repository.py
+"""
+The destination catalogue and its indexes.
+
+Writes are serialized by one lock; reads take no lock. They run
+optimistically, seqlock style: every write makes ``_version`` odd while
+it mutates and even again when done, and a read that saw the version
+change (or an odd version) under it is discarded and retried. A read
+only falls back to the lock when writes keep overlapping it, so
+concurrent readers neither block each other nor wait for writers.
+Copy-on-write would be the alternative, but copying a million-entry
+catalogue on every write is not.
+"""
+import gc
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+import numpy as np
+
+from common import tracing
+from models.availability import AvailabilityCalendar
+from models.catalogue_store import CatalogueSnapshot
+from models.change_log import ChangeLog
+from models.currency import RateTable
+from models.price_column import PriceColumn
+from models.price_index import LocationPriceIndex
+from models.price_stats import PriceAggregates
+from models.spatial_index import GeoGridIndex, validate_coordinates
+from models.suggest_index import SuggestIndex
+
+PRICE = 'price_per_night'
+SORT_ORDERS = ('price', '-price')
+# Lock-free attempts before a read waits for the write lock
+OPTIMISTIC_READS = 3
+
 
 class DestinationRepository:
-    def __init__(self):
-        self.destinations = {
-            '1': {
+    FIELDS = (
+        'id', 'name', 'description', 'location', 'price_per_night',
+        'latitude', 'longitude'
+    )
+
+    def __init__(self, rates=None, store=None, changes=None):
+        """
+        Args:
+            rates: Currency ``RateTable``; the default file if None
+            store: ``CatalogueStore`` to recover from and journal every
+                change to; the catalogue is in memory only if None
+            changes: ``ChangeLog`` recording upserts and deletes for
+                delta sync; a default-sized one if None
+        """
+        self.rates = rates or RateTable()
+        self.changes = changes or ChangeLog()
+        # Serializes writes, and snapshot captures against them
+        self._lock = threading.RLock()
+        # Odd while a write is in progress (see ``_read``)
+        self._version = 0
+        self._write_depth = 0
+        self.store = None
+        self._reset()
+        if store is not None:
+            self._recover(store)
+            store.attach(self._capture, self._lock)
+        self.store = store
+        if store is None or store.is_empty():
+            self._seed()
+
+    def reload(self):
+        """
+        Recover the catalogue from the store afresh, e.g. in a freshly
+        forked worker: the state inherited from the master dates from boot
+        and would otherwise be journaled on top of, and compacted over,
+        whatever earlier workers wrote since.
+        """
+        store = self.store
+        if store is None:
+            return
+        # A forked worker may inherit the lock, and a write, mid-way
+        self._lock = threading.RLock()
+        self._write_depth = 0
+        self._version += self._version & 1
+        with self._writing():
+            self.store = None
+            store.refresh()
+            self._reset()
+            self._recover(store)
+            store.attach(self._capture, self._lock)
+            self.store = store
+            # Cursors handed out before no longer match this history
+            self.changes.reset()
+        store.start()
+
+    def _reset(self):
+        # Records are kept without their price, which lives in ``prices``
+        self.destinations = {}
+        self.prices = PriceColumn()
+        self.spatial_index = GeoGridIndex()
+        self.price_stats = PriceAggregates()
+        self.price_index = LocationPriceIndex()
+        self.suggest_index = SuggestIndex()
+        # Slid forward under the write lock, never by a reader
+        self.availability = AvailabilityCalendar(auto_advance=False)
+
+    def _seed(self):
+        seeds = [
+            {
                 'id': '1',
                 'name': 'Maldives Resort',
                 'description': 'Luxurious tropical paradise',
                 'location': 'Maldives',
                 'price_per_night': 500.00
             },
-            '2': {
+            {
                 'id': '2',
                 'name': 'Tokyo City Hotel',
                 'description': 'Modern urban experience',
                 'location': 'Japan',
                 'price_per_night': 250.00
             }
-        }
+        ]
+        for destination in seeds:
+            self.add(destination)
+
+    def _recover(self, store):
+        """Load the store's snapshot and replay the journal after it"""
+        # Millions of new objects would otherwise trigger repeated full
+        # collections that rescan everything loaded so far
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            with tracing.span('destination_repository.recover'):
+                snapshot, entries = store.load()
+                if snapshot is not None:
+                    self._restore(snapshot)
+                for entry in entries:
+                    self._apply(entry)
+        finally:
+            if collecting:
+                gc.enable()
+        # The catalogue is long-lived: keep later collections from scanning it
+        gc.freeze()
+
+    def _restore(self, snapshot):
+        """Rebuild every structure from a snapshot in bulk"""
+        records = snapshot.records
+        ids = [record['id'] for record in records]
+        self.destinations = dict(zip(ids, records))
+        self.prices = PriceColumn.from_arrays(
+            ids, snapshot.prices, [record.get('location') for record in records]
+        )
+        self._rebuild_price_indexes()
+        self.suggest_index = SuggestIndex.restore(*snapshot.suggest_terms)
+        located = [record for record in records if record.get('latitude') is not None]
+        self.spatial_index.add_many(
+            [record['id'] for record in located],
+            [record['latitude'] for record in located],
+            [record['longitude'] for record in located]
+        )
+        self.availability = AvailabilityCalendar.restore(
+            snapshot.calendar_start, snapshot.calendar_ids, snapshot.calendar_bits,
+            auto_advance=False
+        )
+
+    def _apply(self, entry):
+        """Redo one journaled change"""
+        op = entry['op']
+        if op == 'put':
+            self.add(entry['destination'])
+        elif op == 'delete':
+            self.delete(entry['id'])
+        elif op == 'delete_many':
+            self.delete_many(entry['ids'])
+        elif op == 'reprice':
+            self.reprice(entry['percent'], entry.get('location'))
+        elif op == 'availability':
+            # Nights that have since left the window are dropped
+            start = max(date.fromisoformat(entry['from']), self.availability.start)
+            end = min(date.fromisoformat(entry['to']), self.availability.end)
+            if start < end:
+                self.set_available(entry['id'], start, end, entry['available'])
+        else:
+            raise ValueError(f'Unknown journal entry: {op}')
+
+    @contextmanager
+    def _writing(self):
+        """Hold the write lock and keep ``_version`` odd while mutating"""
+        with self._lock:
+            if not self._write_depth:
+                self._version += 1
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._version += 1
+
+    def _read(self, read):
+        """
+        Result of ``read()``, run without the lock and retried if a write
+        overlapped it. An exception raised while nothing changed is the
+        read's own and propagates; one raised mid-write is retried.
+        """
+        for _ in range(OPTIMISTIC_READS):
+            version = self._version
+            if version & 1:
+                time.sleep(0)  # Let the writer finish
+                continue
+            try:
+                result = read()
+            except Exception:
+                if self._version == version:
+                    raise
+                continue
+            if self._version == version:
+                return result
+        with self._lock:
+            return read()
+
+    def _journal(self, entry):
+        if self.store is not None:
+            self.store.append(entry)
+
+    def _capture(self):
+        """Consistent copy of the catalogue for a snapshot; called under ``_lock``"""
+        slots = self.prices.live_slots()
+        ids = self.prices.ids
+        # Records are replaced, never mutated, so sharing them is safe
+        records = [self.destinations[ids[slot]] for slot in slots.tolist()]
+        start, calendar_ids, bits = self.availability.export()
+        return CatalogueSnapshot(
+            records=records,
+            prices=self.prices.prices_at(slots),
+            calendar_start=start,
+            calendar_ids=calendar_ids,
+            calendar_bits=bits,
+            suggest_terms=self.suggest_index.export(),
+        )
+
+    # Both hooks run while the destination is in the price column
+    def _index(self, destination):
+        self.price_stats.add(destination)
+        self.price_index.add(*self._price_key(destination))
+        self.suggest_index.add(destination)
+        if destination.get('latitude') is not None:
+            self.spatial_index.add(
+                destination['id'], destination['latitude'], destination['longitude']
+            )
+
+    def _unindex(self, destination):
+        self.price_stats.remove(destination)
+        self.price_index.remove(*self._price_key(destination))
+        self.suggest_index.remove(destination)
+        self.spatial_index.remove(destination['id'])
+
+    def _price_key(self, destination):
+        destination_id = destination['id']
+        return (destination.get('location'), self.prices.price(destination_id),
+                self.prices.sequence_of(destination_id), destination_id)
+
+    def add(self, destination):
+        """
+        Insert or replace a destination.
+
+        Latitude and longitude are optional but must be given together.
+
+        Raises:
+            ValueError: If the id or price is missing or a value is invalid
+        """
+        if not destination.get('id'):
+            raise ValueError('Destination id is required')
+        price = destination.get(PRICE)
+        if isinstance(price, bool) or not isinstance(price, (int, float)) or price < 0:
+            raise ValueError(f'{PRICE} must be a non-negative number')
+        latitude = destination.get('latitude')
+        longitude = destination.get('longitude')
+        if (latitude is None) != (longitude is None):
+            raise ValueError('Latitude and longitude must be given together')
+        if latitude is not None:
+            validate_coordinates(latitude, longitude)
+        with self._writing(), tracing.span('destination_repository.add', id=destination['id']):
+            previous = self.destinations.get(destination['id'])
+            if previous is not None:
+                self._unindex({**previous, PRICE: self.prices.price(destination['id'])})
+            self.destinations[destination['id']] = {
+                key: value for key, value in destination.items() if key != PRICE
+            }
+            self.prices.put(destination['id'], price, destination.get('location'))
+            self._index(destination)
+            # Bookings are kept when a destination is updated
+            self.availability.add(destination['id'])
+            self._journal({'op': 'put', 'destination': destination})
+            self.changes.record('upsert', destination['id'], {
+                **self.destinations[destination['id']], PRICE: price
+            })
+            return destination
+
+    def _records(self, slots, fields=None, currency=None):
+        """
+        Records of the price column ``slots`` with their prices, converted
+        to ``currency`` in one vectorized step when it is given.
 
-    def get_all(self):
-        return list(self.destinations.values())
+        Raises:
+            ValueError: If the currency is unknown
+        """
+        rate = self.rates.rate(currency) if currency is not None else None
+        prices = self.prices.prices_at(slots, rate).tolist()
+        ids = self.prices.ids
+        records = []
+        for slot, price in zip(slots.tolist(), prices):
+            destination = self.destinations[ids[slot]]
+            if fields is None:
+                record = {**destination, PRICE: price}
+            else:
+                record = _project(destination, fields)
+                if PRICE in fields:
+                    record[PRICE] = price
+            if currency is not None and PRICE in record:
+                record['currency'] = currency.upper()
+            records.append(record)
+        return records
+
+    def get_all(self, fields=None, currency=None, location=None, sort=None,
+                limit=None):
+        """
+        All destinations (or those in ``location``), limited to ``fields``
+        and priced in ``currency`` when given.
+
+        ``sort`` is ``price`` or ``-price``; ties keep catalogue order. The
+        cheapest ``limit`` of a location are read from its ordered index
+        in O(K log n); across locations they are selected with a
+        partial sort of the price column.
+
+        Raises:
+            ValueError: If the sort order or currency is unknown
+        """
+        if sort is not None and sort not in SORT_ORDERS:
+            raise ValueError(f'sort must be one of: {", ".join(SORT_ORDERS)}')
+        descending = sort == '-price'
+
+        def read():
+            if sort is not None and location is not None:
+                slots = np.array([
+                    self.prices.slots[destination_id] for destination_id
+                    in self.price_index.ordered(location, limit, descending)
+                ], dtype=np.intp)
+            else:
+                slots = self.prices.live_slots(location)
+                if sort is not None:
+                    slots = self.prices.sorted_slots(slots, limit, descending)
+                elif limit is not None:
+                    slots = slots[:limit]
+            return self._records(slots, fields, currency)
+
+        with tracing.span('destination_repository.get_all', sort=sort or 'none'):
+            return self._read(read)
 
     def delete(self, destination_id):
-        return self.destinations.pop(destination_id, None)
+        with self._writing(), tracing.span('destination_repository.delete', id=destination_id):
+            destination = self.destinations.pop(destination_id, None)
+            if destination is not None:
+                destination = {**destination, PRICE: self.prices.price(destination_id)}
+                self._unindex(destination)
+                self.prices.pop(destination_id)
+                self.availability.remove(destination_id)
+                self._journal({'op': 'delete', 'id': destination_id})
+                self.changes.record('delete', destination_id)
+            return destination
+
+    def get_many(self, destination_ids, fields=None, currency=None):
+        """
+        Records of ``destination_ids`` in request order, None for each id
+        that does not exist.
+
+        Raises:
+            ValueError: If the currency is unknown
+        """
+        def read():
+            slots = self.prices.slots
+            found = [destination_id for destination_id in destination_ids
+                     if destination_id in slots]
+            records = dict(zip(found, self._records(
+                np.array([slots[destination_id] for destination_id in found], dtype=np.intp),
+                fields, currency
+            )))
+            return [records.get(destination_id) for destination_id in destination_ids]
+
+        return self._read(read)
+
+    def delete_many(self, destination_ids):
+        """
+        Delete several destinations as one change: under a single lock
+        acquisition, with one journal entry and one pass over the
+        availability bitmap. Returns whether each id was deleted.
+        """
+        with self._writing(), tracing.span('destination_repository.delete_many',
+                                      count=len(destination_ids)):
+            deleted = []
+            for destination_id in destination_ids:
+                destination = self.destinations.pop(destination_id, None)
+                if destination is None:
+                    deleted.append(False)
+                    continue
+                self._unindex({**destination, PRICE: self.prices.price(destination_id)})
+                self.prices.pop(destination_id)
+                deleted.append(True)
+            removed = [destination_id for destination_id, was_deleted
+                       in zip(destination_ids, deleted) if was_deleted]
+            if removed:
+                self.availability.remove_many(removed)
+                self._journal({'op': 'delete_many', 'ids': removed})
+                for destination_id in removed:
+                    self.changes.record('delete', destination_id)
+            return deleted
+
+    def reprice(self, percent, location=None):
+        """
+        Adjust every price (or those in ``location``) by ``percent`` as one
+        array operation over the price column, then rebuild the price stats
+        and the ordered price index of the affected locations. Up to the
+        change log's capacity, each repriced destination is recorded as an
+        upsert; a larger reprice resets the log instead.
+
+        Returns:
+            int: The number of destinations repriced
+
+        Raises:
+            ValueError: If the adjustment would make prices zero or negative
+        """
+        factor = 1 + percent / 100
+        if factor <= 0:
+            raise ValueError('percent must be greater than -100')
+        with self._writing(), tracing.span('destination_repository.reprice', percent=percent):
+            updated = self.prices.scale(factor, location)
+            if updated:
+                self._rebuild_price_indexes(location)
+                self._journal({'op': 'reprice', 'percent': percent, 'location': location})
+                if updated <= self.changes.capacity:
+                    slots = self.prices.live_slots(location)
+                    for record in self._records(slots):
+                        self.changes.record('upsert', record['id'], record)
+                else:
+                    self.changes.reset()
+            return updated
+
+    def _rebuild_price_indexes(self, location=None):
+        """Rebuild the price stats and the ordered index of ``location`` (all if None)"""
+        groups = list(self.prices.groups())
+        self.price_stats = PriceAggregates.from_prices(
+            self.prices.prices_at(self.prices.live_slots()),
+            ((group, prices) for group, prices, _ in groups)
+        )
+        ids = self.prices.ids
+        for group, prices, slots in groups:
+            if location is None or group == location:
+                self.price_index.replace(group, zip(
+                    prices.tolist(), self.prices.sequence[slots].tolist(),
+                    [ids[slot] for slot in slots.tolist()]
+                ))
+
+    def stats(self, location=None):
+        """
+        Price aggregates for the catalogue and every location, or for one
+        location (None if it has no destinations). Never scans records.
+        """
+        if location is not None:
+            return self._read(lambda: self.price_stats.location(location))
+        return self._read(lambda: self.price_stats.to_dict())
+
+    def available(self, start, end, fields=None, currency=None):
+        """
+        Destinations free on every night from ``start`` up to ``end``
+        (the check-out date), in catalogue order.
+
+        Raises:
+            ValueError: If the dates are invalid or the currency unknown
+        """
+        def read():
+            ids = self.availability.available(start, end)
+            slots = np.sort(np.fromiter(
+                (self.prices.slots[destination_id] for destination_id in ids),
+                dtype=np.intp, count=len(ids)
+            ))
+            return self._records(slots, fields, currency)
+
+        with tracing.span('destination_repository.available'):
+            if self.availability.behind():
+                with self._writing():
+                    self.availability.advance()
+            return self._read(read)
+
+    def set_available(self, destination_id, start, end, available):
+        """
+        Open or close the nights from ``start`` up to ``end`` for one
+        destination. Returns False if the destination does not exist.
+
+        Raises:
+            ValueError: If the dates are invalid
+        """
+        with self._writing():
+            if destination_id not in self.destinations:
+                return False
+            self.availability.advance()
+            self.availability.set_available(destination_id, start, end, available)
+            self._journal({
+                'op': 'availability', 'id': destination_id, 'from': start.isoformat(),
+                'to': end.isoformat(), 'available': available
+            })
+            return True
+
+    def suggest(self, prefix, limit=10, max_edits=0):
+        """
+        Names and locations starting with ``prefix`` for autocomplete,
+        optionally tolerating up to ``max_edits`` typos.
+        """
+        with tracing.span('destination_repository.suggest', limit=limit):
+            return self._read(lambda: self.suggest_index.suggest(prefix, limit, max_edits))
+
+    def near(self, latitude, longitude, radius_km, limit=10, fields=None,
+             currency=None):
+        """
+        Up to ``limit`` destinations within ``radius_km`` of the point,
+        closest first, each with its ``distance_km``.
+        """
+        def read():
+            matches = self.spatial_index.nearest(latitude, longitude, radius_km, limit)
+            slots = np.array(
+                [self.prices.slots[destination_id] for _, destination_id in matches],
+                dtype=np.intp
+            )
+            results = self._records(slots, fields, currency)
+            for record, (distance, _) in zip(results, matches):
+                record['distance_km'] = round(distance, 3)
+            return results
+
+        with tracing.span('destination_repository.near', radius_km=radius_km):
+            return self._read(read)
+
+
+def _project(destination, fields):
+    # Optional fields (coordinates) are left out where a record has none
+    return {field: destination[field] for field in fields if field in destination}
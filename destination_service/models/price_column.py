@@ -0,0 +1,209 @@
+# models/price_column.py
+"""
+Columnar storage of ``price_per_night``.
+
+Prices live in one contiguous float64 array, one slot per destination,
+next to an int32 array of location codes and a live mask. Slots are
+appended in insertion order and deleted slots are only masked out (the
+array is compacted once dead slots outnumber live ones), so slot order
+is the catalogue's listing order. Currency conversion and repricing then
+run as single vectorized operations over the whole column instead of a
+Python loop over records.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Below this many dead slots compaction is not worth its O(n) copy
+_COMPACT_MIN_DEAD = 1024
+
+
+def round_prices(prices: np.ndarray) -> np.ndarray:
+    """Round to cents, the precision prices are stored and shown with"""
+    return np.round(prices, 2)
+
+
+class PriceColumn:
+    def __init__(self, capacity: int = 1024):
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.location_codes = np.full(capacity, -1, dtype=np.int32)
+        self.live = np.zeros(capacity, dtype=bool)
+        # Insertion number of each slot's destination; survives compaction
+        self.sequence = np.zeros(capacity, dtype=np.int64)
+        self._next_sequence = 0
+        self.ids: List[Optional[str]] = []
+        self.slots: Dict[str, int] = {}
+        self.locations: List[str] = []
+        self._location_codes: Dict[str, int] = {}
+        self._dead = 0
+
+    @classmethod
+    def from_arrays(cls, ids: List[str], prices: np.ndarray,
+                    locations: List[Optional[str]]) -> 'PriceColumn':
+        """Column holding ``ids`` in order, built without per-row inserts"""
+        count = len(ids)
+        column = cls(max(2 * count, 16))
+        column.prices[:count] = prices
+        column.live[:count] = True
+        column.sequence[:count] = np.arange(count)
+        column._next_sequence = count
+        codes = [column.location_code(location, create=True) for location in locations]
+        column.location_codes[:count] = np.array(codes, dtype=np.int32)
+        column.ids = list(ids)
+        column.slots = {destination_id: slot for slot, destination_id in enumerate(ids)}
+        return column
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, destination_id) -> bool:
+        return destination_id in self.slots
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self.prices), 16)
+        for name in ('prices', 'location_codes', 'live', 'sequence'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            if name == 'location_codes':
+                new.fill(-1)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def location_code(self, location: Optional[str], create: bool = False) -> int:
+        """Code of ``location``; -1 for none, -2 if unknown and not created"""
+        if location is None:
+            return -1
+        code = self._location_codes.get(location)
+        if code is None:
+            if not create:
+                return -2
+            code = self._location_codes[location] = len(self.locations)
+            self.locations.append(location)
+        return code
+
+    def put(self, destination_id: str, price: float,
+            location: Optional[str] = None) -> int:
+        """Set the price of a destination, appending a slot if it is new"""
+        slot = self.slots.get(destination_id)
+        if slot is None:
+            slot = len(self.ids)
+            if slot == len(self.prices):
+                self._grow()
+            self.ids.append(destination_id)
+            self.slots[destination_id] = slot
+            self.live[slot] = True
+            self.sequence[slot] = self._next_sequence
+            self._next_sequence += 1
+        self.prices[slot] = price
+        self.location_codes[slot] = self.location_code(location, create=True)
+        return slot
+
+    def pop(self, destination_id: str) -> Optional[float]:
+        """Remove a destination, returning its price (None if absent)"""
+        slot = self.slots.pop(destination_id, None)
+        if slot is None:
+            return None
+        price = float(self.prices[slot])
+        self.live[slot] = False
+        self.ids[slot] = None
+        self._dead += 1
+        if self._dead >= _COMPACT_MIN_DEAD and self._dead > len(self.slots):
+            self.compact()
+        return price
+
+    def price(self, destination_id: str) -> float:
+        return float(self.prices[self.slots[destination_id]])
+
+    def sequence_of(self, destination_id: str) -> int:
+        return int(self.sequence[self.slots[destination_id]])
+
+    def live_slots(self, location: Optional[str] = None) -> np.ndarray:
+        """Slots of every destination (or those in ``location``), in order"""
+        size = len(self.ids)
+        mask = self.live[:size]
+        if location is not None:
+            mask = mask & (self.location_codes[:size] == self.location_code(location))
+        return np.flatnonzero(mask)
+
+    def prices_at(self, slots: np.ndarray, rate: Optional[float] = None) -> np.ndarray:
+        """Prices of ``slots``, converted by ``rate`` and rounded if given"""
+        prices = self.prices[slots]
+        if rate is not None:
+            prices = round_prices(prices * rate)
+        return prices
+
+    def scale(self, factor: float, location: Optional[str] = None) -> int:
+        """
+        Multiply every price (or those in ``location``) by ``factor`` and
+        round to cents in one array operation. Returns the number changed.
+
+        Raises:
+            ValueError: If a scaled price would overflow; nothing is changed
+        """
+        size = len(self.ids)
+        mask = self.live[:size].copy()
+        if location is not None:
+            mask &= self.location_codes[:size] == self.location_code(location)
+        prices = self.prices[:size]
+        with np.errstate(over='ignore', invalid='ignore'):
+            scaled = round_prices(prices[mask] * factor)
+        if not np.isfinite(scaled).all():
+            raise ValueError('percent is too large')
+        prices[mask] = scaled
+        return int(np.count_nonzero(mask))
+
+    def sorted_slots(self, slots: np.ndarray, limit: Optional[int] = None,
+                     descending: bool = False) -> np.ndarray:
+        """
+        ``slots`` ordered by price, ties in catalogue order. With ``limit``
+        only the first ``limit`` are selected (np.partition, O(n)) and
+        sorted, instead of sorting them all.
+        """
+        prices = self.prices[slots]
+        if descending:
+            prices = -prices
+        if limit is not None and limit < len(slots):
+            kth = np.partition(prices, limit - 1)[limit - 1]
+            below = np.flatnonzero(prices < kth)
+            tied = np.flatnonzero(prices == kth)[:limit - len(below)]
+            chosen = np.sort(np.concatenate([below, tied]))
+        else:
+            chosen = np.arange(len(slots))
+        return slots[chosen[np.argsort(prices[chosen], kind='stable')]]
+
+    def groups(self) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+        """
+        (location, prices, slots) for every location with live
+        destinations, each sorted by price
+        """
+        slots = self.live_slots()
+        codes, prices = self.location_codes[slots], self.prices[slots]
+        # Sort by price, then stably by location: each group comes out
+        # sorted (two argsorts beat one np.lexsort by about 2x here)
+        order = np.argsort(prices)
+        order = order[np.argsort(codes[order], kind='stable')]
+        codes, prices, slots = codes[order], prices[order], slots[order]
+        present, starts = np.unique(codes, return_index=True)
+        ends = np.append(starts[1:], len(codes))
+        for code, start, end in zip(present.tolist(), starts.tolist(), ends.tolist()):
+            if code >= 0:
+                yield self.locations[code], prices[start:end], slots[start:end]
+
+    def compact(self) -> None:
+        """Drop dead slots, keeping the order of the live ones"""
+        slots = self.live_slots()
+        count = len(slots)
+        capacity = max(2 * count, 16)
+        prices = np.zeros(capacity, dtype=np.float64)
+        codes = np.full(capacity, -1, dtype=np.int32)
+        live = np.zeros(capacity, dtype=bool)
+        sequence = np.zeros(capacity, dtype=np.int64)
+        prices[:count] = self.prices[slots]
+        sequence[:count] = self.sequence[slots]
+        codes[:count] = self.location_codes[slots]
+        live[:count] = True
+        self.prices, self.location_codes, self.live = prices, codes, live
+        self.sequence = sequence
+        self.ids = [self.ids[slot] for slot in slots.tolist()]
+        self.slots = {destination_id: slot for slot, destination_id in enumerate(self.ids)}
+        self._dead = 0
@@ -0,0 +1,70 @@
+# models/price_index.py
+"""
+Destinations of each location ordered by price.
+
+Each location keeps a ``SortedList`` of ``(price, sequence, id)`` keys,
+where ``sequence`` is the destination's insertion number, so ties come
+out in catalogue order. Inserting or deleting a destination is
+O(log n), and the K cheapest (or most expensive) destinations of a
+location are read off one end of its list in O(log n + K), never
+sorting or scanning the location.
+"""
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+Key = Tuple[float, int, str]
+
+
+class LocationPriceIndex:
+    def __init__(self):
+        self.by_location: Dict[str, SortedList] = {}
+
+    def add(self, location: Optional[str], price: float, sequence: int,
+            destination_id: str) -> None:
+        if location is None:
+            return
+        keys = self.by_location.get(location)
+        if keys is None:
+            keys = self.by_location[location] = SortedList()
+        keys.add((price, sequence, destination_id))
+
+    def remove(self, location: Optional[str], price: float, sequence: int,
+               destination_id: str) -> None:
+        if location is None:
+            return
+        keys = self.by_location[location]
+        keys.remove((price, sequence, destination_id))
+        if not keys:
+            del self.by_location[location]
+
+    def replace(self, location: str, keys: Iterable[Key]) -> None:
+        """Rebuild a location from its keys, e.g. after repricing"""
+        keys = SortedList(keys)
+        if keys:
+            self.by_location[location] = keys
+        else:
+            self.by_location.pop(location, None)
+
+    def ordered(self, location: str, limit: Optional[int] = None,
+                descending: bool = False) -> List[str]:
+        """
+        Ids of the ``limit`` cheapest destinations of ``location`` (most
+        expensive if ``descending``), ties in catalogue order.
+        """
+        keys = self.by_location.get(location)
+        if keys is None:
+            return []
+        if not descending:
+            return [key[2] for key in islice(keys, limit)]
+        picked: List[str] = []
+        end = len(keys)
+        # Walk the runs of equal prices from the top, each in catalogue
+        # order, reading only as far into the last run as ``limit`` needs
+        while end and (limit is None or len(picked) < limit):
+            start = keys.bisect_left((keys[end - 1][0],))
+            wanted = None if limit is None else limit - len(picked)
+            picked.extend(key[2] for key in islice(keys.islice(start, end), wanted))
+            end = start
+        return picked
@@ -0,0 +1,163 @@
+# models/price_stats.py
+"""
+Running ``price_per_night`` aggregates, overall and per location.
+
+Each group keeps its count and an exact sum (prices are summed as
+integer millionths, so any sequence of inserts and deletes returns to
+the same total) plus a min-heap and a max-heap. Deleting a price only
+records it as pending; it is popped once it reaches the top of a heap
+and the heaps are rebuilt when pending deletions outnumber live prices.
+Pending prices are popped by the writes themselves, so reading only
+peeks at the heap tops and never mutates (readers take no lock).
+Inserts and deletes are therefore O(log n) amortized and reading the
+stats never scans the catalogue. After a bulk repricing the groups are
+rebuilt from the price column with ``from_prices``.
+"""
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_SCALE = 1_000_000
+
+
+class PriceStats:
+    """Aggregates of one group of prices"""
+
+    def __init__(self):
+        self.count = 0
+        self._total = 0
+        self._low: List[float] = []
+        self._high: List[float] = []
+        self._removed_low: Counter = Counter()
+        self._removed_high: Counter = Counter()
+
+    @classmethod
+    def from_prices(cls, prices: np.ndarray) -> 'PriceStats':
+        stats = cls()
+        stats.count = len(prices)
+        # np.rint rounds half to even like ``round``, so removals balance out
+        stats._total = int(np.rint(prices * _SCALE).astype(np.int64).sum())
+        # A sorted list is already a valid heap, and sorting runs in C
+        ordered = np.sort(prices)
+        stats._low = ordered.tolist()
+        stats._high = (-ordered[::-1]).tolist()
+        return stats
+
+    def add(self, price: float) -> None:
+        self.count += 1
+        self._total += round(price * _SCALE)
+        heapq.heappush(self._low, price)
+        heapq.heappush(self._high, -price)
+        self._prune()
+
+    def remove(self, price: float) -> None:
+        self.count -= 1
+        self._total -= round(price * _SCALE)
+        self._removed_low[price] += 1
+        self._removed_high[-price] += 1
+        if len(self._low) > 2 * self.count + 16:
+            self._rebuild()
+        else:
+            self._prune()
+
+    def _rebuild(self) -> None:
+        prices = list((Counter(self._low) - self._removed_low).elements())
+        self._low = prices
+        heapq.heapify(self._low)
+        self._high = [-price for price in prices]
+        heapq.heapify(self._high)
+        self._removed_low.clear()
+        self._removed_high.clear()
+
+    @staticmethod
+    def _pop_removed(heap: List[float], removed: Counter) -> None:
+        while heap and removed.get(heap[0]):
+            removed[heap[0]] -= 1
+            if not removed[heap[0]]:
+                del removed[heap[0]]
+            heapq.heappop(heap)
+
+    def _prune(self) -> None:
+        """Pop pending deletions off both heap tops"""
+        self._pop_removed(self._low, self._removed_low)
+        self._pop_removed(self._high, self._removed_high)
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._low[0] if self.count else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return -self._high[0] if self.count else None
+
+    @property
+    def total(self) -> float:
+        return self._total / _SCALE
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._total / _SCALE / self.count if self.count else None
+
+    def to_dict(self) -> Dict:
+        mean = self.mean
+        return {
+            'count': self.count,
+            'min_price': self.min,
+            'max_price': self.max,
+            'avg_price': round(mean, 2) if mean is not None else None,
+        }
+
+
+class PriceAggregates:
+    """``PriceStats`` for the whole catalogue and for each location"""
+
+    def __init__(self):
+        self.overall = PriceStats()
+        self.by_location: Dict[str, PriceStats] = {}
+
+    @classmethod
+    def from_prices(cls, prices: np.ndarray,
+                    groups: Iterable[Tuple[str, np.ndarray]]) -> 'PriceAggregates':
+        """Aggregates of all ``prices`` and of each (location, prices) group"""
+        aggregates = cls()
+        aggregates.overall = PriceStats.from_prices(prices)
+        aggregates.by_location = {
+            location: PriceStats.from_prices(group) for location, group in groups
+        }
+        return aggregates
+
+    def add(self, destination: Dict) -> None:
+        price = destination.get('price_per_night')
+        if price is None:
+            return
+        self.overall.add(price)
+        location = destination.get('location')
+        if location is not None:
+            self.by_location.setdefault(location, PriceStats()).add(price)
+
+    def remove(self, destination: Dict) -> None:
+        price = destination.get('price_per_night')
+        if price is None:
+            return
+        self.overall.remove(price)
+        location = destination.get('location')
+        if location is not None:
+            stats = self.by_location[location]
+            stats.remove(price)
+            if not stats.count:
+                del self.by_location[location]
+
+    def location(self, location: str) -> Optional[Dict]:
+        stats = self.by_location.get(location)
+        return stats.to_dict() if stats is not None else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'overall': self.overall.to_dict(),
+            'locations': {
+                location: stats.to_dict()
+                for location, stats in sorted(self.by_location.items())
+            },
+        }
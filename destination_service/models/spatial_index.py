@@ -0,0 +1,158 @@
+# models/spatial_index.py
+"""
+Grid index over destination coordinates for "near me" queries.
+
+The globe is cut into ``cell_degrees`` x ``cell_degrees`` cells and each
+cell maps destination ids to their coordinates, so inserts and deletes
+are O(1). A query only visits the cells overlapping the bounding box of
+its search circle (longitudes wrap around the antimeridian and the box
+widens towards the poles) and ranks the candidates by great-circle
+distance. k-nearest queries start from a small circle and double it
+until ``limit`` destinations are found or the requested radius is
+reached, so dense areas never scan the full radius.
+"""
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+# Half the equator: no two points on the sphere are further apart
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM
+
+Cell = Tuple[int, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (math.sin(dphi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def validate_coordinates(latitude: float, longitude: float) -> None:
+    if not -90.0 <= latitude <= 90.0:
+        raise ValueError(f'Latitude {latitude} is outside [-90, 90]')
+    if not -180.0 <= longitude <= 180.0:
+        raise ValueError(f'Longitude {longitude} is outside [-180, 180]')
+
+
+class GeoGridIndex:
+    def __init__(self, cell_degrees: float = 0.5):
+        self.cell_degrees = cell_degrees
+        self.columns = int(round(360.0 / cell_degrees))
+        self.rows = int(math.ceil(180.0 / cell_degrees))
+        self._cells: Dict[Cell, Dict[str, Tuple[float, float]]] = {}
+        self._cell_of: Dict[str, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def __contains__(self, destination_id) -> bool:
+        return destination_id in self._cell_of
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        row = min(int((latitude + 90.0) // self.cell_degrees), self.rows - 1)
+        column = int((longitude + 180.0) // self.cell_degrees) % self.columns
+        return row, column
+
+    def add(self, destination_id: str, latitude: float, longitude: float) -> None:
+        """Insert or move a destination"""
+        validate_coordinates(latitude, longitude)
+        self.remove(destination_id)
+        cell = self._cell(latitude, longitude)
+        self._cells.setdefault(cell, {})[destination_id] = (latitude, longitude)
+        self._cell_of[destination_id] = cell
+
+    def add_many(self, destination_ids: List[str], latitudes: List[float],
+                 longitudes: List[float]) -> None:
+        """Insert many destinations not yet in the index, cells computed in bulk"""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if len(latitudes) and not (
+                np.all(np.abs(latitudes) <= 90.0) and np.all(np.abs(longitudes) <= 180.0)):
+            raise ValueError('Coordinates are outside [-90, 90] x [-180, 180]')
+        rows = np.minimum(((latitudes + 90.0) // self.cell_degrees).astype(np.int64),
+                          self.rows - 1)
+        columns = ((longitudes + 180.0) // self.cell_degrees).astype(np.int64) % self.columns
+        cells, cell_of = self._cells, self._cell_of
+        for destination_id, latitude, longitude, row, column in zip(
+                destination_ids, latitudes.tolist(), longitudes.tolist(),
+                rows.tolist(), columns.tolist()):
+            cell = (row, column)
+            members = cells.get(cell)
+            if members is None:
+                members = cells[cell] = {}
+            members[destination_id] = (latitude, longitude)
+            cell_of[destination_id] = cell
+
+    def remove(self, destination_id: str) -> bool:
+        cell = self._cell_of.pop(destination_id, None)
+        if cell is None:
+            return False
+        members = self._cells[cell]
+        del members[destination_id]
+        if not members:
+            del self._cells[cell]
+        return True
+
+    def _cells_within(self, latitude: float, longitude: float,
+                      radius_km: float) -> Iterator[Cell]:
+        """Cells overlapping the bounding box of the search circle"""
+        angular = radius_km / EARTH_RADIUS_KM
+        delta_lat = math.degrees(angular)
+        south, north = latitude - delta_lat, latitude + delta_lat
+        first_row = max(0, int((south + 90.0) // self.cell_degrees))
+        last_row = min(self.rows - 1, int((north + 90.0) // self.cell_degrees))
+
+        cos_lat = math.cos(math.radians(latitude))
+        if north >= 90.0 or south <= -90.0 or math.sin(angular) >= cos_lat:
+            # The circle reaches a pole: every longitude is in range
+            columns = range(self.columns)
+        else:
+            delta_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+            first = int((longitude - delta_lon + 180.0) // self.cell_degrees)
+            last = int((longitude + delta_lon + 180.0) // self.cell_degrees)
+            if last - first + 1 >= self.columns:
+                columns = range(self.columns)
+            else:
+                columns = [c % self.columns for c in range(first, last + 1)]
+
+        cells = self._cells
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                if (row, column) in cells:
+                    yield row, column
+
+    def within(self, latitude: float, longitude: float,
+               radius_km: float) -> List[Tuple[float, str]]:
+        """Every (distance_km, id) inside the circle, unordered"""
+        found = []
+        for cell in self._cells_within(latitude, longitude, radius_km):
+            for destination_id, (lat, lon) in self._cells[cell].items():
+                distance = haversine_km(latitude, longitude, lat, lon)
+                if distance <= radius_km:
+                    found.append((distance, destination_id))
+        return found
+
+    def nearest(self, latitude: float, longitude: float, radius_km: float,
+                limit: Optional[int] = 10) -> List[Tuple[float, str]]:
+        """
+        Up to ``limit`` nearest (distance_km, id) pairs within
+        ``radius_km``, closest first.
+        """
+        validate_coordinates(latitude, longitude)
+        radius_km = min(radius_km, MAX_RADIUS_KM)
+        if limit is None:
+            return sorted(self.within(latitude, longitude, radius_km))
+        # Start around one cell and widen until enough matches are found
+        search = min(radius_km, self.cell_degrees * 111.0)
+        while True:
+            found = self.within(latitude, longitude, search)
+            if len(found) >= limit or search >= radius_km:
+                return heapq.nsmallest(limit, found)
+            search = min(radius_km, search * 2)
@@ -0,0 +1,184 @@
+# models/suggest_index.py
+"""
+Autocomplete over destination names and locations.
+
+Each distinct (normalized text, field) pair is one key of a sorted key
+set, FST-style: the sorted keys form an implicit trie, where the keys
+starting with a prefix are one contiguous run found by bisection. A
+prefix lookup is therefore O(log n + limit) however large the catalogue
+is, and adding or deleting a destination only touches its own keys
+(``SortedList`` keeps inserts and deletes O(log n) amortized).
+
+Typo tolerance walks the same implicit trie depth first, stepping from
+one child to the next with bisections, and keeps a row of the
+Levenshtein table per node: a branch is dropped as soon as every entry
+of its row exceeds ``max_edits``. Like most search engines the first
+``FUZZY_PREFIX_LENGTH`` characters must be typed right, which keeps the
+walk to a few thousand nodes at 1M keys.
+
+Text is matched case- and accent-insensitively (``normalize``).
+"""
+import sys
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+FIELDS = ('name', 'location')
+FUZZY_MAX_EDITS = 2
+FUZZY_PREFIX_LENGTH = 1
+# Shorter prefixes are within a couple of edits of nearly everything
+FUZZY_MIN_LENGTH = 3
+# Ends the text part of a key; sorts before every printable character
+_SEP = '\x1f'
+_MAX_CHAR = chr(sys.maxunicode)
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and control characters, collapse spaces"""
+    if text.isascii() and text.isprintable():
+        return ' '.join(text.lower().split())
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    kept = ''.join(
+        ch for ch in decomposed if ch >= ' ' and not unicodedata.combining(ch)
+    )
+    return ' '.join(kept.split())
+
+
+def _next_row(row: List[int], ch: str, query: str) -> List[int]:
+    """Levenshtein row of ``prefix + ch`` given the row of ``prefix``"""
+    new = [row[0] + 1]
+    for j, query_ch in enumerate(query, 1):
+        new.append(min(new[j - 1] + 1, row[j] + 1, row[j - 1] + (query_ch != ch)))
+    return new
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._keys = SortedList()
+        # key -> [display text, number of destinations]
+        self._terms: Dict[str, List] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @staticmethod
+    def _key(text: str, field: str) -> str:
+        return f'{normalize(text)}{_SEP}{field}'
+
+    def add(self, destination: Dict) -> None:
+        for field in FIELDS:
+            text = destination.get(field)
+            if not text:
+                continue
+            key = self._key(text, field)
+            term = self._terms.get(key)
+            if term is None:
+                self._terms[key] = [text, 1]
+                self._keys.add(key)
+            else:
+                term[1] += 1
+
+    def export(self) -> Tuple[List[str], List[str], List[int]]:
+        """(keys in order, their display texts, their counts) for ``restore``"""
+        keys = list(self._keys)
+        terms = self._terms
+        return (keys, [terms[key][0] for key in keys],
+                [terms[key][1] for key in keys])
+
+    @classmethod
+    def restore(cls, keys: List[str], texts: List[str],
+                counts: List[int]) -> 'SuggestIndex':
+        """Index from ``export`` output, without normalizing any text again"""
+        index = cls()
+        index._terms = {key: [text, count] for key, text, count in zip(keys, texts, counts)}
+        index._keys.update(keys)
+        return index
+
+    def remove(self, destination: Dict) -> None:
+        for field in FIELDS:
+            text = destination.get(field)
+            if not text:
+                continue
+            key = self._key(text, field)
+            term = self._terms[key]
+            term[1] -= 1
+            if not term[1]:
+                del self._terms[key]
+                self._keys.remove(key)
+
+    def _ceiling(self, key: str) -> Optional[str]:
+        """Smallest key >= ``key``"""
+        position = self._keys.bisect_left(key)
+        return self._keys[position] if position < len(self._keys) else None
+
+    def _starting_with(self, prefix: str, limit: int) -> List[str]:
+        keys = []
+        for key in self._keys.irange(minimum=prefix):
+            if not key.startswith(prefix) or len(keys) >= limit:
+                break
+            keys.append(key)
+        return keys
+
+    def _fuzzy(self, query: str, max_edits: int, limit: int) -> Dict[str, int]:
+        """Keys with a prefix within ``max_edits`` of ``query`` -> distance"""
+        row = list(range(len(query) + 1))
+        start = query[:FUZZY_PREFIX_LENGTH]
+        for ch in start:
+            row = _next_row(row, ch, query)
+        found: Dict[str, int] = {}
+        stack: List[Tuple[str, List[int]]] = [(start, row)]
+        while stack:
+            prefix, row = stack.pop()
+            distance = row[-1]
+            if distance <= max_edits:
+                # Every key below this node matches; keep the first few
+                for key in self._starting_with(prefix, limit):
+                    if distance < found.get(key, max_edits + 1):
+                        found[key] = distance
+            # Deeper nodes can only match if some cell may still improve
+            if min(row) >= min(distance, max_edits + 1):
+                continue
+            depth = len(prefix)
+            key = self._ceiling(prefix)
+            while key is not None and key.startswith(prefix):
+                ch = key[depth]
+                if ch != _SEP:
+                    stack.append((prefix + ch, _next_row(row, ch, query)))
+                if ch == _MAX_CHAR:
+                    # No code point sorts after it, so no sibling can follow
+                    break
+                key = self._ceiling(prefix + chr(ord(ch) + 1))
+        return found
+
+    def suggest(self, prefix: str, limit: int = 10,
+                max_edits: int = 0) -> List[Dict]:
+        """
+        Up to ``limit`` names and locations starting with ``prefix``, in
+        alphabetical order. With ``max_edits`` (at most
+        ``FUZZY_MAX_EDITS``), prefixes of at least ``FUZZY_MIN_LENGTH``
+        characters also match texts within that many typos, ranked after
+        the exact matches by number of edits.
+        """
+        query = normalize(prefix)
+        if query and prefix[-1:].isspace():
+            query += ' '
+        if not query:
+            return []
+        keys = self._starting_with(query, limit)
+        max_edits = min(max_edits, FUZZY_MAX_EDITS)
+        if len(keys) < limit and max_edits > 0 and len(query) >= FUZZY_MIN_LENGTH:
+            exact = set(keys)
+            fuzzy = sorted(
+                (distance, key)
+                for key, distance in self._fuzzy(query, max_edits, limit).items()
+                if key not in exact
+            )
+            keys += [key for _, key in fuzzy[:limit - len(keys)]]
+        suggestions = []
+        for key in keys:
+            text, count = self._terms[key]
+            suggestions.append({
+                'text': text, 'field': key.rpartition(_SEP)[2], 'count': count
+            })
+        return suggestions
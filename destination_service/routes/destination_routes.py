@@ -1,42 +1,400 @@
 # routes/destination_routes.py
 
-from flask import request
+import math
+import threading
+from datetime import date
+from flask import Response, current_app, request
 from flask_restx import Namespace, Resource
+from common import projection
 from services.auth_service import AuthService
 from models.destination_repository import DestinationRepository
+from models.spatial_index import MAX_RADIUS_KM
+from models.suggest_index import FUZZY_MAX_EDITS
 
+NEAR_DEFAULT_RADIUS_KM = 50.0
+NEAR_DEFAULT_LIMIT = 10
+NEAR_MAX_LIMIT = 100
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+BATCH_MAX_IDS = 1000
+CHANGES_DEFAULT_LIMIT = 1000
+CHANGES_MAX_LIMIT = 10000
+# Idle event streams send a comment this often so proxies keep them open
+STREAM_KEEPALIVE_SECONDS = 15.0
+# Each open stream holds a server thread; more than this get 503
+STREAM_DEFAULT_MAX = 8
 
-def register_destination_routes(api):
+
+def _number_arg(name, cast, default=None):
+    """Read a numeric query parameter, raising ValueError when invalid"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        if default is None:
+            raise ValueError(f'Query parameter {name} is required')
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f'Query parameter {name} must be a number')
+
+
+def _date_value(name, value):
+    """Parse an ISO date, raising ValueError when missing or invalid"""
+    if not value:
+        raise ValueError(f'{name} is required')
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+
+
+def _json_object():
+    """The request's JSON object body ({} if there is none), raising ValueError otherwise"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    return data
+
+
+def _batch_ids(data):
+    """The ``ids`` list of a batch request body, raising ValueError when invalid"""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids must be a non-empty list')
+    if not all(isinstance(destination_id, str) for destination_id in ids):
+        raise ValueError('ids must be strings')
+    return ids
+
+
+def _admin_error(auth_service):
+    """Error response unless the request carries an admin bearer token"""
+    # Extract token from Authorization header
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return {'message': 'Invalid authorization header'}, 401
+
+    token = auth_header.split(' ')[1]
+
+    # Validate the admin token
+    if not auth_service.validate_admin_token(token):
+        return {'message': 'Admin access required'}, 403
+    return None
+
+
+def register_destination_routes(api, repository=None, auth_service=None):
     ns = Namespace('destinations', description='Destination operations')
     api.add_namespace(ns)
 
-    repository = DestinationRepository()
-    auth_service = AuthService()
+    repository = repository or DestinationRepository()
+    auth_service = auth_service or AuthService()
+    streams = {'open': 0}
+    streams_lock = threading.Lock()
 
     @ns.route('/')
     class DestinationList(Resource):
+        @ns.doc(params={
+            'fields': 'Comma-separated fields to return, e.g. id,price_per_night',
+            'currency': 'Currency to show prices in, e.g. EUR',
+            'location': 'Only return destinations in this location',
+            'sort': 'price (cheapest first) or -price',
+            'limit': 'Maximum number of destinations to return',
+        })
         def get(self):
             """Retrieve all destinations"""
-            return repository.get_all(), 200
+            try:
+                fields = projection.parse_fields(
+                    request.args.get(projection.FIELDS_PARAM), repository.FIELDS
+                )
+                limit = None
+                if request.args.get('limit'):
+                    limit = _number_arg('limit', int)
+                    if limit < 1:
+                        raise ValueError('limit must be at least 1')
+                return repository.get_all(
+                    fields, request.args.get('currency'),
+                    location=request.args.get('location'),
+                    sort=request.args.get('sort'), limit=limit
+                ), 200
+            except ValueError as e:
+                return {'message': str(e)}, 400
+
+    @ns.route('/reprice')
+    class DestinationReprice(Resource):
+        @api.doc(security='Bearer Auth')
+        def post(self):
+            """Adjust prices by a percentage (Admin only)"""
+            error = _admin_error(auth_service)
+            if error is not None:
+                return error
+
+            try:
+                data = _json_object()
+                percent = data.get('percent')
+                location = data.get('location')
+                if (isinstance(percent, bool) or not isinstance(percent, (int, float))
+                        or not math.isfinite(percent)):
+                    raise ValueError('percent must be a number')
+                if location is not None and not isinstance(location, str):
+                    raise ValueError('location must be a string')
+                updated = repository.reprice(percent, location)
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            if location is not None and not updated:
+                return {'message': 'Location not found'}, 404
+            return {'updated': updated}, 200
+
+    @ns.route('/stats')
+    class DestinationStats(Resource):
+        @ns.doc(params={'location': 'Only return the stats of this location'})
+        def get(self):
+            """Price statistics for the catalogue and per location"""
+            location = request.args.get('location')
+            stats = repository.stats(location)
+            if stats is None:
+                return {'message': 'Location not found'}, 404
+            return stats, 200
+
+    @ns.route('/available')
+    class DestinationsAvailable(Resource):
+        @ns.doc(params={
+            'from': 'Check-in date (YYYY-MM-DD)',
+            'to': 'Check-out date (YYYY-MM-DD), after from',
+            'fields': 'Comma-separated fields to return',
+            'currency': 'Currency to show prices in, e.g. EUR',
+        })
+        def get(self):
+            """Destinations free on every night of a stay"""
+            try:
+                start = _date_value('from', request.args.get('from'))
+                end = _date_value('to', request.args.get('to'))
+                fields = projection.parse_fields(
+                    request.args.get(projection.FIELDS_PARAM), repository.FIELDS
+                )
+                return repository.available(
+                    start, end, fields, request.args.get('currency')
+                ), 200
+            except ValueError as e:
+                return {'message': str(e)}, 400
+
+    @ns.route('/suggest')
+    class DestinationSuggest(Resource):
+        @ns.doc(params={
+            'prefix': 'Text typed so far',
+            'limit': f'Maximum suggestions, 1-{SUGGEST_MAX_LIMIT} (default {SUGGEST_DEFAULT_LIMIT})',
+            'fuzzy': f'Typos to tolerate, 0-{FUZZY_MAX_EDITS} (default 0)',
+        })
+        def get(self):
+            """Autocomplete destination names and locations"""
+            prefix = request.args.get('prefix', '')
+            try:
+                limit = _number_arg('limit', int, SUGGEST_DEFAULT_LIMIT)
+                fuzzy = _number_arg('fuzzy', int, 0)
+                if not prefix.strip():
+                    raise ValueError('Query parameter prefix is required')
+                if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+                    raise ValueError(f'limit must be between 1 and {SUGGEST_MAX_LIMIT}')
+                if not 0 <= fuzzy <= FUZZY_MAX_EDITS:
+                    raise ValueError(f'fuzzy must be between 0 and {FUZZY_MAX_EDITS}')
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            return repository.suggest(prefix, limit, fuzzy), 200
+
+    @ns.route('/near')
+    class DestinationsNear(Resource):
+        @ns.doc(params={
+            'lat': 'Latitude of the search point',
+            'lon': 'Longitude of the search point',
+            'radius': f'Search radius in km (default {NEAR_DEFAULT_RADIUS_KM:g})',
+            'limit': f'Maximum results, 1-{NEAR_MAX_LIMIT} (default {NEAR_DEFAULT_LIMIT})',
+            'fields': 'Comma-separated fields to return',
+            'currency': 'Currency to show prices in, e.g. EUR',
+        })
+        def get(self):
+            """Find the destinations nearest to a point, closest first"""
+            try:
+                latitude = _number_arg('lat', float)
+                longitude = _number_arg('lon', float)
+                radius = _number_arg('radius', float, NEAR_DEFAULT_RADIUS_KM)
+                limit = _number_arg('limit', int, NEAR_DEFAULT_LIMIT)
+                if not 0 < radius <= MAX_RADIUS_KM:
+                    raise ValueError(f'radius must be in (0, {MAX_RADIUS_KM:.0f}] km')
+                if not 1 <= limit <= NEAR_MAX_LIMIT:
+                    raise ValueError(f'limit must be between 1 and {NEAR_MAX_LIMIT}')
+                fields = projection.parse_fields(
+                    request.args.get(projection.FIELDS_PARAM), repository.FIELDS
+                )
+                return repository.near(
+                    latitude, longitude, radius, limit, fields,
+                    request.args.get('currency')
+                ), 200
+            except ValueError as e:
+                return {'message': str(e)}, 400
+
+    @ns.route('/batch-get')
+    class DestinationBatchGet(Resource):
+        @ns.doc(params={
+            'fields': 'Comma-separated fields to return',
+            'currency': 'Currency to show prices in, e.g. EUR',
+        })
+        @ns.response(413, 'Batch too large')
+        def post(self):
+            """Retrieve destinations by id, one result per id"""
+            try:
+                ids = _batch_ids(_json_object())
+                if len(ids) > BATCH_MAX_IDS:
+                    return {'message': f'Batch too large. Maximum is {BATCH_MAX_IDS} ids'}, 413
+                fields = projection.parse_fields(
+                    request.args.get(projection.FIELDS_PARAM), repository.FIELDS
+                )
+                records = repository.get_many(ids, fields, request.args.get('currency'))
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            results = [
+                {'id': destination_id, 'status': 404, 'message': 'Destination not found'}
+                if record is None else
+                {'id': destination_id, 'status': 200, 'destination': record}
+                for destination_id, record in zip(ids, records)
+            ]
+            found = sum(record is not None for record in records)
+            return {'found': found, 'missing': len(ids) - found, 'results': results}, 200
+
+    @ns.route('/batch-delete')
+    class DestinationBatchDelete(Resource):
+        @api.doc(security='Bearer Auth')
+        @ns.response(413, 'Batch too large')
+        def post(self):
+            """Delete destinations by id in one atomic change (Admin only)"""
+            # One token check covers the whole batch
+            error = _admin_error(auth_service)
+            if error is not None:
+                return error
+
+            try:
+                ids = _batch_ids(_json_object())
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            if len(ids) > BATCH_MAX_IDS:
+                return {'message': f'Batch too large. Maximum is {BATCH_MAX_IDS} ids'}, 413
+
+            deleted = repository.delete_many(ids)
+            results = [
+                {'id': destination_id, 'status': 200, 'message': 'Destination deleted'}
+                if was_deleted else
+                {'id': destination_id, 'status': 404, 'message': 'Destination not found'}
+                for destination_id, was_deleted in zip(ids, deleted)
+            ]
+            count = sum(deleted)
+            return {'deleted': count, 'missing': len(ids) - count, 'results': results}, 200
+
+    @ns.route('/changes')
+    class DestinationChanges(Resource):
+        @ns.doc(params={
+            'since': 'Sequence number synced up to; omit to get the current one',
+            'limit': f'Maximum changes, 1-{CHANGES_MAX_LIMIT} (default {CHANGES_DEFAULT_LIMIT})',
+        }, responses={410: 'Changes after since were dropped; re-download the list'})
+        def get(self):
+            """Upserts and deletes after a sequence number, for delta sync"""
+            changes = repository.changes
+            if not request.args.get('since'):
+                latest = changes.latest
+                return {'changes': [], 'next': latest, 'latest': latest, 'more': False}, 200
+            try:
+                since = _number_arg('since', int)
+                limit = _number_arg('limit', int, CHANGES_DEFAULT_LIMIT)
+                if not 1 <= limit <= CHANGES_MAX_LIMIT:
+                    raise ValueError(f'limit must be between 1 and {CHANGES_MAX_LIMIT}')
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            found = changes.since(since, limit)
+            latest = changes.latest
+            if found is None:
+                return {'message': 'Resync required', 'resync': True, 'latest': latest}, 410
+            cursor = found[-1]['seq'] if found else since
+            return {
+                'changes': found, 'next': cursor, 'latest': latest, 'more': cursor < latest
+            }, 200
+
+    @ns.route('/changes/stream')
+    class DestinationChangeStream(Resource):
+        @ns.doc(params={
+            'since': 'Sequence number synced up to (or send Last-Event-ID)',
+        }, responses={503: 'Too many open streams; retry later'})
+        def get(self):
+            """Server-Sent Events stream of upserts and deletes"""
+            changes = repository.changes
+            try:
+                since = request.headers.get('Last-Event-ID') or request.args.get('since')
+                cursor = int(since) if since else changes.latest
+            except ValueError:
+                return {'message': 'since must be a number'}, 400
+            encode = current_app.json.dumps
+            limit = current_app.config.get('DESTINATION_MAX_STREAMS', STREAM_DEFAULT_MAX)
+            with streams_lock:
+                if streams['open'] >= limit:
+                    return {'message': 'Too many open streams, please retry later'}, 503, {
+                        'Retry-After': str(int(STREAM_KEEPALIVE_SECONDS))
+                    }
+                streams['open'] += 1
+
+            def release():
+                with streams_lock:
+                    streams['open'] -= 1
+
+            def events(cursor):
+                while True:
+                    found = changes.since(cursor, CHANGES_MAX_LIMIT)
+                    if found is None:
+                        latest = encode({'latest': changes.latest})
+                        yield f'event: resync\ndata: {latest}\n\n'
+                        return
+                    for change in found:
+                        cursor = change['seq']
+                        yield f'id: {cursor}\nevent: {change["op"]}\ndata: {encode(change)}\n\n'
+                    if not found and not changes.wait(cursor, STREAM_KEEPALIVE_SECONDS):
+                        yield ': keepalive\n\n'
+
+            response = Response(events(cursor), mimetype='text/event-stream', headers={
+                'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'
+            })
+            # Runs when the server closes the response, i.e. the client left
+            response.call_on_close(release)
+            return response
 
     @ns.route('/<string:destination_id>')
     class DestinationResource(Resource):
         @api.doc(security='Bearer Auth')
         def delete(self, destination_id):
             """Delete a destination (Admin only)"""
-            # Extract token from Authorization header
-            auth_header = request.headers.get('Authorization', '')
-            if not auth_header.startswith('Bearer '):
-                return {'message': 'Invalid authorization header'}, 401
-
-            token = auth_header.split(' ')[1]
-
-            # Validate the admin token
-            if not auth_service.validate_admin_token(token):
-                return {'message': 'Admin access required'}, 403
+            error = _admin_error(auth_service)
+            if error is not None:
+                return error
 
             # Perform the delete operation
             if repository.delete(destination_id):
                 return {'message': 'Destination deleted'}, 200
 
             return {'message': 'Destination not found'}, 404
+
+    @ns.route('/<string:destination_id>/availability')
+    class DestinationAvailability(Resource):
+        @api.doc(security='Bearer Auth')
+        def put(self, destination_id):
+            """Open or close nights of a destination (Admin only)"""
+            error = _admin_error(auth_service)
+            if error is not None:
+                return error
+
+            try:
+                data = _json_object()
+                available = data.get('available')
+                start = _date_value('from', data.get('from'))
+                end = _date_value('to', data.get('to'))
+                if not isinstance(available, bool):
+                    raise ValueError('available must be true or false')
+                if not repository.set_available(destination_id, start, end, available):
+                    return {'message': 'Destination not found'}, 404
+            except ValueError as e:
+                return {'message': str(e)}, 400
+            return {'message': 'Availability updated'}, 200
@@ -1 +1 @@
-from .auth_service import AuthService
+from .auth_service import AuthService, InProcessAuthService
@@ -0,0 +1,51 @@
+# services/async_auth_service.py
+
+import logging
+
+import httpx
+from common import tracing
+from services.auth_service import (
+    AUTH_ROUNDTRIP_SECONDS, AUTH_SOCKET, AUTH_TIMEOUT_SECONDS, AUTH_VALIDATE_URL
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuthService:
+    """
+    Non-blocking counterpart of ``AuthService`` for the ASGI app.
+
+    One ``httpx.AsyncClient`` is shared by all requests so validation
+    calls reuse pooled keep-alive connections to the auth service
+    instead of holding a thread each while they wait. With
+    ``socket_path`` the connections go over that Unix socket.
+    """
+
+    def __init__(self, url=AUTH_VALIDATE_URL, client=None, timeout=AUTH_TIMEOUT_SECONDS,
+                 socket_path=AUTH_SOCKET):
+        self.url = url
+        if client is None:
+            transport = (
+                httpx.AsyncHTTPTransport(uds=socket_path) if socket_path else None
+            )
+            client = httpx.AsyncClient(timeout=timeout, transport=transport)
+        self.client = client
+
+    async def validate_admin_token(self, token):
+        try:
+            with tracing.span('auth.validate_admin_token', kind='client'), \
+                    AUTH_ROUNDTRIP_SECONDS.time():
+                response = await self.client.get(
+                    self.url,
+                    headers=tracing.inject(
+                        {'Authorization': f'Bearer {token}'}
+                    )
+                )
+                data = response.json()
+            return data.get('role') == 'Admin'
+        except Exception as e:
+            logger.warning('Admin token validation failed: %s', e)
+            return False
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -1,18 +1,63 @@
 # services/auth_service.py
 
+import os
 import requests
+from common import metrics, tracing, uds
+
+# ``http://host:port`` or, when co-located, ``unix:/path/to/auth.sock``
+AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://localhost:5006')
+AUTH_SOCKET, _auth_base_url = uds.split_service_url(AUTH_SERVICE_URL)
+AUTH_VALIDATE_URL = f'{_auth_base_url}/auth/validate'
+# A stuck auth service must not hold a server thread indefinitely
+AUTH_TIMEOUT_SECONDS = 5.0
+
+if AUTH_SOCKET:
+    # Keep-alive connections over the socket, one per server thread
+    _http = requests.Session()
+    _http.mount(uds.SOCKET_HOST, uds.UnixSocketAdapter(
+        AUTH_SOCKET, pool_maxsize=16, timeout=AUTH_TIMEOUT_SECONDS
+    ))
+else:
+    _http = requests
+
+AUTH_ROUNDTRIP_SECONDS = metrics.histogram(
+    'auth_validation_duration_seconds',
+    'Round trip time of token validation calls to the auth service'
+)
 
 
 class AuthService:
     @staticmethod
     def validate_admin_token(token):
         try:
-            response = requests.get(
-                'http://localhost:5006/auth/validate',
-                headers={'Authorization': f'Bearer {token}'}
-            )
-            data = response.json()
+            with tracing.span('auth.validate_admin_token', kind='client'), \
+                    AUTH_ROUNDTRIP_SECONDS.time():
+                response = _http.get(
+                    AUTH_VALIDATE_URL,
+                    headers=tracing.inject(
+                        {'Authorization': f'Bearer {token}'}
+                    ),
+                    timeout=AUTH_TIMEOUT_SECONDS
+                )
+                data = response.json()
             return data.get('role') == 'Admin'
         except Exception as e:
             print("Error:", e)
             return False
+
+
+class InProcessAuthService(AuthService):
+    """
+    ``AuthService`` for an auth service running in the same process (the
+    monolith entry point): tokens are checked by a direct call instead of
+    an HTTP round trip.
+    """
+
+    def __init__(self, validate_token):
+        # Maps a token to its decoded data, or None if it is invalid
+        self._validate_token = validate_token
+
+    def validate_admin_token(self, token):
+        with tracing.span('auth.validate_admin_token'):
+            data = self._validate_token(token)
+        return data is not None and data.get('role') == 'Admin'
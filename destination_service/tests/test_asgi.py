@@ -0,0 +1,195 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from flask import Flask
+from flask_restx import Api
+from asgi import create_asgi_app
+from models.destination_repository import DestinationRepository
+from routes.destination_routes import register_destination_routes
+
+
+class FakeAsyncAuthService:
+    def __init__(self, is_admin=True):
+        self.is_admin = is_admin
+        self.tokens = []
+        self.closed = False
+
+    async def validate_admin_token(self, token):
+        self.tokens.append(token)
+        return self.is_admin
+
+    async def aclose(self):
+        self.closed = True
+
+
+def call(app, method, path, headers=None):
+    """Drive one HTTP request through the ASGI app"""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [
+            (key.lower().encode(), value.encode())
+            for key, value in (headers or {}).items()
+        ],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, body = messages
+    return start['status'], dict(start['headers']), body['body']
+
+
+class TestDestinationASGIApp(unittest.TestCase):
+    def setUp(self):
+        self.repository = DestinationRepository()
+        self.auth_service = FakeAsyncAuthService()
+        self.app = create_asgi_app(self.repository, self.auth_service)
+
+    def test_get_all_destinations(self):
+        """Test the listing matches the repository contents."""
+        status, headers, body = call(self.app, 'GET', '/destinations/')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        self.assertEqual(json.loads(body), self.repository.get_all())
+
+    def test_get_destinations_with_fields(self):
+        """Test ?fields= limits each record and rejects unknown fields."""
+        status, _, body = call(self.app, 'GET', '/destinations/?fields=id,location')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), [
+            {'id': '1', 'location': 'Maldives'},
+            {'id': '2', 'location': 'Japan'},
+        ])
+        status, _, body = call(self.app, 'GET', '/destinations/?fields=id,secret')
+        self.assertEqual(status, 400)
+        self.assertIn('secret', json.loads(body)['message'])
+
+    def test_listing_matches_flask_app(self):
+        """Test location, sort and limit filter and validate as in the Flask app."""
+        self.repository.add({'id': '3', 'name': 'Kyoto Inn', 'location': 'Japan',
+                             'price_per_night': 90.0})
+        flask_app = Flask(__name__)
+        register_destination_routes(Api(flask_app), repository=self.repository,
+                                    auth_service=self.auth_service)
+        client = flask_app.test_client()
+        for query in ['location=Japan', 'sort=price', 'sort=-price&limit=2',
+                      'location=Japan&sort=price&limit=1&fields=id',
+                      'sort=name', 'limit=0', 'limit=x']:
+            expected = client.get(f'/destinations/?{query}')
+            status, _, body = call(self.app, 'GET', f'/destinations/?{query}')
+            self.assertEqual(status, expected.status_code, query)
+            self.assertEqual(json.loads(body), expected.json, query)
+
+    def test_delete_destination_as_admin(self):
+        """Test an admin can delete an existing destination."""
+        status, _, body = call(self.app, 'DELETE', '/destinations/1',
+                               {'Authorization': 'Bearer admin_token'})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {'message': 'Destination deleted'})
+        self.assertEqual(self.auth_service.tokens, ['admin_token'])
+        self.assertNotIn('1', self.repository.destinations)
+
+        status, _, _ = call(self.app, 'DELETE', '/destinations/1',
+                            {'Authorization': 'Bearer admin_token'})
+        self.assertEqual(status, 404)
+
+    def test_delete_requires_bearer_header(self):
+        """Test a missing Authorization header is rejected before validation."""
+        status, _, body = call(self.app, 'DELETE', '/destinations/1')
+        self.assertEqual(status, 401)
+        self.assertEqual(json.loads(body), {'message': 'Invalid authorization header'})
+        self.assertEqual(self.auth_service.tokens, [])
+
+    def test_delete_requires_admin(self):
+        """Test a non-admin token cannot delete."""
+        self.auth_service.is_admin = False
+        status, _, body = call(self.app, 'DELETE', '/destinations/1',
+                               {'Authorization': 'Bearer user_token'})
+        self.assertEqual(status, 403)
+        self.assertEqual(json.loads(body), {'message': 'Admin access required'})
+        self.assertIn('1', self.repository.destinations)
+
+    def test_unknown_routes_and_methods(self):
+        """Test unknown paths get 404 and unsupported methods 405."""
+        self.assertEqual(call(self.app, 'GET', '/unknown')[0], 404)
+        self.assertEqual(call(self.app, 'POST', '/destinations/')[0], 405)
+        self.assertEqual(call(self.app, 'GET', '/destinations/1')[0], 405)
+
+    def test_metrics_endpoint(self):
+        """Test request metrics are recorded and exposed."""
+        call(self.app, 'GET', '/destinations/')
+        status, _, body = call(self.app, 'GET', '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn(
+            'endpoint="destinations_destination_list"', body.decode()
+        )
+
+    def test_lifespan_closes_auth_client(self):
+        """Test shutdown closes the shared auth client."""
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(self.app({'type': 'lifespan'}, receive, send))
+        self.assertEqual(
+            sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+        )
+        self.assertTrue(self.auth_service.closed)
+
+
+class TestPersistentASGIApp(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        class Config:
+            DESTINATION_DATA_DIR = self.directory.name
+            DESTINATION_COMPACT_EVERY = 100000
+            DESTINATION_JOURNAL_FSYNC = False
+
+        self.config = Config
+
+    def shutdown(self, app):
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            pass
+
+        asyncio.run(app({'type': 'lifespan'}, receive, send))
+
+    def test_data_dir_keeps_deletes_across_restarts(self):
+        """Test the ASGI app journals to and recovers from DESTINATION_DATA_DIR."""
+        app = create_asgi_app(auth_service=FakeAsyncAuthService(), config=self.config)
+        self.assertIsNotNone(app.repository.store)
+        status, _, _ = call(
+            app, 'DELETE', '/destinations/1', {'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(status, 200)
+        self.shutdown(app)
+
+        app = create_asgi_app(auth_service=FakeAsyncAuthService(), config=self.config)
+        self.addCleanup(app.store.close)
+        _, _, body = call(app, 'GET', '/destinations/')
+        self.assertNotIn('1', [d['id'] for d in json.loads(body)])
+
+
+if __name__ == '__main__':
+    unittest.main()
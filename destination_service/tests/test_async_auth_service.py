@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+import httpx
+from services.async_auth_service import AsyncAuthService
+from services.auth_service import AUTH_VALIDATE_URL
+
+
+def _service(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncAuthService(client=client)
+
+
+class TestAsyncAuthService(unittest.TestCase):
+    def test_validate_admin_token_success(self):
+        """Test an Admin role from the auth service validates the token."""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={'role': 'Admin'})
+
+        service = _service(handler)
+        self.assertTrue(asyncio.run(service.validate_admin_token('admin_token')))
+        self.assertEqual(str(seen[0].url), AUTH_VALIDATE_URL)
+        self.assertEqual(seen[0].headers['Authorization'], 'Bearer admin_token')
+
+    def test_validate_admin_token_non_admin(self):
+        """Test a non-admin role is rejected."""
+        service = _service(lambda request: httpx.Response(200, json={'role': 'User'}))
+        self.assertFalse(asyncio.run(service.validate_admin_token('user_token')))
+
+    def test_validate_admin_token_invalid_token(self):
+        """Test an auth service error response is rejected."""
+        service = _service(
+            lambda request: httpx.Response(401, json={'message': 'Invalid token'})
+        )
+        self.assertFalse(asyncio.run(service.validate_admin_token('bad')))
+
+    def test_validate_admin_token_exception(self):
+        """Test connection failures are reported as not admin."""
+        def handler(request):
+            raise httpx.ConnectError('Connection error')
+
+        service = _service(handler)
+        self.assertFalse(asyncio.run(service.validate_admin_token('any')))
+
+    def test_validate_admin_token_over_unix_socket(self):
+        """Test validation calls can go over a Unix domain socket."""
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({'role': 'Admin'}).encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, 'auth.sock')
+            server = socketserver.UnixStreamServer(socket_path, Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                service = AsyncAuthService(
+                    url='http://localhost/auth/validate', socket_path=socket_path
+                )
+                self.assertTrue(asyncio.run(service.validate_admin_token('token')))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import patch
-from services.auth_service import AuthService
+from common import tracing
+from services.auth_service import (
+    AUTH_TIMEOUT_SECONDS, AuthService, InProcessAuthService
+)
 
 
 class TestAuthService(unittest.TestCase):
@@ -18,7 +21,8 @@ class TestAuthService(unittest.TestCase):
         self.assertTrue(is_admin)
         mock_get.assert_called_once_with(
             'http://localhost:5006/auth/validate',
-            headers={'Authorization': f'Bearer {token}'}
+            headers={'Authorization': f'Bearer {token}'},
+            timeout=AUTH_TIMEOUT_SECONDS
         )
 
     @patch('services.auth_service.requests.get')
@@ -34,7 +38,8 @@ class TestAuthService(unittest.TestCase):
         self.assertFalse(is_admin)
         mock_get.assert_called_once_with(
             'http://localhost:5006/auth/validate',
-            headers={'Authorization': f'Bearer {token}'}
+            headers={'Authorization': f'Bearer {token}'},
+            timeout=AUTH_TIMEOUT_SECONDS
         )
 
     @patch('services.auth_service.requests.get')
@@ -50,7 +55,8 @@ class TestAuthService(unittest.TestCase):
         self.assertFalse(is_admin)
         mock_get.assert_called_once_with(
             'http://localhost:5006/auth/validate',
-            headers={'Authorization': f'Bearer {token}'}
+            headers={'Authorization': f'Bearer {token}'},
+            timeout=AUTH_TIMEOUT_SECONDS
         )
 
     @patch('services.auth_service.requests.get')
@@ -65,9 +71,44 @@ class TestAuthService(unittest.TestCase):
         self.assertFalse(is_admin)
         mock_get.assert_called_once_with(
             'http://localhost:5006/auth/validate',
-            headers={'Authorization': f'Bearer {token}'}
+            headers={'Authorization': f'Bearer {token}'},
+            timeout=AUTH_TIMEOUT_SECONDS
         )
 
+    @patch('services.auth_service.requests.get')
+    def test_validate_admin_token_propagates_trace(self, mock_get):
+        """Test the active trace context is sent to the auth service."""
+        mock_get.return_value.json.return_value = {'role': 'Admin'}
+        previous = tracing.get_exporter()
+        exporter = tracing.InMemoryExporter()
+        tracing.set_exporter(exporter)
+        try:
+            with tracing.span('request') as parent:
+                AuthService.validate_admin_token("token")
+        finally:
+            tracing.set_exporter(previous)
+
+        client_span = exporter.spans[0]
+        self.assertEqual(client_span.kind, 'client')
+        self.assertEqual(client_span.parent_id, parent.context.span_id)
+        _, kwargs = mock_get.call_args
+        self.assertEqual(
+            kwargs['headers']['traceparent'],
+            tracing.format_traceparent(client_span.context)
+        )
+
+
+    @patch('services.auth_service.requests.get')
+    def test_in_process_validation(self, mock_get):
+        """Test the in-process variant calls the validator instead of the auth service."""
+        tokens = {'admin': {'role': 'Admin'}, 'user': {'role': 'User'}}
+        auth_service = InProcessAuthService(tokens.get)
+
+        self.assertTrue(auth_service.validate_admin_token('admin'))
+        self.assertFalse(auth_service.validate_admin_token('user'))
+        self.assertFalse(auth_service.validate_admin_token('expired'))
+        mock_get.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
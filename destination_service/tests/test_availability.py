@@ -0,0 +1,113 @@
+import random
+import unittest
+from datetime import date, timedelta
+
+from models.availability import AvailabilityCalendar
+
+TODAY = date(2026, 6, 1)
+
+
+class TestAvailabilityCalendar(unittest.TestCase):
+    def setUp(self):
+        self.today = TODAY
+        self.calendar = AvailabilityCalendar(days=60, today=lambda: self.today,
+                                             capacity=64)
+        for destination_id in ['a', 'b', 'c']:
+            self.calendar.add(destination_id)
+
+    def test_new_destinations_are_free(self):
+        """Test every night is open until it is booked."""
+        self.assertEqual(
+            self.calendar.available(date(2026, 6, 3), date(2026, 6, 10)), ['a', 'b', 'c']
+        )
+
+    def test_booking_excludes_overlapping_stays(self):
+        """Test a closed night hides the destination for stays covering it."""
+        self.calendar.set_available('b', date(2026, 6, 5), date(2026, 6, 7), False)
+        self.assertEqual(
+            self.calendar.available(date(2026, 6, 3), date(2026, 6, 10)), ['a', 'c']
+        )
+        # Checking out on the first closed night is fine
+        self.assertEqual(
+            self.calendar.available(date(2026, 6, 3), date(2026, 6, 5)), ['a', 'b', 'c']
+        )
+        self.assertFalse(self.calendar.is_available('b', date(2026, 6, 6), date(2026, 6, 7)))
+        self.calendar.set_available('b', date(2026, 6, 5), date(2026, 6, 7), True)
+        self.assertTrue(self.calendar.is_available('b', date(2026, 6, 3), date(2026, 6, 10)))
+
+    def test_rejects_ranges_outside_window(self):
+        """Test empty, past and beyond-horizon ranges are rejected."""
+        for start, end in [
+            (date(2026, 6, 5), date(2026, 6, 5)),
+            (date(2026, 5, 30), date(2026, 6, 2)),
+            (date(2026, 7, 20), date(2026, 8, 5)),
+        ]:
+            with self.assertRaises(ValueError):
+                self.calendar.available(start, end)
+
+    def test_window_slides_with_today(self):
+        """Test bookings move with their dates and new nights open up."""
+        self.calendar.set_available('a', date(2026, 6, 20), date(2026, 6, 21), False)
+        self.calendar.set_available('a', date(2026, 7, 30), date(2026, 7, 31), False)
+        self.today = TODAY + timedelta(days=10)
+        self.assertEqual(self.calendar.start, TODAY)
+        self.assertEqual(
+            self.calendar.available(date(2026, 6, 19), date(2026, 6, 22)), ['b', 'c']
+        )
+        self.assertEqual(self.calendar.end, date(2026, 8, 10))
+        self.assertEqual(
+            self.calendar.available(date(2026, 8, 1), date(2026, 8, 10)), ['a', 'b', 'c']
+        )
+        self.assertFalse(self.calendar.is_available('a', date(2026, 7, 30), date(2026, 7, 31)))
+
+    def test_slots_are_reused_and_grown(self):
+        """Test removed destinations free their bit and the bitmap grows."""
+        self.calendar.set_available('b', date(2026, 6, 1), date(2026, 7, 31), False)
+        self.calendar.remove('b')
+        self.calendar.add('d')
+        self.assertEqual(
+            self.calendar.available(date(2026, 6, 1), date(2026, 6, 2)), ['a', 'd', 'c']
+        )
+        for i in range(200):
+            self.calendar.add(f'x{i}')
+        self.assertEqual(len(self.calendar.available(date(2026, 6, 1), date(2026, 6, 2))), 203)
+
+    def test_matches_brute_force(self):
+        """Test bitmap intersection equals a per-destination check."""
+        rng = random.Random(7)
+        calendar = AvailabilityCalendar(days=90, today=lambda: TODAY, capacity=64)
+        booked = {}
+        for i in range(300):
+            calendar.add(str(i))
+            booked[str(i)] = set()
+            for _ in range(rng.randrange(4)):
+                first = rng.randrange(90)
+                nights = rng.randint(1, 10)
+                end = min(90, first + nights)
+                calendar.set_available(str(i), TODAY + timedelta(days=first),
+                                       TODAY + timedelta(days=end), False)
+                booked[str(i)].update(range(first, end))
+        for _ in range(50):
+            first = rng.randrange(89)
+            last = rng.randint(first + 1, min(90, first + 14))
+            expected = [i for i in booked if not booked[i] & set(range(first, last))]
+            self.assertEqual(
+                calendar.available(TODAY + timedelta(days=first), TODAY + timedelta(days=last)),
+                expected
+            )
+
+
+    def test_remove_many(self):
+        """Test removing several destinations clears them in one pass and frees their slots."""
+        self.calendar.set_available('b', date(2026, 6, 5), date(2026, 6, 7), False)
+        self.calendar.remove_many(['a', 'x', 'c'])
+        self.assertEqual(self.calendar.available(date(2026, 6, 1), date(2026, 6, 3)), ['b'])
+        self.assertEqual(len(self.calendar), 1)
+        self.calendar.add('d')
+        self.calendar.add('e')
+        self.assertEqual(
+            sorted(self.calendar.available(date(2026, 6, 3), date(2026, 6, 10))), ['d', 'e']
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from models.catalogue_store import CatalogueStore
+from models.destination_repository import DestinationRepository
+
+
+class TestCatalogueStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def open(self, **options):
+        store = CatalogueStore(self.directory, **options)
+        self.stores.append(store)
+        return DestinationRepository(store=store), store
+
+    def test_seeds_only_an_empty_store(self):
+        """Test the sample destinations are written once and not re-added."""
+        repository, _ = self.open()
+        repository.delete('1')
+        recovered, _ = self.open()
+        self.assertEqual([d['id'] for d in recovered.get_all()], ['2'])
+
+    def test_journal_replay(self):
+        """Test upserts, single and batch deletes, repricing and bookings survive a restart."""
+        repository, _ = self.open()
+        repository.add({'id': '3', 'name': 'Louvre Suites', 'location': 'France',
+                        'price_per_night': 320.0, 'latitude': 48.86, 'longitude': 2.34})
+        repository.add({'id': '2', 'name': 'Tokyo Bay Hotel', 'location': 'Japan',
+                        'price_per_night': 260.0})
+        repository.delete('1')
+        repository.add({'id': '4', 'name': 'Versailles Inn', 'price_per_night': 180.0})
+        repository.delete_many(['4', '9'])
+        repository.reprice(10, location='France')
+        start = date.today() + timedelta(days=3)
+        repository.set_available('3', start, start + timedelta(days=2), False)
+
+        recovered, _ = self.open()
+        self.assertEqual(recovered.get_all(), repository.get_all())
+        self.assertEqual(recovered.stats(), repository.stats())
+        self.assertEqual(recovered.suggest('tokyo'), repository.suggest('tokyo'))
+        self.assertEqual(recovered.near(48.86, 2.34, 10, fields=('id',))[0]['id'], '3')
+        self.assertEqual(
+            [d['id'] for d in recovered.available(start, start + timedelta(days=1))], ['2']
+        )
+
+    def test_snapshot_then_journal(self):
+        """Test recovery loads the snapshot and replays the changes after it."""
+        repository, store = self.open(compact_every=10 ** 6)
+        for number in range(3, 20):
+            repository.add({'id': str(number), 'name': f'Hotel {number}',
+                            'location': 'Spain' if number % 2 else 'Italy',
+                            'price_per_night': float(number * 10)})
+        start = date.today() + timedelta(days=1)
+        repository.set_available('5', start, start + timedelta(days=1), False)
+        generation = store.compact()
+        repository.delete('7')
+        repository.reprice(-50)
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ['CURRENT', f'journal-{generation}.log', f'snapshot-{generation}.availability.npy',
+             f'snapshot-{generation}.json', f'snapshot-{generation}.prices.npy']
+        )
+        recovered, _ = self.open()
+        self.assertEqual(recovered.get_all(), repository.get_all())
+        self.assertEqual(recovered.stats(), repository.stats())
+        self.assertEqual(recovered.get_all(('id',), location='Spain', sort='-price', limit=3),
+                         [{'id': '19'}, {'id': '17'}, {'id': '15'}])
+        self.assertNotIn('5', [d['id'] for d in recovered.available(start, start + timedelta(days=1))])
+        # Later writes keep their catalogue order after the restored ones
+        recovered.add({'id': '30', 'name': 'Hotel 30', 'location': 'Spain',
+                       'price_per_night': 9.5})
+        self.assertEqual(recovered.get_all(('id',))[-1], {'id': '30'})
+
+    def test_torn_tail_is_dropped(self):
+        """Test a partially written last entry is discarded on recovery."""
+        repository, store = self.open()
+        repository.add({'id': '3', 'name': 'Louvre Suites', 'price_per_night': 320.0})
+        store.close()
+        path = os.path.join(self.directory, f'journal-{store.journal_generation}.log')
+        size = os.path.getsize(path)
+        with open(path, 'ab') as journal:
+            journal.write(b'{"op": "delete", "id": "3"')
+
+        recovered, _ = self.open()
+        self.assertEqual([d['id'] for d in recovered.get_all()], ['1', '2', '3'])
+        self.assertEqual(os.path.getsize(path), size)
+
+    def test_corruption_before_the_newest_journal_fails(self):
+        """Test a bad entry in an older journal or mid-journal is not skipped."""
+        repository, store = self.open()
+        repository.add({'id': '3', 'name': 'Louvre Suites', 'price_per_night': 320.0})
+        store.close()
+        older = os.path.join(self.directory, f'journal-{store.journal_generation}.log')
+        with open(older, 'ab') as journal:
+            journal.write(b'{"op": "delete", "id": "3"')
+        newer = os.path.join(self.directory, f'journal-{store.journal_generation + 1}.log')
+        with open(newer, 'wb') as journal:
+            journal.write(b'{"op": "delete", "id": "1"}\n')
+        with self.assertRaises(ValueError):
+            self.open()
+
+        os.remove(newer)
+        with open(older, 'ab') as journal:
+            journal.write(b'\n{"op": "delete", "id": "1"}\n')
+        with self.assertRaises(ValueError):
+            self.open()
+
+    def test_background_compaction(self):
+        """Test the journal is compacted once it reaches compact_every entries."""
+        repository, store = self.open(compact_every=5)
+        for number in range(3, 9):
+            repository.add({'id': str(number), 'name': f'Hotel {number}',
+                            'price_per_night': 100.0})
+        store.close()
+        self.assertGreater(store.snapshot_generation, 0)
+        recovered, _ = self.open()
+        self.assertEqual(len(recovered.get_all()), 8)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork')
+    def test_recycled_worker_reloads_before_writing(self):
+        """Test a worker forked after another one wrote keeps those writes."""
+        master, store = self.open()
+        pid = os.fork()
+        if pid == 0:  # First worker: writes and compacts, then exits
+            status = 1
+            try:
+                master.reload()
+                for number in range(3, 8):
+                    master.add({'id': str(number), 'name': f'Hotel {number}',
+                                'price_per_night': 100.0})
+                master.delete('1')
+                store.compact()
+                store.close()
+                status = 0
+            finally:
+                os._exit(status)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(status, 0)
+
+        # Recycled worker, forked from the master's boot-time state
+        master.reload()
+        self.assertEqual([d['id'] for d in master.get_all()],
+                         ['2', '3', '4', '5', '6', '7'])
+        master.add({'id': '8', 'name': 'Hotel 8', 'price_per_night': 80.0})
+        store.compact()
+        recovered, _ = self.open()
+        self.assertEqual([d['id'] for d in recovered.get_all()],
+                         ['2', '3', '4', '5', '6', '7', '8'])
+
+
+if __name__ == '__main__':
+    unittest.main()
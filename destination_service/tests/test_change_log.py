@@ -0,0 +1,52 @@
+import threading
+import unittest
+
+from models.change_log import ChangeLog
+
+
+class TestChangeLog(unittest.TestCase):
+    def setUp(self):
+        self.log = ChangeLog(capacity=3, clock=lambda: 1.0)
+        self.start = self.log.latest
+
+    def test_changes_after_a_cursor(self):
+        """Test changes come back oldest first, from the cursor on."""
+        self.log.record('upsert', 'a', {'id': 'a'})
+        self.log.record('delete', 'b')
+        self.assertEqual([c['id'] for c in self.log.since(self.start)], ['a', 'b'])
+        self.assertEqual(self.log.since(self.start + 1),
+                         [{'seq': self.start + 2, 'op': 'delete', 'id': 'b'}])
+        self.assertEqual(self.log.since(self.log.latest), [])
+        self.assertEqual(len(self.log.since(self.start, limit=1)), 1)
+
+    def test_dropped_changes_require_resync(self):
+        """Test cursors older than the ring buffer, from the future or before a reset resync."""
+        for destination_id in 'abcd':
+            self.log.record('delete', destination_id)
+        self.assertIsNone(self.log.since(self.start))
+        self.assertEqual([c['id'] for c in self.log.since(self.start + 1)], ['b', 'c', 'd'])
+        self.assertIsNone(self.log.since(self.log.latest + 1))
+        cursor = self.log.latest
+        self.log.reset()
+        self.assertIsNone(self.log.since(cursor))
+        self.assertEqual(self.log.since(self.log.latest), [])
+
+    def test_sequences_continue_across_restarts(self):
+        """Test a new log starts after every sequence of an older one."""
+        for destination_id in 'ab':
+            self.log.record('delete', destination_id)
+        restarted = ChangeLog(clock=lambda: 2.0)
+        self.assertGreater(restarted.latest, self.log.latest)
+        self.assertIsNone(restarted.since(self.log.latest))
+
+    def test_wait_wakes_on_record(self):
+        """Test a waiting reader is woken by the next change."""
+        timer = threading.Timer(0.05, self.log.record, ('delete', 'a'))
+        timer.start()
+        self.assertTrue(self.log.wait(self.start, timeout=5))
+        self.assertFalse(self.log.wait(self.log.latest, timeout=0.01))
+        timer.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
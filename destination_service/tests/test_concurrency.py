@@ -0,0 +1,103 @@
+import random
+import threading
+import unittest
+from datetime import date, timedelta
+
+from models.destination_repository import DestinationRepository
+
+WRITERS = 4
+READERS = 4
+
+
+def destination(number):
+    # The price is derivable from the name, so torn records are detectable
+    return {'id': f'd{number}', 'name': f'Hotel {number}', 'location': f'L{number % 5}',
+            'price_per_night': float(number), 'latitude': number % 80,
+            'longitude': number % 170}
+
+
+class TestDestinationRepositoryConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.repository = DestinationRepository()
+        self.errors = []
+
+    def start(self, target, *args):
+        def guarded():
+            try:
+                target(*args)
+            except Exception as e:  # pragma: no cover - reported by the test
+                self.errors.append(e)
+
+        thread = threading.Thread(target=guarded)
+        thread.start()
+        return thread
+
+    def check_records(self, records):
+        for record in records:
+            if record['id'].startswith('d'):
+                self.assertEqual(record['name'], f'Hotel {int(record["price_per_night"])}')
+
+    def test_reads_during_writes_are_consistent(self):
+        """Test lock-free reads never fail or see a half-applied write."""
+        done = threading.Event()
+        start = date.today() + timedelta(days=1)
+        end = start + timedelta(days=2)
+
+        def write(offset):
+            rng = random.Random(offset)
+            for step in range(1000):
+                number = offset + WRITERS * rng.randrange(100)
+                if step % 3:
+                    self.repository.add(destination(number))
+                else:
+                    self.repository.delete(f'd{number}')
+                if step % 50 == 0:
+                    self.repository.delete_many([f'd{offset + WRITERS * n}' for n in range(5)])
+
+        def read():
+            while not done.is_set():
+                self.check_records(self.repository.get_all())
+                self.check_records(self.repository.get_all(location='L1', sort='price', limit=5))
+                self.check_records(self.repository.near(10, 10, 2000, limit=20))
+                self.check_records(self.repository.available(start, end))
+                self.repository.suggest('hotel 1', limit=5, max_edits=1)
+                stats = self.repository.stats()['overall']
+                if stats['count']:
+                    self.assertLessEqual(stats['min_price'], stats['max_price'])
+
+        readers = [self.start(read) for _ in range(READERS)]
+        for writer in [self.start(write, offset) for offset in range(WRITERS)]:
+            writer.join()
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(self.errors, [])
+        # After the dust settles every structure agrees with the records
+        records = self.repository.get_all()
+        self.check_records(records)
+        self.assertEqual(self.repository.stats()['overall']['count'], len(records))
+        self.assertEqual(len(self.repository.prices), len(records))
+        self.assertEqual(len(self.repository.availability), len(records))
+
+    def test_concurrent_deletes_have_one_winner(self):
+        """Test racing deletes of one destination succeed exactly once."""
+        for number in range(50):
+            self.repository.add(destination(number))
+        barrier = threading.Barrier(8)
+        results = []
+
+        def delete():
+            barrier.wait()
+            for number in range(50):
+                results.append(self.repository.delete(f'd{number}') is not None)
+            results.extend(self.repository.delete_many(['1', '2']))
+
+        for thread in [self.start(delete) for _ in range(8)]:
+            thread.join()
+        self.assertEqual(self.errors, [])
+        self.assertEqual(results.count(True), 52)
+        self.assertEqual(self.repository.get_all(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+
+from models.currency import RateTable
+
+
+class TestRateTable(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self._write({'base': 'USD', 'rates': {'EUR': 0.86}})
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, data, mtime=None):
+        with open(self.path, 'w') as rates_file:
+            json.dump(data, rates_file)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_rates_are_case_insensitive_and_include_base(self):
+        """Test lookups ignore case and the base currency is always 1."""
+        rates = RateTable(self.path)
+        self.assertEqual(rates.rate('eur'), 0.86)
+        self.assertEqual(rates.rate('USD'), 1.0)
+        with self.assertRaises(ValueError):
+            rates.rate('XYZ')
+
+    def test_reloads_when_file_changes(self):
+        """Test a changed file is picked up once the check interval passes."""
+        rates = RateTable(self.path, check_interval=0)
+        self.assertEqual(rates.rate('EUR'), 0.86)
+        self._write({'base': 'USD', 'rates': {'EUR': 0.9}}, mtime=1)
+        self.assertEqual(rates.rate('EUR'), 0.9)
+
+        cached = RateTable(self.path, check_interval=3600)
+        cached.rate('EUR')
+        self._write({'base': 'USD', 'rates': {'EUR': 0.5}}, mtime=2)
+        self.assertEqual(cached.rate('EUR'), 0.9)
+
+    def test_unreadable_file_keeps_last_rates(self):
+        """Test a broken file does not wipe the cached table."""
+        rates = RateTable(self.path, check_interval=0)
+        rates.rate('EUR')
+        with open(self.path, 'w') as rates_file:
+            rates_file.write('{not json')
+        os.utime(self.path, (3, 3))
+        self.assertEqual(rates.rate('EUR'), 0.86)
+
+    def test_invalid_rates_are_rejected(self):
+        """Test a table with a non-positive or non-finite rate is not loaded."""
+        rates = RateTable(self.path, check_interval=0)
+        rates.rate('EUR')
+        for mtime, bad in enumerate([0, -1.5, 'NaN', 'Infinity'], start=4):
+            self._write({'base': 'USD', 'rates': {'EUR': 0.9, 'GBP': bad}}, mtime=mtime)
+            self.assertEqual(rates.rate('EUR'), 0.86, bad)
+            with self.assertRaises(ValueError):
+                rates.rate('GBP')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+from models.change_log import ChangeLog
 from models.destination_repository import DestinationRepository
 
 
@@ -27,6 +30,134 @@ class TestDestinationRepository(unittest.TestCase):
         ]
         self.assertEqual(self.repo.get_all(), expected_destinations)
 
+    def test_get_all_with_fields(self):
+        """Test a projection returns only the requested fields."""
+        self.assertEqual(
+            self.repo.get_all(('id', 'price_per_night')),
+            [
+                {'id': '1', 'price_per_night': 500.00},
+                {'id': '2', 'price_per_night': 250.00},
+            ]
+        )
+
+    def test_add_and_find_near(self):
+        """Test destinations with coordinates are found nearest first."""
+        self.repo.add({'id': '3', 'name': 'Louvre Suites', 'location': 'France',
+                       'price_per_night': 320.0, 'latitude': 48.86, 'longitude': 2.34})
+        self.repo.add({'id': '4', 'name': 'Versailles Inn', 'location': 'France',
+                       'price_per_night': 180.0, 'latitude': 48.80, 'longitude': 2.13})
+        near = self.repo.near(48.8566, 2.3522, 50, fields=('id',))
+        self.assertEqual([d['id'] for d in near], ['3', '4'])
+        self.assertLess(near[0]['distance_km'], near[1]['distance_km'])
+        self.assertEqual(set(near[0]), {'id', 'distance_km'})
+
+        self.repo.delete('3')
+        self.assertEqual([d['id'] for d in self.repo.near(48.8566, 2.3522, 50)], ['4'])
+
+    def test_add_rejects_partial_coordinates(self):
+        """Test a destination needs both coordinates or neither."""
+        with self.assertRaises(ValueError):
+            self.repo.add({'id': '5', 'latitude': 10.0})
+        self.assertNotIn('5', self.repo.destinations)
+
+    def test_stats_follow_adds_and_deletes(self):
+        """Test price stats are kept current without scanning records."""
+        self.assertEqual(self.repo.stats()['overall'], {
+            'count': 2, 'min_price': 250.0, 'max_price': 500.0, 'avg_price': 375.0
+        })
+        self.repo.add({'id': '3', 'name': 'Kyoto Ryokan', 'location': 'Japan',
+                       'price_per_night': 150.0})
+        self.repo.add({'id': '2', 'name': 'Tokyo City Hotel', 'location': 'Japan',
+                       'price_per_night': 270.0})
+        self.assertEqual(self.repo.stats('Japan'), {
+            'count': 2, 'min_price': 150.0, 'max_price': 270.0, 'avg_price': 210.0
+        })
+        self.repo.delete('1')
+        self.assertIsNone(self.repo.stats('Maldives'))
+        self.assertEqual(self.repo.stats()['overall']['max_price'], 270.0)
+
+    def test_get_all_in_currency(self):
+        """Test prices are converted with the rate table and labelled."""
+        rates = MagicMock()
+        rates.rate.return_value = 0.5
+        repo = DestinationRepository(rates=rates)
+        self.assertEqual(
+            repo.get_all(('id', 'price_per_night'), currency='eur'),
+            [
+                {'id': '1', 'price_per_night': 250.0, 'currency': 'EUR'},
+                {'id': '2', 'price_per_night': 125.0, 'currency': 'EUR'},
+            ]
+        )
+        self.assertEqual(repo.get_all(('id',), currency='EUR'), [{'id': '1'}, {'id': '2'}])
+        rates.rate.assert_called_with('EUR')
+
+    def test_reprice_updates_prices_and_stats(self):
+        """Test bulk repricing changes listed prices and rebuilds stats."""
+        self.assertEqual(self.repo.reprice(10, 'Japan'), 1)
+        self.assertEqual(
+            [d['price_per_night'] for d in self.repo.get_all()], [500.0, 275.0]
+        )
+        self.assertEqual(self.repo.stats('Japan')['max_price'], 275.0)
+        self.assertEqual(self.repo.reprice(-20), 2)
+        self.assertEqual(self.repo.stats()['overall'], {
+            'count': 2, 'min_price': 220.0, 'max_price': 400.0, 'avg_price': 310.0
+        })
+        self.assertEqual(self.repo.delete('2')['price_per_night'], 220.0)
+        self.assertEqual(self.repo.stats()['overall']['count'], 1)
+        with self.assertRaises(ValueError):
+            self.repo.reprice(-100)
+
+    def test_suggest_follows_updates(self):
+        """Test renamed and deleted destinations leave the suggestions."""
+        self.assertEqual(self.repo.suggest('tok')[0]['text'], 'Tokyo City Hotel')
+        self.repo.add({'id': '2', 'name': 'Shinjuku Hotel', 'location': 'Japan',
+                       'price_per_night': 250.0})
+        self.assertEqual(self.repo.suggest('tok'), [])
+        self.assertEqual(self.repo.suggest('shin')[0]['text'], 'Shinjuku Hotel')
+        self.repo.delete('2')
+        self.assertEqual(self.repo.suggest('japan'), [])
+
+    def test_available_keeps_bookings_across_updates(self):
+        """Test closed nights survive an update and availability follows deletes."""
+        start = date.today() + timedelta(days=30)
+        end = start + timedelta(days=7)
+        self.assertTrue(self.repo.set_available('1', start, start + timedelta(days=2), False))
+        self.repo.add({'id': '1', 'name': 'Maldives Resort', 'location': 'Maldives',
+                       'price_per_night': 550.0})
+        self.assertEqual(self.repo.available(start, end, ('id',)), [{'id': '2'}])
+        self.repo.delete('2')
+        self.assertEqual(self.repo.available(start, end), [])
+        self.assertFalse(self.repo.set_available('2', start, end, True))
+
+    def test_sorted_by_price(self):
+        """Test cheapest-first listings per location and overall follow updates."""
+        for i, (location, price) in enumerate(
+                [('Japan', 150.0), ('Japan', 400.0), ('Japan', 250.0), ('France', 90.0)]):
+            self.repo.add({'id': f'n{i}', 'name': f'N{i}', 'location': location,
+                           'price_per_night': price})
+
+        def ids(**kwargs):
+            return [d['id'] for d in self.repo.get_all(('id',), **kwargs)]
+
+        self.assertEqual(ids(location='Japan', sort='price', limit=3), ['n0', '2', 'n2'])
+        self.assertEqual(ids(location='Japan', sort='-price', limit=2), ['n1', '2'])
+        self.assertEqual(ids(sort='price', limit=2), ['n3', 'n0'])
+        self.assertEqual(ids(sort='-price'), ['1', 'n1', '2', 'n2', 'n0', 'n3'])
+        self.assertEqual(ids(location='Japan', limit=2), ['2', 'n0'])
+
+        self.repo.delete('n0')
+        self.repo.add({'id': '2', 'name': 'Tokyo City Hotel', 'location': 'Japan',
+                       'price_per_night': 500.0})
+        self.assertEqual(ids(location='Japan', sort='price', limit=2), ['n2', 'n1'])
+        self.repo.reprice(-90, 'Japan')
+        self.assertEqual(
+            [d['price_per_night'] for d in self.repo.get_all(location='Japan', sort='price')],
+            [25.0, 40.0, 50.0]
+        )
+        self.assertEqual(ids(location='Atlantis', sort='price'), [])
+        with self.assertRaises(ValueError):
+            self.repo.get_all(sort='name')
+
     def test_delete_existing(self):
         """Test deleting an existing destination."""
         deleted_destination = self.repo.delete('1')
@@ -57,6 +188,21 @@ class TestDestinationRepository(unittest.TestCase):
         deleted_destination = self.repo.delete('3')
         self.assertIsNone(deleted_destination)
 
+    def test_reprice_records_changes(self):
+        """Test repriced destinations appear in the change log, or it resets."""
+        repo = DestinationRepository(changes=ChangeLog(capacity=2))
+        cursor = repo.changes.latest
+        repo.reprice(10, location='Japan')
+        self.assertEqual(repo.changes.since(cursor), [{
+            'seq': cursor + 1, 'op': 'upsert', 'id': '2',
+            'destination': repo.get_all(location='Japan')[0]
+        }])
+        cursor = repo.changes.latest
+        repo.add({'id': '3', 'name': 'Kyoto Inn', 'location': 'Japan',
+                  'price_per_night': 90.0})
+        repo.reprice(10)
+        self.assertIsNone(repo.changes.since(cursor))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,13 @@
 import unittest
+from datetime import date, timedelta
 from unittest.mock import patch, MagicMock
-from app import app
+from flask import Flask
+from flask_restx import Api
+from app import create_app
+from models.destination_repository import DestinationRepository
+from routes.destination_routes import BATCH_MAX_IDS, register_destination_routes
+
+app = create_app()
 
 
 class TestDestinationRoutes(unittest.TestCase):
@@ -52,5 +59,256 @@ class TestDestinationRoutes(unittest.TestCase):
         self.assertEqual(response.json['message'], 'Destination not found')
 
 
+class TestCatalogueRoutes(unittest.TestCase):
+    def setUp(self):
+        self.repository = DestinationRepository()
+        self.repository.add({'id': '3', 'name': 'Louvre Suites', 'location': 'France',
+                             'price_per_night': 320.0,
+                             'latitude': 48.86, 'longitude': 2.34})
+        self.auth_service = MagicMock()
+        self.app = app = Flask(__name__)
+        register_destination_routes(Api(app), repository=self.repository,
+                                    auth_service=self.auth_service)
+        self.client = app.test_client()
+
+    def test_near_returns_closest_destinations(self):
+        """Test /near lists destinations inside the radius with distances."""
+        response = self.client.get('/destinations/near?lat=48.85&lon=2.35&radius=10')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d['id'] for d in response.json], ['3'])
+        self.assertIn('distance_km', response.json[0])
+
+        response = self.client.get('/destinations/near?lat=4.2&lon=73.5&radius=10')
+        self.assertEqual(response.json, [])
+
+    def test_stats(self):
+        """Test /stats serves overall and per-location price aggregates."""
+        response = self.client.get('/destinations/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['overall']['count'], 3)
+        self.assertEqual(
+            set(response.json['locations']), {'Maldives', 'Japan', 'France'}
+        )
+        response = self.client.get('/destinations/stats?location=France')
+        self.assertEqual(response.json['avg_price'], 320.0)
+        response = self.client.get('/destinations/stats?location=Atlantis')
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_in_currency(self):
+        """Test ?currency= converts listed prices and rejects unknown codes."""
+        response = self.client.get('/destinations/?currency=EUR&fields=id,price_per_night')
+        self.assertEqual(response.status_code, 200)
+        rate = self.repository.rates.rate('EUR')
+        self.assertEqual(response.json[0], {
+            'id': '1', 'price_per_night': round(500.0 * rate, 2), 'currency': 'EUR'
+        })
+        response = self.client.get('/destinations/near?lat=48.85&lon=2.35&currency=EUR')
+        self.assertEqual(response.json[0]['currency'], 'EUR')
+        response = self.client.get('/destinations/?currency=XYZ')
+        self.assertEqual(response.status_code, 400)
+
+    def test_reprice_requires_admin(self):
+        """Test bulk repricing checks the token and applies the percentage."""
+        headers = {'Authorization': 'Bearer admin'}
+        self.auth_service.validate_admin_token.return_value = False
+        response = self.client.post('/destinations/reprice', json={'percent': 10},
+                                    headers=headers)
+        self.assertEqual(response.status_code, 403)
+
+        self.auth_service.validate_admin_token.return_value = True
+        response = self.client.post('/destinations/reprice',
+                                    json={'percent': 10, 'location': 'France'},
+                                    headers=headers)
+        self.assertEqual(response.json, {'updated': 1})
+        self.assertEqual(self.repository.stats('France')['max_price'], 352.0)
+        response = self.client.post('/destinations/reprice',
+                                    json={'percent': 10, 'location': 'Atlantis'},
+                                    headers=headers)
+        self.assertEqual(response.status_code, 404)
+        for body in [{'percent': 'x'}, {'percent': 10, 'location': ['France']},
+                     [10], 10]:
+            response = self.client.post('/destinations/reprice', json=body,
+                                        headers=headers)
+            self.assertEqual(response.status_code, 400, body)
+        for raw in ['{"percent": NaN}', '{"percent": Infinity}', '{"percent": 1e400}',
+                    '{"percent": 1e308}']:
+            response = self.client.post('/destinations/reprice', data=raw,
+                                        content_type='application/json', headers=headers)
+            self.assertEqual(response.status_code, 400, raw)
+        self.assertEqual(self.repository.stats('France')['max_price'], 352.0)
+        self.assertEqual(self.repository.stats()['overall']['min_price'], 250.0)
+
+    def test_suggest(self):
+        """Test /suggest autocompletes and follows deletes."""
+        response = self.client.get('/destinations/suggest?prefix=lou')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json,
+                         [{'text': 'Louvre Suites', 'field': 'name', 'count': 1}])
+        response = self.client.get('/destinations/suggest?prefix=lovre&fuzzy=1')
+        self.assertEqual(response.json[0]['text'], 'Louvre Suites')
+        self.repository.delete('3')
+        response = self.client.get('/destinations/suggest?prefix=lou')
+        self.assertEqual(response.json, [])
+        for query in ['', 'prefix=', 'prefix=a&limit=0', 'prefix=a&fuzzy=3']:
+            response = self.client.get(f'/destinations/suggest?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_available(self):
+        """Test /available lists destinations free for the whole stay."""
+        start = date.today() + timedelta(days=10)
+        end = start + timedelta(days=3)
+        query = f'from={start.isoformat()}&to={end.isoformat()}&fields=id'
+        response = self.client.get(f'/destinations/available?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+
+        self.auth_service.validate_admin_token.return_value = True
+        response = self.client.put(
+            '/destinations/2/availability',
+            json={'from': start.isoformat(), 'to': end.isoformat(), 'available': False},
+            headers={'Authorization': 'Bearer admin'}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f'/destinations/available?{query}')
+        self.assertEqual(response.json, [{'id': '1'}, {'id': '3'}])
+
+        response = self.client.put(
+            '/destinations/99/availability',
+            json={'from': start.isoformat(), 'to': end.isoformat(), 'available': True},
+            headers={'Authorization': 'Bearer admin'}
+        )
+        self.assertEqual(response.status_code, 404)
+        for body in [[start.isoformat(), end.isoformat()], 'x', 1]:
+            response = self.client.put('/destinations/2/availability', json=body,
+                                       headers={'Authorization': 'Bearer admin'})
+            self.assertEqual(response.status_code, 400, body)
+        for bad in ['from=2026-13-01&to=2026-06-10', f'from={end}&to={start}', 'to=2030-01-01']:
+            response = self.client.get(f'/destinations/available?{bad}')
+            self.assertEqual(response.status_code, 400, bad)
+
+    def test_list_cheapest_in_location(self):
+        """Test ?location=&sort=price&limit= returns the cheapest first."""
+        self.repository.add({'id': '4', 'name': 'Versailles Inn', 'location': 'France',
+                             'price_per_night': 180.0})
+        response = self.client.get(
+            '/destinations/?location=France&sort=price&limit=1&fields=id,price_per_night'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'id': '4', 'price_per_night': 180.0}])
+        for query in ['sort=name', 'limit=0', 'limit=x']:
+            response = self.client.get(f'/destinations/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_batch_get(self):
+        """Test batch-get returns one result per id in request order."""
+        response = self.client.post('/destinations/batch-get?fields=id,price_per_night',
+                                    json={'ids': ['3', '9', '1']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['found'], 2)
+        self.assertEqual(response.json['results'], [
+            {'id': '3', 'status': 200, 'destination': {'id': '3', 'price_per_night': 320.0}},
+            {'id': '9', 'status': 404, 'message': 'Destination not found'},
+            {'id': '1', 'status': 200, 'destination': {'id': '1', 'price_per_night': 500.0}},
+        ])
+        for body in [{}, {'ids': []}, {'ids': [1]}, {'ids': 'x'}]:
+            response = self.client.post('/destinations/batch-get', json=body)
+            self.assertEqual(response.status_code, 400, body)
+        response = self.client.post('/destinations/batch-get',
+                                    json={'ids': ['1'] * (BATCH_MAX_IDS + 1)})
+        self.assertEqual(response.status_code, 413)
+
+    def test_batch_delete_checks_the_token_once(self):
+        """Test batch-delete validates the admin token once for the whole batch."""
+        headers = {'Authorization': 'Bearer admin'}
+        self.auth_service.validate_admin_token.return_value = False
+        response = self.client.post('/destinations/batch-delete', json={'ids': ['1']},
+                                    headers=headers)
+        self.assertEqual(response.status_code, 403)
+        self.assertIsNotNone(self.repository.get_many(['1'])[0])
+
+        self.auth_service.validate_admin_token.reset_mock()
+        self.auth_service.validate_admin_token.return_value = True
+        response = self.client.post('/destinations/batch-delete',
+                                    json={'ids': ['1', '9', '3', '1']}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.json['results']], [200, 404, 200, 404])
+        self.assertEqual(response.json['deleted'], 2)
+        self.auth_service.validate_admin_token.assert_called_once_with('admin')
+        self.assertEqual(self.repository.get_all(('id',)), [{'id': '2'}])
+        self.assertEqual(self.repository.stats()['overall']['count'], 1)
+
+    def test_batch_bodies_must_be_objects(self):
+        """Test array and scalar batch bodies are rejected with 400."""
+        self.auth_service.validate_admin_token.return_value = True
+        for path in ['/destinations/batch-get', '/destinations/batch-delete']:
+            for body in [['1', '2'], '1', 1, None]:
+                response = self.client.post(path, json=body,
+                                            headers={'Authorization': 'Bearer admin'})
+                self.assertEqual(response.status_code, 400, (path, body))
+        self.assertEqual(len(self.repository.get_all()), 3)
+
+    def test_changes_since_cursor(self):
+        """Test /changes returns the upserts and deletes after a cursor."""
+        cursor = self.client.get('/destinations/changes').json['next']
+        self.repository.add({'id': '4', 'name': 'Versailles Inn', 'location': 'France',
+                             'price_per_night': 180.0})
+        self.repository.delete('1')
+        response = self.client.get(f'/destinations/changes?since={cursor}')
+        self.assertEqual(response.status_code, 200)
+        changes = response.json['changes']
+        self.assertEqual([(c['op'], c['id']) for c in changes],
+                         [('upsert', '4'), ('delete', '1')])
+        self.assertEqual(changes[0]['destination']['price_per_night'], 180.0)
+        self.assertEqual(response.json['next'], changes[-1]['seq'])
+        self.assertFalse(response.json['more'])
+
+        response = self.client.get(f'/destinations/changes?since={cursor}&limit=1')
+        self.assertEqual(len(response.json['changes']), 1)
+        self.assertTrue(response.json['more'])
+        response = self.client.get('/destinations/changes?since=1')
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json['resync'])
+        for query in ['since=x', f'since={cursor}&limit=0']:
+            response = self.client.get(f'/destinations/changes?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_change_stream(self):
+        """Test the event stream replays changes after Last-Event-ID."""
+        cursor = self.repository.changes.latest
+        self.repository.delete('1')
+        response = self.client.get('/destinations/changes/stream',
+                                   headers={'Last-Event-ID': str(cursor)})
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        event = next(response.response).decode()
+        self.assertEqual(event.splitlines()[:2], [f'id: {cursor + 1}', 'event: delete'])
+        response.close()
+        response = self.client.get('/destinations/changes/stream?since=1')
+        self.assertTrue(next(response.response).startswith(b'event: resync'))
+        response.close()
+
+    def test_change_streams_are_capped(self):
+        """Test streams past the limit get 503 until an open one closes."""
+        # since=1 resyncs at once rather than waiting for a change
+        self.app.config['DESTINATION_MAX_STREAMS'] = 2
+        url = '/destinations/changes/stream?since=1'
+        open_streams = [self.client.get(url) for _ in range(2)]
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response.headers)
+        open_streams.pop().close()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        for stream in open_streams:
+            stream.close()
+
+    def test_near_validates_parameters(self):
+        """Test missing or out-of-range parameters are rejected."""
+        for query in ['lon=2.35', 'lat=x&lon=2', 'lat=95&lon=2',
+                      'lat=1&lon=2&radius=0', 'lat=1&lon=2&limit=1000']:
+            response = self.client.get(f'/destinations/near?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from models.price_column import PriceColumn
+from models.price_stats import PriceAggregates
+
+
+class TestPriceColumn(unittest.TestCase):
+    def setUp(self):
+        self.column = PriceColumn(capacity=2)
+        self.column.put('a', 100.0, 'Japan')
+        self.column.put('b', 200.0, 'France')
+        self.column.put('c', 300.0, 'Japan')
+
+    def test_put_grows_and_keeps_insertion_order(self):
+        """Test slots are appended in order and updates keep their slot."""
+        self.column.put('a', 120.0, 'Japan')
+        slots = self.column.live_slots()
+        self.assertEqual([self.column.ids[slot] for slot in slots], ['a', 'b', 'c'])
+        self.assertEqual(self.column.prices_at(slots).tolist(), [120.0, 200.0, 300.0])
+
+    def test_scale_by_location(self):
+        """Test repricing one location leaves the others untouched."""
+        self.assertEqual(self.column.scale(1.105, 'Japan'), 2)
+        self.assertEqual(self.column.price('a'), 110.5)
+        self.assertEqual(self.column.price('b'), 200.0)
+        self.assertEqual(self.column.price('c'), 331.5)
+        self.assertEqual(self.column.scale(2.0, 'Atlantis'), 0)
+
+    def test_prices_at_converts_and_rounds(self):
+        """Test conversion multiplies by the rate and rounds to cents."""
+        slots = self.column.live_slots()
+        self.assertEqual(self.column.prices_at(slots, 0.8613).tolist(),
+                         [86.13, 172.26, 258.39])
+
+    def test_sorted_slots_partial_keeps_ties_in_order(self):
+        """Test a limited sort picks the first ties in catalogue order."""
+        column = PriceColumn()
+        for i, price in enumerate([5.0, 3.0, 3.0, 9.0, 3.0, 1.0]):
+            column.put(str(i), price)
+        slots = column.live_slots()
+        self.assertEqual(column.sorted_slots(slots, 3).tolist(), [5, 1, 2])
+        self.assertEqual(column.sorted_slots(slots).tolist(), [5, 1, 2, 4, 0, 3])
+        self.assertEqual(column.sorted_slots(slots, 2, descending=True).tolist(), [3, 0])
+
+    def test_pop_and_compact(self):
+        """Test deleted slots are skipped and compaction keeps the order."""
+        column = PriceColumn()
+        for i in range(3000):
+            column.put(str(i), float(i), 'X' if i % 2 else 'Y')
+        for i in range(0, 2000):
+            self.assertEqual(column.pop(str(i)), float(i))
+        self.assertIsNone(column.pop('0'))
+        self.assertEqual(len(column), 1000)
+        self.assertLess(len(column.ids), 3000)
+        slots = column.live_slots()
+        self.assertEqual([column.ids[slot] for slot in slots],
+                         [str(i) for i in range(2000, 3000)])
+        self.assertEqual(len(column.live_slots('X')), 500)
+
+    def test_groups_rebuild_stats(self):
+        """Test aggregates rebuilt from the column match incremental ones."""
+        self.column.pop('b')
+        rebuilt = PriceAggregates.from_prices(
+            self.column.prices_at(self.column.live_slots()),
+            ((location, prices) for location, prices, _ in self.column.groups())
+        )
+        incremental = PriceAggregates()
+        for price, location in [(100.0, 'Japan'), (300.0, 'Japan')]:
+            incremental.add({'price_per_night': price, 'location': location})
+        self.assertEqual(rebuilt.to_dict(), incremental.to_dict())
+        self.assertIsInstance(self.column.prices, np.ndarray)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from models.price_index import LocationPriceIndex
+
+
+class TestLocationPriceIndex(unittest.TestCase):
+    def test_ordered_ascending_and_descending(self):
+        """Test cheapest and most expensive reads keep ties in catalogue order."""
+        index = LocationPriceIndex()
+        for sequence, (destination_id, price) in enumerate(
+                [('a', 200.0), ('b', 100.0), ('c', 200.0), ('d', 300.0), ('e', 200.0)]):
+            index.add('Japan', price, sequence, destination_id)
+        self.assertEqual(index.ordered('Japan', 2), ['b', 'a'])
+        self.assertEqual(index.ordered('Japan'), ['b', 'a', 'c', 'e', 'd'])
+        self.assertEqual(index.ordered('Japan', 3, descending=True), ['d', 'a', 'c'])
+        self.assertEqual(index.ordered('Japan', descending=True), ['d', 'a', 'c', 'e', 'b'])
+        self.assertEqual(index.ordered('France', 3), [])
+
+    def test_descending_reads_into_a_long_tie(self):
+        """Test a descending limit ending inside a run of equal prices."""
+        index = LocationPriceIndex()
+        index.add('Japan', 300.0, 0, 'top')
+        for sequence in range(1, 10001):
+            index.add('Japan', 200.0, sequence, str(sequence))
+        index.add('Japan', 100.0, 10001, 'cheap')
+        self.assertEqual(index.ordered('Japan', 3, descending=True), ['top', '1', '2'])
+        self.assertEqual(index.ordered('Japan', 0, descending=True), [])
+        everything = index.ordered('Japan', descending=True)
+        self.assertEqual(len(everything), 10002)
+        self.assertEqual(everything[-2:], ['10000', 'cheap'])
+
+    def test_remove_and_replace(self):
+        """Test removals and rebuilds keep the index exact."""
+        index = LocationPriceIndex()
+        index.add('Japan', 100.0, 0, 'a')
+        index.add('Japan', 50.0, 1, 'b')
+        index.add(None, 10.0, 2, 'c')
+        index.remove('Japan', 50.0, 1, 'b')
+        self.assertEqual(index.ordered('Japan'), ['a'])
+        index.remove('Japan', 100.0, 0, 'a')
+        self.assertNotIn('Japan', index.by_location)
+        index.replace('France', [(3.0, 5, 'x'), (1.0, 6, 'y')])
+        self.assertEqual(index.ordered('France'), ['y', 'x'])
+
+    def test_matches_sorting_under_churn(self):
+        """Test top-K reads equal sorting the live destinations."""
+        rng = random.Random(11)
+        index, live = LocationPriceIndex(), {}
+        for sequence in range(3000):
+            if live and rng.random() < 0.3:
+                destination_id = rng.choice(list(live))
+                index.remove('X', *live.pop(destination_id), destination_id)
+            else:
+                price = float(rng.randrange(50))
+                live[str(sequence)] = (price, sequence)
+                index.add('X', price, sequence, str(sequence))
+        ranked = sorted(live, key=lambda i: live[i])
+        self.assertEqual(index.ordered('X', 25), ranked[:25])
+        ranked = sorted(live, key=lambda i: (-live[i][0], live[i][1]))
+        self.assertEqual(index.ordered('X', 25, descending=True), ranked[:25])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from models.price_stats import PriceAggregates, PriceStats
+
+
+class TestPriceStats(unittest.TestCase):
+    def test_matches_recomputation_under_churn(self):
+        """Test running aggregates equal a full recomputation at every step."""
+        rng = random.Random(3)
+        stats, live = PriceStats(), []
+        for _ in range(5000):
+            if live and rng.random() < 0.45:
+                price = live.pop(rng.randrange(len(live)))
+                stats.remove(price)
+            else:
+                price = round(rng.uniform(20, 900), 2)
+                live.append(price)
+                stats.add(price)
+            self.assertEqual(stats.count, len(live))
+            if live:
+                self.assertEqual(stats.min, min(live))
+                self.assertEqual(stats.max, max(live))
+                self.assertAlmostEqual(stats.mean, sum(live) / len(live), 6)
+
+    def test_sum_is_exact_after_deletes(self):
+        """Test adding and removing the same prices restores the total."""
+        stats = PriceStats()
+        for price in [0.1, 0.2, 0.3]:
+            stats.add(price)
+        for price in [0.1, 0.2]:
+            stats.remove(price)
+        self.assertEqual(stats.total, 0.3)
+
+    def test_empty_group(self):
+        """Test an empty group reports no prices."""
+        self.assertEqual(
+            PriceStats().to_dict(),
+            {'count': 0, 'min_price': None, 'max_price': None, 'avg_price': None}
+        )
+
+
+class TestPriceAggregates(unittest.TestCase):
+    def test_groups_by_location(self):
+        """Test per-location groups appear and disappear with their records."""
+        aggregates = PriceAggregates()
+        maldives = {'location': 'Maldives', 'price_per_night': 500.0}
+        tokyo = {'location': 'Japan', 'price_per_night': 250.0}
+        kyoto = {'location': 'Japan', 'price_per_night': 150.0}
+        for destination in (maldives, tokyo, kyoto):
+            aggregates.add(destination)
+
+        self.assertEqual(aggregates.location('Japan'), {
+            'count': 2, 'min_price': 150.0, 'max_price': 250.0, 'avg_price': 200.0
+        })
+        self.assertEqual(aggregates.to_dict()['overall']['count'], 3)
+
+        aggregates.remove(maldives)
+        self.assertIsNone(aggregates.location('Maldives'))
+        self.assertEqual(list(aggregates.to_dict()['locations']), ['Japan'])
+        self.assertEqual(aggregates.overall.max, 250.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import random
+import unittest
+from models.spatial_index import GeoGridIndex, MAX_RADIUS_KM, haversine_km
+
+
+class TestHaversine(unittest.TestCase):
+    def test_known_distance(self):
+        """Test Paris-London is about 344 km."""
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522, 51.5074, -0.1278), 343.6, 0)
+
+    def test_antipodes(self):
+        """Test opposite points are half the circumference apart."""
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 180), MAX_RADIUS_KM, 3)
+
+
+class TestGeoGridIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = GeoGridIndex(cell_degrees=1.0)
+
+    def test_nearest_matches_brute_force(self):
+        """Test k-nearest results equal an exhaustive scan."""
+        rng = random.Random(7)
+        points = {}
+        for i in range(3000):
+            lat, lon = rng.uniform(-89.9, 89.9), rng.uniform(-180, 180)
+            points[str(i)] = (lat, lon)
+            self.index.add(str(i), lat, lon)
+
+        for _ in range(50):
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            radius, limit = rng.choice([100, 800, 5000, MAX_RADIUS_KM]), rng.choice([1, 5, 20])
+            expected = sorted(
+                (haversine_km(lat, lon, plat, plon), pid)
+                for pid, (plat, plon) in points.items()
+                if haversine_km(lat, lon, plat, plon) <= radius
+            )[:limit]
+            self.assertEqual(self.index.nearest(lat, lon, radius, limit), expected)
+
+    def test_search_wraps_around_the_antimeridian(self):
+        """Test points just across longitude 180 are found."""
+        self.index.add('fiji', -17.8, 179.9)
+        self.index.add('samoa', -13.8, -171.8)
+        found = self.index.nearest(-17.8, -179.9, 100, 5)
+        self.assertEqual([pid for _, pid in found], ['fiji'])
+        self.assertLess(found[0][0], 25)
+
+    def test_search_near_a_pole(self):
+        """Test a circle around a pole covers every longitude."""
+        self.index.add('a', 89.5, 0.0)
+        self.index.add('b', 89.5, 179.0)
+        self.assertEqual(
+            sorted(pid for _, pid in self.index.nearest(90.0, 0.0, 100, 10)), ['a', 'b']
+        )
+
+    def test_move_and_remove(self):
+        """Test re-adding moves a point and removal updates queries."""
+        self.index.add('x', 10.0, 10.0)
+        self.index.add('x', -10.0, -10.0)
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.nearest(10.0, 10.0, 100, 5), [])
+        self.assertTrue(self.index.remove('x'))
+        self.assertFalse(self.index.remove('x'))
+        self.assertEqual(self.index.nearest(-10.0, -10.0, 100, 5), [])
+
+    def test_invalid_coordinates(self):
+        """Test out-of-range coordinates are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.add('bad', 91.0, 0.0)
+        with self.assertRaises(ValueError):
+            self.index.nearest(0.0, 181.0, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
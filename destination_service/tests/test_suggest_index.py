@@ -0,0 +1,108 @@
+import random
+import unittest
+
+from models.suggest_index import SuggestIndex, normalize
+
+
+class TestSuggestIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SuggestIndex()
+        for i, (name, location) in enumerate([
+            ('Tokyo City Hotel', 'Japan'),
+            ('Tokyo Bay Inn', 'Japan'),
+            ('Kyoto Ryokan', 'Japan'),
+            ('Hôtel du Louvre', 'France'),
+            ('Maldives Resort', 'Maldives'),
+        ]):
+            self.index.add({'id': str(i), 'name': name, 'location': location})
+
+    def test_prefix_is_case_and_accent_insensitive(self):
+        """Test prefixes match regardless of case and accents, in order."""
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('TOKYO')],
+            ['Tokyo Bay Inn', 'Tokyo City Hotel']
+        )
+        self.assertEqual(self.index.suggest('hotel')[0]['text'], 'Hôtel du Louvre')
+        self.assertEqual(self.index.suggest('tokyo c', limit=5),
+                         [{'text': 'Tokyo City Hotel', 'field': 'name', 'count': 1}])
+        self.assertEqual(self.index.suggest('tokyo', limit=1)[0]['text'], 'Tokyo Bay Inn')
+        self.assertEqual(self.index.suggest('  '), [])
+
+    def test_locations_are_counted(self):
+        """Test a location shared by destinations is one suggestion."""
+        self.assertEqual(self.index.suggest('ja'),
+                         [{'text': 'Japan', 'field': 'location', 'count': 3}])
+        self.assertEqual(
+            [(s['text'], s['field']) for s in self.index.suggest('maldives')],
+            [('Maldives', 'location'), ('Maldives Resort', 'name')]
+        )
+
+    def test_fuzzy_matches_rank_after_exact(self):
+        """Test typos are tolerated up to the edit budget, closest first."""
+        self.assertEqual(self.index.suggest('tokoy'), [])
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('tokoy', max_edits=1)],
+            ['Tokyo Bay Inn', 'Tokyo City Hotel']
+        )
+        self.assertEqual(self.index.suggest('kyotto hot', max_edits=1), [])
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('tokyo bya', max_edits=2)],
+            ['Tokyo Bay Inn']
+        )
+        # Exact matches come first, then the closest fuzzy ones
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('tokyo c', max_edits=1)],
+            ['Tokyo City Hotel', 'Tokyo Bay Inn']
+        )
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('japn', max_edits=1)], ['Japan']
+        )
+        # The first character must be typed right
+        self.assertEqual(self.index.suggest('xapan', max_edits=1), [])
+
+    def test_remove_keeps_index_in_sync(self):
+        """Test deleted destinations stop being suggested."""
+        self.index.remove({'id': '0', 'name': 'Tokyo City Hotel', 'location': 'Japan'})
+        self.assertEqual([s['text'] for s in self.index.suggest('tokyo')], ['Tokyo Bay Inn'])
+        self.assertEqual(self.index.suggest('japan')[0]['count'], 2)
+
+    def test_fuzzy_walks_past_the_last_code_point(self):
+        """Test a text containing U+10FFFF does not break the fuzzy walk."""
+        self.index.add({'id': '9', 'name': 'Toky\U0010ffff', 'location': 'Japan'})
+        self.assertEqual(
+            [s['text'] for s in self.index.suggest('tokyo', max_edits=1)],
+            ['Tokyo Bay Inn', 'Tokyo City Hotel', 'Toky\U0010ffff']
+        )
+
+    def test_fuzzy_matches_brute_force(self):
+        """Test the trie walk finds exactly the texts a full scan finds."""
+        rng = random.Random(5)
+        words = ['grand', 'hotel', 'palace', 'inn', 'resort', 'lodge', 'villa']
+        index = SuggestIndex()
+        texts = set()
+        for i in range(500):
+            name = ' '.join(rng.choice(words) for _ in range(2)) + f' {i % 37}'
+            texts.add(name)
+            index.add({'id': str(i), 'name': name})
+
+        def distance(a, b):
+            row = list(range(len(b) + 1))
+            for i, ca in enumerate(a, 1):
+                new = [i]
+                for j, cb in enumerate(b, 1):
+                    new.append(min(new[j - 1] + 1, row[j] + 1, row[j - 1] + (ca != cb)))
+                row = new
+            return row
+
+        for query in ['grnd', 'hotle', 'palce v', 'lodeg']:
+            expected = {
+                text for text in texts
+                if text[0] == query[0]
+                and min(distance(query, normalize(text))) <= 1
+            }
+            found = {s['text'] for s in index.suggest(query, limit=1000, max_edits=1)}
+            self.assertEqual(found, expected, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
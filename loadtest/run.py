@@ -0,0 +1,385 @@
+# loadtest/run.py
+"""
+End-to-end load test for the auth, destination and user services.
+
+Boots all three services locally (each in its own process, with the
+user store in a scratch directory), seeds an admin and a pool of users,
+then drives a weighted mix of requests from concurrent clients and
+reports RPS and p50/p95/p99 latency per endpoint.
+
+Usage (from the repository root):
+    python -m loadtest.run --duration 30 --concurrency 16 \\
+        --mix login=30,profile=20,list_destinations=40,register=5,admin_delete=5 \\
+        --output results/run.json
+    python -m loadtest.stats results/base.json results/run.json
+
+Pass --no-boot to target services that are already running, and
+--monolith to boot all three in one process instead (``monolith.app``).
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loadtest.serve import ROOT
+from loadtest.stats import summarize
+
+DEFAULT_MIX = 'login=30,profile=20,list_destinations=40,register=5,admin_delete=5'
+DEFAULT_PORTS = {'auth_service': 5006, 'destination_service': 5001, 'user_service': 5003}
+MONOLITH_PORT = 5000
+PASSWORD = 'LoadTest#2024'
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f'Unknown operation {name!r}; expected one of {sorted(OPERATIONS)}')
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class Client:
+    """One keep-alive connection per service, owned by a single worker."""
+
+    def __init__(self, urls: Dict[str, str], timeout: float):
+        self.urls = urls
+        self.timeout = timeout
+        self._connections: Dict[str, http.client.HTTPConnection] = {}
+
+    def request(self, service: str, method: str, path: str,
+                body: Optional[Dict] = None, token: Optional[str] = None) -> Tuple[int, Dict]:
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        for attempt in range(2):
+            connection = self._connection(service)
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Servers may drop idle keep-alive connections; retry once
+                connection.close()
+                self._connections.pop(service, None)
+                if attempt:
+                    raise
+        try:
+            return response.status, json.loads(data) if data else {}
+        except ValueError:
+            return response.status, {}
+
+    def _connection(self, service: str) -> http.client.HTTPConnection:
+        connection = self._connections.get(service)
+        if connection is None:
+            url = urlsplit(self.urls[service])
+            connection = http.client.HTTPConnection(url.hostname, url.port, timeout=self.timeout)
+            self._connections[service] = connection
+        return connection
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+
+
+class Workload:
+    """Shared fixture data the operations draw from."""
+
+    def __init__(self, admin_token: str, users: List[Tuple[str, str]]):
+        self.admin_token = admin_token
+        self.users = users  # (email, token)
+        self.destination_ids = ['1', '2']
+
+
+def op_register(client: Client, workload: Workload) -> int:
+    email = f'load-{uuid.uuid4().hex}@example.com'
+    status, _ = client.request('user_service', 'POST', '/user/register', {
+        'email': email, 'password': PASSWORD, 'name': 'Load User', 'role': 'User'
+    })
+    return status
+
+
+def op_login(client: Client, workload: Workload) -> int:
+    email, _ = random.choice(workload.users)
+    status, _ = client.request('user_service', 'POST', '/user/login', {
+        'email': email, 'password': PASSWORD
+    })
+    return status
+
+
+def op_profile(client: Client, workload: Workload) -> int:
+    _, token = random.choice(workload.users)
+    status, _ = client.request('user_service', 'GET', '/user/profile', token=token)
+    return status
+
+
+def op_list_destinations(client: Client, workload: Workload) -> int:
+    status, _ = client.request('destination_service', 'GET', '/destinations/')
+    return status
+
+
+def op_admin_delete(client: Client, workload: Workload) -> int:
+    # The catalogue is tiny, so most deletes are 404s; every one of them
+    # still pays for the admin validation hop to the auth service.
+    destination_id = random.choice(workload.destination_ids)
+    status, _ = client.request(
+        'destination_service', 'DELETE', f'/destinations/{destination_id}',
+        token=workload.admin_token
+    )
+    return status
+
+
+OPERATIONS = {
+    'register': op_register,
+    'login': op_login,
+    'profile': op_profile,
+    'list_destinations': op_list_destinations,
+    'admin_delete': op_admin_delete,
+}
+
+
+class ServiceCluster:
+    """
+    Starts the services (or, with ``{'monolith': port}``, the combined app)
+    as subprocesses and waits until they answer.
+    """
+
+    def __init__(self, ports: Dict[str, int], workdir: str):
+        self.ports = ports
+        self.workdir = workdir
+        self.processes: List[subprocess.Popen] = []
+        self._logs = []
+
+    def start(self, timeout: float = 30.0) -> None:
+        shutil.copy(
+            os.path.join(ROOT, 'user_service', 'users.py'),
+            os.path.join(self.workdir, 'users.py')
+        )
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        env.setdefault('SECRET_KEY', 'load-test-secret')
+        env['USERS_FILE'] = os.path.join(self.workdir, 'users.py')
+        # Every client shares one IP and the seeded users log in over and over
+        env.setdefault('RATE_LIMIT_IP', '')
+        env.setdefault('RATE_LIMIT_EMAIL', '')
+        for service, port in self.ports.items():
+            log = open(os.path.join(self.workdir, f'{service}.log'), 'w')
+            self._logs.append(log)
+            self.processes.append(subprocess.Popen(
+                [sys.executable, '-m', 'loadtest.serve', service, str(port)],
+                cwd=self.workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+            ))
+        for service in self.ports:
+            self._wait_ready(service, time.monotonic() + timeout)
+
+    def _wait_ready(self, service: str, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.ports[service], timeout=1)
+                connection.request('GET', '/metrics')
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f'{service} did not become ready; see logs in {self.workdir}')
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for log in self._logs:
+            log.close()
+
+
+def seed(urls: Dict[str, str], user_count: int) -> Workload:
+    """Create an admin plus a pool of logged-in users."""
+    client = Client(urls, timeout=60)
+    admin_email = f'load-admin-{uuid.uuid4().hex}@example.com'
+    client.request('user_service', 'POST', '/user/register', {
+        'email': admin_email, 'password': PASSWORD, 'name': 'Load Admin', 'role': 'Admin'
+    })
+    status, body = client.request('user_service', 'POST', '/user/login', {
+        'email': admin_email, 'password': PASSWORD
+    })
+    if status != 200:
+        raise RuntimeError(f'Could not log in the seed admin: {status} {body}')
+    admin_token = body['token']
+
+    emails = [f'load-{uuid.uuid4().hex}@example.com' for _ in range(user_count)]
+    status, body = client.request('user_service', 'POST', '/user/register/batch', {
+        'users': [
+            {'email': email, 'password': PASSWORD, 'name': 'Load User', 'role': 'User'}
+            for email in emails
+        ]
+    }, token=admin_token)
+    if status != 200:
+        raise RuntimeError(f'Could not seed users: {status} {body}')
+
+    users = []
+    for email in emails:
+        _, body = client.request('user_service', 'POST', '/user/login', {
+            'email': email, 'password': PASSWORD
+        })
+        users.append((email, body['token']))
+    client.close()
+    return Workload(admin_token, users)
+
+
+def drive(urls: Dict[str, str], workload: Workload, mix: Dict[str, int],
+          concurrency: int, duration: float, warmup: float,
+          timeout: float) -> Tuple[Dict, float]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    start = time.monotonic()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        client = Client(urls, timeout)
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        while True:
+            name = random.choices(names, weights)[0]
+            began = time.monotonic()
+            if began >= stop_at:
+                break
+            try:
+                status = OPERATIONS[name](client, workload)
+                failed = status >= 500
+            except (http.client.HTTPException, OSError):
+                failed = True
+            if began >= measure_from:
+                latencies[name].append(time.monotonic() - began)
+                errors[name] += failed
+        client.close()
+        with lock:
+            results.append((latencies, errors))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - measure_from
+
+    merged_latencies = defaultdict(list)
+    merged_errors = defaultdict(int)
+    for latencies, errors in results:
+        for name, values in latencies.items():
+            merged_latencies[name].extend(values)
+            merged_errors[name] += errors[name]
+    endpoints = {
+        name: summarize(merged_latencies[name], merged_errors[name], elapsed)
+        for name in names
+    }
+    total = summarize(
+        [v for values in merged_latencies.values() for v in values],
+        sum(merged_errors.values()), elapsed
+    )
+    return {'endpoints': endpoints, 'total': total}, elapsed
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict) -> None:
+    header = f'{"endpoint":<20}{"requests":>10}{"errors":>8}{"rps":>10}{"p50_ms":>10}{"p95_ms":>10}{"p99_ms":>10}'
+    print(header)
+    rows = list(report['endpoints'].items()) + [('TOTAL', report['total'])]
+    for name, s in rows:
+        print(f'{name:<20}{s["requests"]:>10}{s["errors"]:>8}{s["rps"]:>10}'
+              f'{s["p50_ms"]:>10}{s["p95_ms"]:>10}{s["p99_ms"]:>10}')
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds before the window')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='operation=weight list')
+    parser.add_argument('--users', type=int, default=20, help='size of the seeded user pool')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--no-boot', action='store_true', help='use already running services')
+    parser.add_argument('--monolith', action='store_true',
+                        help='serve all three services from one process on --monolith-url')
+    parser.add_argument('--monolith-url', default=f'http://127.0.0.1:{MONOLITH_PORT}')
+    for service, port in DEFAULT_PORTS.items():
+        parser.add_argument(f'--{service.split("_")[0]}-url', default=f'http://127.0.0.1:{port}')
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    urls = {
+        'auth_service': args.auth_url,
+        'destination_service': args.destination_url,
+        'user_service': args.user_url,
+    }
+    if args.monolith:
+        urls = dict.fromkeys(urls, args.monolith_url)
+    cluster = None
+    workdir = tempfile.mkdtemp(prefix='travel-loadtest-')
+    try:
+        if not args.no_boot:
+            ports = {name: urlsplit(url).port for name, url in urls.items()}
+            if args.monolith:
+                ports = {'monolith': urlsplit(args.monolith_url).port}
+            cluster = ServiceCluster(ports, workdir)
+            cluster.start()
+        workload = seed(urls, args.users)
+        report, elapsed = drive(
+            urls, workload, mix, args.concurrency, args.duration, args.warmup, args.timeout
+        )
+    finally:
+        if cluster:
+            cluster.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report['meta'] = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'concurrency': args.concurrency,
+        'duration_s': round(elapsed, 3),
+        'mix': mix,
+        'users': args.users,
+        'booted': not args.no_boot,
+        'monolith': args.monolith,
+    }
+    print_report(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+    return report
+
+
+if __name__ == '__main__':
+    main()
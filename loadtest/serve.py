@@ -0,0 +1,46 @@
+# loadtest/serve.py
+"""
+Serve one service for the load harness.
+
+Usage:
+    python -m loadtest.serve <service> <port>
+    python -m loadtest.serve monolith <port>
+
+The service directory is put first on sys.path so its top-level
+``models``/``routes``/``services`` packages resolve as they do when the
+service is started from its own directory; ``monolith`` serves all
+three from one process (see ``monolith.app``). The threaded werkzeug server
+is used without the debugger or reloader, and per-request access logs
+are silenced so they do not skew the measurements.
+"""
+import logging
+import os
+import sys
+
+from werkzeug.serving import run_simple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ('auth_service', 'destination_service', 'user_service')
+
+
+def load_app(service: str):
+    if service == 'monolith':
+        from monolith.app import create_app
+        return create_app('ProductionConfig')
+    sys.path.insert(0, os.path.join(ROOT, service))
+    from app import create_app
+    from config import ProductionConfig
+    return create_app(ProductionConfig)
+
+
+def main() -> None:
+    service, port = sys.argv[1], int(sys.argv[2])
+    if service not in SERVICES + ('monolith',):
+        raise SystemExit(f'Unknown service {service}; expected one of {SERVICES} or monolith')
+    app = load_app(service)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    run_simple('127.0.0.1', port, app, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
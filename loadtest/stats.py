@@ -0,0 +1,80 @@
+# loadtest/stats.py
+"""Latency summaries and run-to-run comparison for load test results."""
+import json
+import math
+from typing import Dict, List, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Summarize one endpoint's samples.
+
+    Args:
+        latencies: Request latencies in seconds, successful or not
+        errors: Number of requests that failed or returned a 5xx
+        elapsed: Length of the measurement window in seconds
+    """
+    values = sorted(latencies)
+    summary = {
+        'requests': len(values),
+        'errors': errors,
+        'rps': round(len(values) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f'p{pct}_ms'] = round(percentile(values, pct) * 1000, 3)
+    return summary
+
+
+def compare(baseline: Dict, candidate: Dict) -> List[str]:
+    """Render per-endpoint RPS and p99 deltas between two result files."""
+    lines = [
+        f'{"endpoint":<20} {"rps":>18} {"p99_ms":>22}'
+    ]
+    endpoints = sorted(set(baseline['endpoints']) | set(candidate['endpoints']))
+    for endpoint in endpoints:
+        old = baseline['endpoints'].get(endpoint)
+        new = candidate['endpoints'].get(endpoint)
+        if not old or not new:
+            lines.append(f'{endpoint:<20} only in {"candidate" if new else "baseline"}')
+            continue
+        lines.append(
+            f'{endpoint:<20} '
+            f'{_delta(old["rps"], new["rps"]):>18} '
+            f'{_delta(old["p99_ms"], new["p99_ms"]):>22}'
+        )
+    return lines
+
+
+def _delta(old: float, new: float) -> str:
+    if not old:
+        return f'{old} -> {new}'
+    return f'{old} -> {new} ({(new - old) / old:+.1%})'
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description='Compare two load test runs')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args()
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+    print('\n'.join(compare(baseline, candidate)))
+
+
+if __name__ == '__main__':
+    main()
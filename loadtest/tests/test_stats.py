@@ -0,0 +1,41 @@
+import unittest
+from loadtest.run import parse_mix
+from loadtest.stats import compare, percentile, summarize
+
+
+class TestStats(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles on a sorted sample."""
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.05)
+        self.assertEqual(percentile(values, 99), 0.099)
+        self.assertEqual(percentile(values, 100), 0.1)
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_summarize(self):
+        """Test summaries report counts, rate and millisecond latencies."""
+        summary = summarize([0.003, 0.001, 0.002, 0.004], errors=1, elapsed=2.0)
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['rps'], 2.0)
+        self.assertEqual(summary['p50_ms'], 2.0)
+        self.assertEqual(summary['p99_ms'], 4.0)
+        self.assertEqual(summary['max_ms'], 4.0)
+
+    def test_compare_reports_relative_change(self):
+        """Test run comparison shows per-endpoint deltas."""
+        baseline = {'endpoints': {'login': {'rps': 10.0, 'p99_ms': 100.0}}}
+        candidate = {'endpoints': {'login': {'rps': 20.0, 'p99_ms': 50.0}}}
+        lines = compare(baseline, candidate)
+        self.assertIn('+100.0%', lines[1])
+        self.assertIn('-50.0%', lines[1])
+
+    def test_parse_mix(self):
+        """Test the mix spec parser validates operation names."""
+        self.assertEqual(parse_mix('login=3,profile=1'), {'login': 3, 'profile': 1})
+        with self.assertRaises(ValueError):
+            parse_mix('bogus=1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# monolith/app.py
+"""
+All three services in one process behind a single WSGI dispatcher.
+
+For small deployments and test or benchmark runs: requests are routed by
+their first path segment (``/auth``, ``/destinations``, ``/user``) to the
+unchanged service applications, so clients use the same URLs as against
+the split services, and the destination service checks admin tokens
+with a direct call into the auth service instead of an HTTP round trip.
+Each service is also mounted whole under its directory name (e.g.
+``/destination_service/``) for its Swagger UI; ``/metrics`` is shared,
+since the services record into one registry.
+
+The services are written to be started from their own directories and
+share top-level module names (``app``, ``config``, ``models``, ...), so
+each one is imported with its directory first on ``sys.path`` and its
+modules are taken out of ``sys.modules`` again afterwards; the
+application keeps the modules it was built from.
+
+Run it from the repository root:
+    flask --app "monolith.app:create_app()" run --port 5000
+    gunicorn -c monolith/gunicorn.conf.py
+"""
+import importlib
+import os
+import sys
+from typing import Dict, Optional
+
+from werkzeug.exceptions import NotFound
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ('auth_service', 'destination_service', 'user_service')
+
+# First path segment -> service serving it
+ROUTES = {
+    'auth': 'auth_service',
+    'destinations': 'destination_service',
+    'user': 'user_service',
+    'metrics': 'auth_service',
+}
+
+# Service directories that are not part of the application
+_NOT_MODULES = {'tests', 'benchmarks', '__pycache__'}
+
+
+def _module_names(directory: str) -> set:
+    """Top-level module and package names a service imports from its directory"""
+    names = set()
+    for entry in os.listdir(directory):
+        if entry.endswith('.py'):
+            names.add(entry[:-3])
+        elif (entry not in _NOT_MODULES
+              and os.path.isdir(os.path.join(directory, entry))):
+            names.add(entry)
+    return names
+
+
+def _service_modules(names: set) -> Dict:
+    return {name: module for name, module in sys.modules.items()
+            if name.partition('.')[0] in names}
+
+
+def load_service(service: str, config_name: str = 'DevelopmentConfig',
+                 settings: Optional[Dict] = None, **options):
+    """
+    Import a service's ``app`` module in isolation and build its application.
+
+    Args:
+        service: Service directory name
+        config_name: Config class in the service's ``config`` module
+        settings: Config values overriding that class
+        **options: Extra keyword arguments for the service's ``create_app``
+
+    Returns:
+        Tuple: The service's ``app`` module and the built Flask application
+    """
+    directory = os.path.join(ROOT, service)
+    names = _module_names(directory)
+    shadowed = _service_modules(names)
+    for name in shadowed:
+        del sys.modules[name]
+    sys.path.insert(0, directory)
+    try:
+        module = importlib.import_module('app')
+        config = getattr(importlib.import_module('config'), config_name)
+        if settings:
+            config = type(config_name, (config,), dict(settings))
+        return module, module.create_app(config, **options)
+    finally:
+        sys.path.remove(directory)
+        for name in _service_modules(names):
+            del sys.modules[name]
+        sys.modules.update(shadowed)
+
+
+class ServiceDispatcher:
+    """Route each request to the service owning its first path segment"""
+
+    def __init__(self, apps: Dict, routes: Dict[str, str] = ROUTES):
+        self.apps = apps
+        self._routes = {segment: apps[service] for segment, service in routes.items()}
+        self._not_found = NotFound()
+
+    def __call__(self, environ, start_response):
+        segment = environ.get('PATH_INFO', '').lstrip('/').partition('/')[0]
+        app = self._routes.get(segment, self._not_found)
+        return app(environ, start_response)
+
+
+def create_app(config_name: str = 'DevelopmentConfig', **settings):
+    """
+    Build the combined application.
+
+    Args:
+        config_name: Config class used for every service, e.g. ``ProductionConfig``
+        **settings: Config values overriding it in every service
+
+    Returns:
+        DispatcherMiddleware: WSGI application serving all three services,
+        with the service applications in ``.app.apps``
+    """
+    # The user file resolves against the working directory, which for the
+    # monolith is the repository root rather than user_service/
+    settings.setdefault(
+        'USERS_FILE',
+        os.getenv('USERS_FILE', os.path.join(ROOT, 'user_service', 'users.py'))
+    )
+    auth_module, auth_app = load_service('auth_service', config_name, settings)
+    _, destination_app = load_service(
+        'destination_service', config_name, settings,
+        validate_token=auth_module.token_validator(auth_app)
+    )
+    _, user_app = load_service('user_service', config_name, settings)
+    apps = {
+        'auth_service': auth_app,
+        'destination_service': destination_app,
+        'user_service': user_app,
+    }
+    return DispatcherMiddleware(
+        ServiceDispatcher(apps),
+        {f'/{service}': app for service, app in apps.items()}
+    )
@@ -0,0 +1,44 @@
+# gunicorn.conf.py
+# All services in one server: gunicorn -c monolith/gunicorn.conf.py (from the repository root)
+import os
+import sys
+
+# Make the ``monolith`` and ``common`` packages importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.workers import worker_count, worker_started  # noqa: E402
+
+wsgi_app = "monolith.app:create_app('ProductionConfig')"
+# Comma-separated; e.g. BIND=0.0.0.0:5000,unix:/run/travel/travel.sock
+bind = os.getenv('BIND', '0.0.0.0:5000').split(',')
+
+# The user file (and a persisted catalogue) have a single writer, so the
+# combined app runs in one process; password hashing releases the GIL
+# and admin checks no longer wait on the network, so threads use the cores.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+# A persisted catalogue has a single writer: one process owns the journal
+if os.getenv('DESTINATION_DATA_DIR'):
+    workers = 1
+threads = int(os.getenv('GUNICORN_THREADS', str(worker_count(per_cpu=2, extra=0))))
+
+# Build the app once in the master and fork workers from it
+preload_app = True
+
+# Recycle workers gradually so no long-lived process accumulates state,
+# but only when the catalogue is persisted: a recycled worker re-forks the
+# master's boot-time catalogue and, without DESTINATION_DATA_DIR to reload
+# from, would silently undo every delete, reprice and availability change.
+max_requests = 0
+if os.getenv('DESTINATION_DATA_DIR'):
+    max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    """Re-initialize per-worker state of every preloaded service"""
+    for app in worker.app.wsgi().app.apps.values():
+        worker_started(app)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from werkzeug.test import Client
+
+from monolith.app import ROOT, create_app
+
+ADMIN = {'email': 'admin@example.com', 'password': 'Admin#2024x',
+         'name': 'Admin', 'role': 'Admin'}
+
+
+class TestMonolith(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app(
+            'DevelopmentConfig', SECRET_KEY='monolith-test',
+            USERS_FILE=os.path.join(self.directory, 'users.py')
+        )
+        self.client = Client(self.app)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def login(self, user):
+        response = self.client.post('/user/register', json=user)
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/user/login', json={
+            'email': user['email'], 'password': user['password']
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json['token']
+
+    def test_service_modules_do_not_leak(self):
+        """Test building the monolith leaves no service module in sys.modules."""
+        self.assertNotIn('app', sys.modules)
+        self.assertNotIn('config', sys.modules)
+        self.assertFalse({'models', 'routes', 'services'} & set(sys.modules))
+
+    def test_routes_by_first_path_segment(self):
+        """Test each service answers its own URLs at the top level."""
+        self.assertEqual(self.client.get('/destinations/').status_code, 200)
+        self.assertEqual(self.client.get('/auth/validate').status_code, 401)
+        self.assertEqual(self.client.get('/user/profile').status_code, 401)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.assertEqual(self.client.get('/elsewhere').status_code, 404)
+
+    def test_services_mounted_under_their_names(self):
+        """Test every service's Swagger UI is served under its directory name."""
+        for service in ('auth_service', 'destination_service', 'user_service'):
+            response = self.client.get(f'/{service}/swagger.json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json['basePath'], f'/{service}')
+
+    @patch('requests.get', side_effect=AssertionError('no HTTP in monolith mode'))
+    def test_admin_check_is_in_process(self, mock_get):
+        """Test an admin token from /user/login deletes a destination without HTTP."""
+        token = self.login(ADMIN)
+        response = self.client.delete('/destinations/1', headers={
+            'Authorization': f'Bearer {token}'
+        })
+        self.assertEqual(response.status_code, 200)
+        mock_get.assert_not_called()
+
+    def test_non_admin_token_is_rejected(self):
+        """Test user and invalid tokens get 403 from the in-process check."""
+        token = self.login({**ADMIN, 'email': 'user@example.com', 'role': 'User'})
+        for bearer in (token, 'not-a-token'):
+            response = self.client.delete('/destinations/1', headers={
+                'Authorization': f'Bearer {bearer}'
+            })
+            self.assertEqual(response.status_code, 403)
+
+    def test_default_users_file(self):
+        """Test the user service reads its own user file when none is configured."""
+        with patch.dict(os.environ):
+            os.environ.pop('USERS_FILE', None)
+            app = create_app('DevelopmentConfig')
+        repository_file = app.app.apps['user_service'].config['USERS_FILE']
+        self.assertEqual(repository_file, os.path.join(ROOT, 'user_service', 'users.py'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,16 @@
 # app.py
 import logging
+import os
+import sys
 from flask import Flask
 from flask_restx import Api
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import (
+    admission, compression, json_provider, metrics, profiling, rate_limit, tracing, workers
+)
 from config import DevelopmentConfig
 from repositories.user_repository import UserRepository
 from services.user_service import UserService
@@ -36,12 +45,38 @@ def create_app(config=DevelopmentConfig):
     )
 
     # Initialize components
-    user_repository = UserRepository('users.py')
+    user_repository = UserRepository(
+        app.config['USERS_FILE'], compact=app.config['USERS_COMPACT']
+    )
     user_service = UserService()
-    user_controller = UserController(user_repository, user_service)
+    user_controller = UserController(
+        user_repository,
+        user_service,
+        hash_workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_batch_size=app.config['BATCH_REGISTER_MAX_SIZE']
+    )
+
+    # Throttle password checks per client IP and per target email
+    buckets = rate_limit.from_config(app.config)
+    limits = {
+        'ip': rate_limit.parse_limit(app.config['RATE_LIMIT_IP']),
+        'email': rate_limit.parse_limit(app.config['RATE_LIMIT_EMAIL']),
+    }
 
     # Setup routes
     setup_user_routes(api, user_controller, user_service)
+    json_provider.init_app(app, api)
+    compression.init_app(app)
+    metrics.init_app(app, 'user_service')
+    tracing.init_app(app, 'user_service')
+    # Refuse throttled clients before they take a place in the admission queue
+    rate_limit.init_app(app, buckets, limits, {
+        'user_user_login': 'login', 'user_user_registration': 'register',
+    })
+    admission.init_app(app, 'user_service')
+    profiling.init_app(app)
+    workers.on_worker_start(app, user_repository.reload)
+    workers.on_worker_start(app, buckets.start)
 
     return app
 
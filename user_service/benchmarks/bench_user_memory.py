@@ -0,0 +1,91 @@
+# benchmarks/bench_user_memory.py
+"""
+Resident memory per user for the different UserRepository layouts.
+
+Usage (from the user_service directory):
+    python -m benchmarks.bench_user_memory --users 1000000
+"""
+import argparse
+import gc
+import os
+import tracemalloc
+from dataclasses import dataclass
+from models.user import UserDTO, UserRole
+from repositories.compact_user_store import CompactUserStore
+
+
+@dataclass
+class DictUserDTO:
+    """The pre-slots UserDTO layout, kept here as the baseline"""
+    email: str
+    name: str
+    role: UserRole
+    password_hash: str
+
+
+def _records(count: int):
+    names = ['Marjia', 'M Afroj', 'John Doe', 'Jane Roe']
+    for i in range(count):
+        salt = os.urandom(8).hex()
+        digest = os.urandom(64).hex()
+        yield (
+            f'user{i}@example.com',
+            # Build a fresh string per record, as a file load would
+            (names[i % len(names)] + ' ')[:-1],
+            UserRole.ADMIN if i % 10 == 0 else UserRole.USER,
+            f'scrypt:32768:8:1${salt}${digest}'
+        )
+
+
+def measure(label: str, count: int, build) -> None:
+    gc.collect()
+    tracemalloc.start()
+    store = build(_records(count))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f'{label:<22} {current / 2**20:9.1f} MiB'
+        f' {current / count:8.1f} B/user'
+        f' (peak {peak / 2**20:.1f} MiB)'
+    )
+    del store
+
+
+def build_dict_baseline(records):
+    return {
+        email: DictUserDTO(email, name, role, password_hash)
+        for email, name, role, password_hash in records
+    }
+
+
+def build_slotted(records):
+    return {
+        email: UserDTO.from_record(
+            email,
+            {'name': name, 'role': role.value, 'password': password_hash}
+        )
+        for email, name, role, password_hash in records
+    }
+
+
+def build_compact(records):
+    store = CompactUserStore()
+    for email, name, role, password_hash in records:
+        store[email] = UserDTO(email, name, role, password_hash)
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f'{args.users} users')
+    measure('dataclass + __dict__', args.users, build_dict_baseline)
+    measure('slotted UserDTO', args.users, build_slotted)
+    measure('CompactUserStore', args.users, build_compact)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,46 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Password hashing releases the GIL, so about one hash per core runs at full
+# speed; more only makes every login slower and ties up threads. A few more
+# may queue so a core never idles between hashes.
+_HASHING_SLOTS = os.cpu_count() or 1
+PASSWORD_HASH_LIMITS = (
+    f'user_user_login={_HASHING_SLOTS}:{4 * _HASHING_SLOTS},'
+    f'user_user_registration={_HASHING_SLOTS}:{4 * _HASHING_SLOTS},'
+    'user_user_batch_registration=1:1'
+)
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'your_secret_key')
     DEBUG = False
+    USERS_FILE = os.getenv('USERS_FILE', 'users.py')
+    # Keep users in column-oriented storage (about half the memory per user,
+    # see benchmarks/bench_user_memory.py) instead of one object per user
+    USERS_COMPACT = os.getenv('USERS_COMPACT', 'true').lower() == 'true'
+    BATCH_REGISTER_MAX_SIZE = int(os.getenv('BATCH_REGISTER_MAX_SIZE', '1000'))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '0')) or None
+    # auto: orjson when installed, else the stdlib json module
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    # Responses below COMPRESS_MIN_SIZE bytes are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', '4'))
+    # Per-endpoint concurrency limits, endpoint=limit[:queue],... (see common.admission)
+    ADMISSION_LIMITS = os.getenv('ADMISSION_LIMITS', PASSWORD_HASH_LIMITS)
+    # Longest queue wait normally, and once an endpoint's queue stops draining;
+    # a hash takes around 100 ms, so waits shorter than that would only shed
+    ADMISSION_INTERVAL_MS = int(os.getenv('ADMISSION_INTERVAL_MS', '1000'))
+    ADMISSION_TARGET_MS = int(os.getenv('ADMISSION_TARGET_MS', '200'))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+    # Login and registration attempts as count/seconds per client IP and per
+    # target email (empty disables); see common.rate_limit
+    RATE_LIMIT_IP = os.getenv('RATE_LIMIT_IP', '30/60')
+    RATE_LIMIT_EMAIL = os.getenv('RATE_LIMIT_EMAIL', '10/300')
+    RATE_LIMIT_SHARDS = int(os.getenv('RATE_LIMIT_SHARDS', '16'))
+    RATE_LIMIT_EVICT_SECONDS = float(os.getenv('RATE_LIMIT_EVICT_SECONDS', '60'))
+    # Share the buckets between workers and hosts, e.g. redis://localhost:6379/0
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL')
 
 class DevelopmentConfig(Config):
     DEBUG = True
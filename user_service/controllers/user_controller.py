@@ -1,27 +1,55 @@
 # controllers/user_controller.py
 import logging
-from typing import Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from common import projection
 from services.user_service import UserService
 from repositories.user_repository import UserRepository
-from models.user import UserDTO, UserRole
+from models.user import SAFE_FIELDS, UserDTO, UserRole
 
 logger = logging.getLogger(__name__)
 
+REGISTRATION_FIELDS = ['email', 'password', 'name', 'role']
+# The user file could not be written, so nothing was registered; safe to retry
+SAVE_FAILED = {'message': 'Could not save users, please try again'}, 503
+
+
 class UserController:
-    def __init__(self, user_repository: UserRepository, user_service: UserService):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        hash_workers: Optional[int] = None,
+        max_batch_size: int = 1000
+    ):
         self.user_repository = user_repository
         self.user_service = user_service
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
 
-    def register_user(self, data: Dict) -> tuple:
+    @staticmethod
+    def _validate_registration(data: Dict) -> Optional[tuple]:
+        """Returns an error response for invalid registration data"""
+        if not isinstance(data, dict) or not all(
+            k in data for k in REGISTRATION_FIELDS
+        ):
+            return {'message': 'Missing required fields'}, 400
+        if not all(isinstance(data[k], str) for k in REGISTRATION_FIELDS):
+            return {'message': f'Fields must be strings: {REGISTRATION_FIELDS}'}, 400
         try:
-            if not all(k in data for k in ['email', 'password', 'name', 'role']):
-                return {'message': 'Missing required fields'}, 400
+            UserRole(data['role'])
+        except ValueError:
+            return {'message': f'Invalid role. Must be one of: {[r.value for r in UserRole]}'}, 400
+        return None
 
-            try:
-                role = UserRole(data['role'])
-            except ValueError:
-                return {'message': f'Invalid role. Must be one of: {[r.value for r in UserRole]}'}, 400
+    def register_user(self, data: Dict) -> tuple:
+        try:
+            error = self._validate_registration(data)
+            if error:
+                return error
 
+            role = UserRole(data['role'])
             user = UserDTO(
                 email=data['email'],
                 name=data['name'],
@@ -34,10 +62,90 @@ class UserController:
             return {'message': 'User registered successfully'}, 201
         except ValueError as e:
             return {'message': str(e)}, 409
+        except OSError as e:
+            # The user file could not be written; the repository kept its previous state
+            logger.error(f"Registration not saved: {str(e)}")
+            return SAVE_FAILED
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return {'message': 'Internal server error'}, 500
 
+    def register_users_batch(self, records: List[Dict]) -> tuple:
+        """
+        Registers many users with one persistence flush.
+
+        Records are validated and checked for conflicts up front so only
+        insertable users pay for password hashing, which then runs on a
+        thread pool. Returns one result per record, in request order.
+        """
+        try:
+            if not isinstance(records, list):
+                return {'message': 'Expected a list of users'}, 400
+            if len(records) > self.max_batch_size:
+                return {
+                    'message': f'Batch too large. Maximum is {self.max_batch_size} users'
+                }, 413
+
+            results: List[Optional[Dict]] = [None] * len(records)
+            pending = []
+            seen = set()
+            for i, data in enumerate(records):
+                error = self._validate_registration(data)
+                if error:
+                    message, status = error
+                    results[i] = self._batch_result(data, status, message['message'])
+                elif data['email'] in seen or self.user_repository.get_user(data['email']):
+                    results[i] = self._batch_result(data, 409, 'User already exists')
+                else:
+                    seen.add(data['email'])
+                    pending.append(i)
+
+            with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+                hashes = list(executor.map(
+                    self.user_service.hash_password,
+                    [records[i]['password'] for i in pending]
+                ))
+
+            users = [
+                UserDTO(
+                    email=records[i]['email'],
+                    name=records[i]['name'],
+                    role=UserRole(records[i]['role']),
+                    password_hash=password_hash
+                )
+                for i, password_hash in zip(pending, hashes)
+            ]
+            created = self.user_repository.create_users(users)
+
+            for i, was_created in zip(pending, created):
+                if was_created:
+                    results[i] = self._batch_result(
+                        records[i], 201, 'User registered successfully'
+                    )
+                else:
+                    results[i] = self._batch_result(
+                        records[i], 409, 'User already exists'
+                    )
+
+            registered = sum(created)
+            logger.info(f"Batch registered {registered} of {len(records)} users")
+            return {
+                'registered': registered,
+                'failed': len(records) - registered,
+                'results': results
+            }, 200
+        except OSError as e:
+            logger.error(f"Batch registration not saved: {str(e)}")
+            return SAVE_FAILED
+        except Exception as e:
+            logger.error(f"Batch registration error: {str(e)}")
+            return {'message': 'Internal server error'}, 500
+
+    @staticmethod
+    def _batch_result(data, status: int, message: str) -> Dict:
+        email = data.get('email') if isinstance(data, dict) else None
+        return {'email': email, 'status': status, 'message': message}
+
     def login_user(self, data: Dict) -> tuple:
         try:
             user = self.user_repository.get_user(data['email'])
@@ -60,8 +168,18 @@ class UserController:
             logger.error(f"Login error: {str(e)}")
             return {'message': 'Internal server error'}, 500
 
-    def get_all_users(self) -> tuple:
+    def get_all_users(self, fields: Optional[str] = None) -> tuple:
+        """
+        List users, optionally limited to a comma-separated ``fields``
+        subset of SAFE_FIELDS that the repository projects directly.
+        """
+        try:
+            selected = projection.parse_fields(fields, SAFE_FIELDS)
+        except ValueError as e:
+            return {'message': str(e)}, 400
         try:
+            if selected is not None:
+                return self.user_repository.list_users(selected), 200
             users = self.user_repository.get_all_users()
             return {
                 user.email: user.to_safe_dict()
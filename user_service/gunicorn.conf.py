@@ -0,0 +1,31 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py (from this directory)
+import os
+import sys
+
+# Make the shared ``common`` package importable when running from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.workers import post_fork, worker_count  # noqa: F401 (gunicorn hook)
+
+wsgi_app = "app:create_app('config.ProductionConfig')"
+# Comma-separated; e.g. BIND=0.0.0.0:5003,unix:/run/travel/user.sock
+bind = os.getenv('BIND', '0.0.0.0:5003').split(',')
+
+# Users live in one file that each process rewrites from memory, so more
+# than one worker would let workers overwrite each other's registrations.
+# Password hashing releases the GIL, so threads still use every core.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+threads = int(os.getenv('GUNICORN_THREADS', str(worker_count(per_cpu=2, extra=0))))
+
+# Build the app once in the master and fork workers from it; each worker
+# reloads the user file so recycled workers see users registered since.
+preload_app = True
+
+# Recycle workers gradually so no long-lived process accumulates state
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = 30
+keepalive = 5
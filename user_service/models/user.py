@@ -7,13 +7,39 @@ class UserRole(str, Enum):
     ADMIN = "Admin"
     USER = "User"
 
+# Stable small-integer codes for compact storage; members are singletons,
+# so every stored role references one of these two objects.
+ROLE_BY_CODE = tuple(UserRole)
+CODE_BY_ROLE = {role: code for code, role in enumerate(ROLE_BY_CODE)}
+
+# Fields a user listing may expose (see UserDTO.to_safe_dict)
+SAFE_FIELDS = ('name', 'role')
+
 @dataclass
 class UserDTO:
+    # No per-instance __dict__: at millions of users the dict overhead
+    # outweighs the user data itself.
+    __slots__ = ('email', 'name', 'role', 'password_hash')
+
     email: str
     name: str
     role: UserRole
     password_hash: str
 
+    @classmethod
+    def from_record(cls, email: str, record: Dict) -> 'UserDTO':
+        """
+        Build a user from its persisted form. Roles become the shared enum
+        members; names are mostly unique, so interning them would only
+        grow the intern table.
+        """
+        return cls(
+            email=email,
+            name=record['name'],
+            role=UserRole(record['role']),
+            password_hash=record['password']
+        )
+
     def to_dict(self) -> Dict:
         return {
             'email': self.email,
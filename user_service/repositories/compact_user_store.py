@@ -0,0 +1,157 @@
+# repositories/compact_user_store.py
+import copy
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from models.user import UserDTO, ROLE_BY_CODE, CODE_BY_ROLE, SAFE_FIELDS
+
+_TOMBSTONE = 0xFF
+_RAW_HASH = 0xFF
+_ROLE_VALUES = tuple(role.value for role in ROLE_BY_CODE)
+
+
+class CompactUserStore(MutableMapping):
+    """
+    Column-oriented email -> UserDTO mapping.
+
+    Users are kept as parallel columns instead of one object per user:
+    roles are single bytes and password hashes live
+    in one contiguous byte buffer addressed by offsets. Werkzeug-style
+    ``method$salt$hexdigest`` hashes are packed further: the method is
+    stored once in a table and the digest as raw bytes. UserDTO objects
+    are only materialized on access, so they never stay resident.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._emails: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._roles = array('B')
+        self._hash_methods: List[str] = []
+        self._hash_method_codes = array('B')
+        self._salt_lengths = array('B')
+        self._hash_offsets = array('Q', [0])
+        self._hashes = bytearray()
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __contains__(self, email) -> bool:
+        return email in self._rows
+
+    def __getitem__(self, email: str) -> UserDTO:
+        return self._materialize(self._rows[email])
+
+    def __setitem__(self, email: str, user: UserDTO) -> None:
+        if email in self._rows:
+            self._delete_row(self._rows.pop(email))
+        self._rows[email] = len(self._emails)
+        self._emails.append(email)
+        self._names.append(user.name)
+        self._roles.append(CODE_BY_ROLE[user.role])
+        self._append_hash(user.password_hash)
+
+    def __delitem__(self, email: str) -> None:
+        self._delete_row(self._rows.pop(email))
+
+    def values(self):
+        return [self._materialize(row) for row in self._rows.values()]
+
+    def project(self, fields: Sequence[str] = SAFE_FIELDS) -> Dict[str, Dict]:
+        """
+        Safe ``fields`` of every user keyed by email, read straight from
+        the columns without materializing users or decoding hashes.
+        """
+        names, roles = self._names, self._roles
+        getters = {
+            'name': names.__getitem__,
+            'role': lambda row: _ROLE_VALUES[roles[row]],
+        }
+        columns = [(field, getters[field]) for field in fields]
+        return {
+            email: {field: get(row) for field, get in columns}
+            for email, row in self._rows.items()
+        }
+
+    def copy(self) -> 'CompactUserStore':
+        """Independent copy, made column by column rather than user by user"""
+        clone = CompactUserStore.__new__(CompactUserStore)
+        clone.__dict__.update(
+            (name, copy.copy(value)) for name, value in vars(self).items()
+        )
+        return clone
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def compact(self) -> None:
+        """Reclaim the space held by deleted rows"""
+        users = self.values()
+        self.clear()
+        for user in users:
+            self[user.email] = user
+
+    def _materialize(self, row: int) -> UserDTO:
+        start, end = self._hash_offsets[row], self._hash_offsets[row + 1]
+        return UserDTO(
+            email=self._emails[row],
+            name=self._names[row],
+            role=ROLE_BY_CODE[self._roles[row]],
+            password_hash=self._read_hash(row, start, end)
+        )
+
+    def _append_hash(self, password_hash: str) -> None:
+        parts = _split_hash(password_hash)
+        if parts and (parts[0] in self._hash_methods
+                      or len(self._hash_methods) < _RAW_HASH):
+            method, salt, digest = parts
+            if method not in self._hash_methods:
+                self._hash_methods.append(sys.intern(method))
+            self._hash_method_codes.append(self._hash_methods.index(method))
+            self._salt_lengths.append(len(salt))
+            self._hashes += salt
+            self._hashes += digest
+        else:
+            self._hash_method_codes.append(_RAW_HASH)
+            self._salt_lengths.append(0)
+            self._hashes += password_hash.encode('utf-8')
+        self._hash_offsets.append(len(self._hashes))
+
+    def _read_hash(self, row: int, start: int, end: int) -> str:
+        code = self._hash_method_codes[row]
+        if code == _RAW_HASH:
+            return self._hashes[start:end].decode('utf-8')
+        split = start + self._salt_lengths[row]
+        salt = self._hashes[start:split].decode('ascii')
+        digest = self._hashes[split:end].hex()
+        return f'{self._hash_methods[code]}${salt}${digest}'
+
+    def _delete_row(self, row: int) -> None:
+        self._emails[row] = None
+        self._names[row] = None
+        self._roles[row] = _TOMBSTONE
+        self._dead += 1
+        if self._dead > len(self._rows):
+            self.compact()
+
+
+def _split_hash(password_hash: str) -> Optional[Tuple[str, bytes, bytes]]:
+    """Split ``method$salt$hexdigest`` into packable parts, if it is one"""
+    method, _, rest = password_hash.partition('$')
+    salt, _, digest = rest.rpartition('$')
+    if not (method and salt and digest) or len(salt) > 255:
+        return None
+    try:
+        raw = bytes.fromhex(digest)
+        salt_bytes = salt.encode('ascii')
+    except ValueError:
+        return None
+    # Only pack when decoding reproduces the exact original text
+    if raw.hex() != digest:
+        return None
+    return method, salt_bytes, raw
@@ -1,50 +1,95 @@
 # repositories/user_repository.py
+"""
+Users keyed by email, persisted to ``file_path``.
+
+The mapping is copy-on-write: a write copies it, changes the copy and
+publishes it by swapping ``self.users`` (a single reference assignment)
+before persisting it; if persisting fails the previous mapping is put
+back. Readers just take the current reference, so they never lock,
+never wait for a write and never see one half done, while writes are
+serialized by a lock that also covers their check-then-set. Writes were
+already O(n) because they rewrite the whole file, so the copy keeps
+their order.
+"""
 import os
 import logging
-from typing import Dict, List, Optional
-from models.user import UserDTO, UserRole
+import threading
+from typing import Dict, List, MutableMapping, Optional, Sequence
+from common import metrics, tracing
+from models.user import SAFE_FIELDS, UserDTO
+from repositories.compact_user_store import CompactUserStore
 
 logger = logging.getLogger(__name__)
 
+PERSIST_SECONDS = metrics.histogram(
+    'repository_persist_duration_seconds',
+    'Time spent writing a repository to durable storage',
+    ['repository']
+)
+
 
 class UserRepository:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, compact: bool = False):
         self.file_path = file_path
-        self.users: Dict[str, UserDTO] = {}
+        self.compact = compact
+        self._write_lock = threading.RLock()
+        self.users: MutableMapping[str, UserDTO] = self._new_store()
         self._load_users()
 
+    def _new_store(self) -> MutableMapping[str, UserDTO]:
+        return CompactUserStore() if self.compact else {}
+
     def _load_users(self) -> None:
         try:
             if os.path.exists(self.file_path):
                 with open(self.file_path, 'r') as file:
                     content = file.read()
                     users_dict = eval(content.split('=')[1].strip())
-                    self.users = {
-                        email: UserDTO(
-                            email=email,
-                            name=user['name'],
-                            role=UserRole(user['role']),
-                            password_hash=user['password']
-                        )
-                        for email, user in users_dict.items()
-                    }
+                    users = self._new_store()
+                    for email, user in users_dict.items():
+                        users[email] = UserDTO.from_record(email, user)
+                    self.users = users
                 logger.info(f"Successfully loaded {len(self.users)} users")
         except Exception as e:
             logger.error(f"Error loading users: {str(e)}")
-            self.users = {}
+            self.users = self._new_store()
+
+    def reload(self) -> None:
+        """Re-read the user file, e.g. in a freshly forked worker"""
+        # A forked worker may inherit the lock in a held state
+        self._write_lock = threading.RLock()
+        with self._write_lock:
+            self._load_users()
+
+    def _publish(self, users: MutableMapping[str, UserDTO]) -> None:
+        """Make ``users`` current and persist it, or restore the previous mapping"""
+        previous = self.users
+        self.users = users
+        try:
+            self.save_users()
+        except Exception:
+            self.users = previous
+            raise
 
     def save_users(self) -> None:
         try:
-            users_dict = {
-                user.email: {
-                    'name': user.name,
-                    'password': user.password_hash,
-                    'role': user.role.value
-                }
-                for user in self.users.values()
-            }
-            with open(self.file_path, 'w') as file:
-                file.write(f"users = {repr(users_dict)}")
+            with self._write_lock:
+                users = self.users
+                with tracing.span('user_repository.save_users', users=len(users)), \
+                        PERSIST_SECONDS.time(repository='users'):
+                    users_dict = {
+                        user.email: {
+                            'name': user.name,
+                            'password': user.password_hash,
+                            'role': user.role.value
+                        }
+                        for user in users.values()
+                    }
+                    # Replace the file atomically so a crash never leaves half of it
+                    temporary = f'{self.file_path}.tmp'
+                    with open(temporary, 'w') as file:
+                        file.write(f"users = {repr(users_dict)}")
+                    os.replace(temporary, self.file_path)
             logger.info("Users saved successfully")
         except Exception as e:
             logger.error(f"Error saving users: {str(e)}")
@@ -54,10 +99,56 @@ class UserRepository:
         return self.users.get(email)
 
     def create_user(self, user: UserDTO) -> None:
-        if self.get_user(user.email):
-            raise ValueError("User already exists")
-        self.users[user.email] = user
-        self.save_users()
+        with self._write_lock:
+            if user.email in self.users:
+                raise ValueError("User already exists")
+            users = self.users.copy()
+            users[user.email] = user
+            self._publish(users)
+
+    def delete_user(self, email: str) -> bool:
+        """Remove a user; False if there is none with ``email``"""
+        with self._write_lock:
+            if email not in self.users:
+                return False
+            users = self.users.copy()
+            del users[email]
+            self._publish(users)
+            return True
+
+    def create_users(self, users: List[UserDTO]) -> List[bool]:
+        """
+        Inserts every user whose email is free and persists once.
+
+        Returns a created flag per user, in input order.
+        """
+        with self._write_lock:
+            current = self.users.copy()
+            created = []
+            for user in users:
+                if user.email in current:
+                    created.append(False)
+                else:
+                    current[user.email] = user
+                    created.append(True)
+            if any(created):
+                self._publish(current)
+            return created
 
     def get_all_users(self) -> List[UserDTO]:
         return list(self.users.values())
+
+    def list_users(self, fields: Sequence[str] = SAFE_FIELDS) -> Dict[str, Dict]:
+        """Safe view of every user keyed by email, limited to ``fields``"""
+        users = self.users
+        if self.compact:
+            return users.project(fields)
+        getters = {
+            'name': lambda user: user.name,
+            'role': lambda user: user.role.value,
+        }
+        columns = [(field, getters[field]) for field in fields]
+        return {
+            email: {field: get(user) for field, get in columns}
+            for email, user in users.items()
+        }
@@ -102,6 +102,26 @@ def setup_user_routes(api, user_controller: UserController, user_service: UserSe
         )
     })
 
+    batch_registration_model = api.model('BatchRegistration', {
+        'users': fields.List(
+            fields.Nested(user_model),
+            required=True,
+            description='Users to register'
+        )
+    })
+
+    batch_result = user_ns.model('BatchRegistrationResult', {
+        'email': fields.String(example='john.doe@example.com'),
+        'status': fields.Integer(example=201),
+        'message': fields.String(example='User registered successfully')
+    })
+
+    batch_response = user_ns.model('BatchRegistrationResponse', {
+        'registered': fields.Integer(example=1),
+        'failed': fields.Integer(example=0),
+        'results': fields.List(fields.Nested(batch_result))
+    })
+
     login_model = api.model('Login', {
         'email': fields.String(
             required=True,
@@ -121,6 +141,8 @@ def setup_user_routes(api, user_controller: UserController, user_service: UserSe
         @api.response(201, 'User successfully created', user_profile_response)
         @api.response(400, 'Validation Error', error_response)
         @api.response(409, 'User already exists', error_response)
+        @api.response(429, 'Too many attempts', error_response)
+        @api.response(503, 'User file could not be written', error_response)
         def post(self) -> Dict[str, Any]:
             """
             Register a new user
@@ -133,11 +155,36 @@ def setup_user_routes(api, user_controller: UserController, user_service: UserSe
             """
             return user_controller.register_user(request.json)
 
+    @user_ns.route('/register/batch')
+    class UserBatchRegistration(Resource):
+        @api.doc(security='Bearer Auth')
+        @token_required(roles=[UserRole.ADMIN.value])
+        @api.expect(batch_registration_model)
+        @api.response(200, 'Per-user registration results', batch_response)
+        @api.response(400, 'Validation Error', error_response)
+        @api.response(403, 'Insufficient permissions', error_response)
+        @api.response(413, 'Batch too large', error_response)
+        @api.response(503, 'User file could not be written', error_response)
+        def post(self) -> Dict[str, Any]:
+            """
+            Register many users at once (Admin only)
+
+            Validates every record, hashes passwords in parallel and
+            stores all new users with a single write. Each record gets
+            its own status: 201 when created, 400 when invalid and 409
+            when the email is already registered.
+            """
+            data = request.json or {}
+            if not isinstance(data, dict):
+                return {'message': 'Expected an object with a users list'}, 400
+            return user_controller.register_users_batch(data.get('users'))
+
     @user_ns.route('/login')
     class UserLogin(Resource):
         @api.expect(login_model)
         @api.response(200, 'Login successful', token_response)
         @api.response(401, 'Invalid credentials', error_response)
+        @api.response(429, 'Too many attempts', error_response)
         def post(self) -> Dict[str, Any]:
             """
             Authenticate user and return token
@@ -157,6 +204,7 @@ def setup_user_routes(api, user_controller: UserController, user_service: UserSe
         @api.response(200, 'Success', [user_profile_response])
         @api.response(401, 'Authentication error', error_response)
         @api.response(403, 'Insufficient permissions', error_response)
+        @api.doc(params={'fields': 'Comma-separated fields to return: name, role'})
         def get(self) -> Dict[str, Any]:
             """
             Get all users (Admin only)
@@ -165,7 +213,7 @@ def setup_user_routes(api, user_controller: UserController, user_service: UserSe
             This endpoint is restricted to
             administrators only and requires a valid JWT token with admin role.
             """
-            return user_controller.get_all_users()
+            return user_controller.get_all_users(request.args.get('fields'))
 
     @user_ns.route('/profile')
     class UserProfile(Resource):
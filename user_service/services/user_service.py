@@ -4,6 +4,13 @@ from typing import Dict
 import jwt
 from flask import current_app
 from werkzeug.security import generate_password_hash, check_password_hash
+from common import metrics, tracing
+
+PASSWORD_HASH_SECONDS = metrics.histogram(
+    'password_hash_duration_seconds',
+    'Time spent hashing or verifying passwords',
+    ['operation']
+)
 
 
 class UserService:
@@ -30,8 +37,12 @@ class UserService:
 
     @staticmethod
     def hash_password(password: str) -> str:
-        return generate_password_hash(password)
+        with tracing.span('password.hash'), \
+                PASSWORD_HASH_SECONDS.time(operation='hash'):
+            return generate_password_hash(password)
 
     @staticmethod
     def verify_password(password_hash: str, password: str) -> bool:
-        return check_password_hash(password_hash, password)
+        with tracing.span('password.verify'), \
+                PASSWORD_HASH_SECONDS.time(operation='verify'):
+            return check_password_hash(password_hash, password)
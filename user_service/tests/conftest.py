@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable for the service modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
@@ -0,0 +1,95 @@
+import pytest
+import os
+import tempfile
+from models.user import UserDTO, UserRole
+from repositories.compact_user_store import CompactUserStore
+from repositories.user_repository import UserRepository
+
+
+class TestCompactUserStore:
+    @pytest.fixture
+    def store(self):
+        store = CompactUserStore()
+        store["user1@example.com"] = UserDTO(
+            "user1@example.com", "User One", UserRole.USER, "hash1"
+        )
+        store["admin@example.com"] = UserDTO(
+            "admin@example.com", "Admin User", UserRole.ADMIN, "hash2"
+        )
+        return store
+
+    def test_get_materializes_equal_user(self, store):
+        """Test stored users round-trip to equal UserDTO objects"""
+        assert store["admin@example.com"] == UserDTO(
+            "admin@example.com", "Admin User", UserRole.ADMIN, "hash2"
+        )
+        assert store.get("missing@example.com") is None
+
+    def test_len_contains_and_iteration(self, store):
+        """Test mapping protocol over the columnar layout"""
+        assert len(store) == 2
+        assert "user1@example.com" in store
+        assert list(store) == ["user1@example.com", "admin@example.com"]
+        assert [u.email for u in store.values()] == list(store)
+
+    def test_overwrite_and_delete(self, store):
+        """Test replacing and removing users keeps other rows intact"""
+        store["user1@example.com"] = UserDTO(
+            "user1@example.com", "Renamed", UserRole.ADMIN, "hash3"
+        )
+        del store["admin@example.com"]
+
+        assert len(store) == 1
+        user = store["user1@example.com"]
+        assert user.name == "Renamed"
+        assert user.role == UserRole.ADMIN
+        assert user.password_hash == "hash3"
+        with pytest.raises(KeyError):
+            store["admin@example.com"]
+
+    def test_werkzeug_hash_is_packed_losslessly(self):
+        """Test method$salt$hex hashes are stored packed and restored exactly"""
+        password_hash = (
+            'scrypt:32768:8:1$ev7p0ZD2hXoUVj3s$f1e6921795751f678e89b2e3fbb1'
+            '50e75b01caaab279529c35eebaf36225e0'
+        )
+        store = CompactUserStore()
+        store["a@example.com"] = UserDTO(
+            "a@example.com", "A", UserRole.USER, password_hash
+        )
+
+        assert store._hash_methods == ['scrypt:32768:8:1']
+        assert len(store._hashes) < len(password_hash)
+        assert store["a@example.com"].password_hash == password_hash
+
+    def test_compact_reclaims_deleted_rows(self, store):
+        """Test compaction drops tombstoned hash bytes"""
+        del store["user1@example.com"]
+        store.compact()
+
+        assert len(store._emails) == 1
+        assert bytes(store._hashes) == b"hash2"
+        assert store["admin@example.com"].password_hash == "hash2"
+
+
+class TestCompactUserRepository:
+    @pytest.fixture
+    def temp_file(self):
+        """Create a temporary file for testing"""
+        fd, path = tempfile.mkstemp()
+        yield path
+        os.close(fd)
+        os.unlink(path)
+
+    def test_compact_repository_round_trip(self, temp_file):
+        """Test a compact repository persists and reloads like the default"""
+        repository = UserRepository(temp_file, compact=True)
+        assert isinstance(repository.users, CompactUserStore)
+
+        user = UserDTO("new@example.com", "New User", UserRole.USER, "hash")
+        repository.create_user(user)
+
+        reloaded = UserRepository(temp_file, compact=True)
+        assert isinstance(reloaded.users, CompactUserStore)
+        assert reloaded.get_user("new@example.com") == user
+        assert reloaded.get_all_users() == [user]
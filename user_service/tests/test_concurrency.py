@@ -0,0 +1,98 @@
+import random
+import threading
+from collections import Counter
+
+import pytest
+
+from models.user import UserDTO, UserRole
+from repositories.user_repository import UserRepository
+
+THREADS = 8
+
+
+def run_threads(target, count=THREADS):
+    errors = []
+
+    def guarded(index):
+        try:
+            target(index)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+@pytest.fixture(params=[False, True], ids=['dict', 'compact'])
+def repository(request, tmp_path):
+    return UserRepository(str(tmp_path / 'users.txt'), compact=request.param)
+
+
+def make_user(email):
+    return UserDTO(email, 'Racer', UserRole.USER, 'pbkdf2:sha256:1$salt$ab12')
+
+
+class TestUserRepositoryConcurrency:
+    def test_concurrent_create_has_one_winner(self, repository):
+        """Test racing creates of one email succeed exactly once"""
+        barrier = threading.Barrier(THREADS)
+        outcomes = []
+
+        def create(_):
+            barrier.wait()
+            try:
+                repository.create_user(make_user('race@example.com'))
+                outcomes.append('created')
+            except ValueError:
+                outcomes.append('exists')
+
+        run_threads(create)
+        assert Counter(outcomes) == {'created': 1, 'exists': THREADS - 1}
+        assert UserRepository(repository.file_path).get_user('race@example.com')
+
+    def test_create_delete_history_is_linearizable(self, repository):
+        """Test per-email successes alternate create/delete and match the final state"""
+        emails = [f'user{i}@example.com' for i in range(4)]
+        history = []
+        stop = threading.Event()
+        reads = []
+
+        def write(index):
+            rng = random.Random(index)
+            for _ in range(40):
+                email = rng.choice(emails)
+                if rng.random() < 0.5:
+                    try:
+                        repository.create_user(make_user(email))
+                        history.append(('create', email))
+                    except ValueError:
+                        pass
+                elif repository.delete_user(email):
+                    history.append(('delete', email))
+
+        def read():
+            while not stop.is_set():
+                listed = repository.list_users()
+                reads.append(len(listed))
+                for email in listed:
+                    assert email in emails
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        run_threads(write)
+        stop.set()
+        reader.join()
+
+        for email in emails:
+            ops = [op for op, target in history if target == email]
+            # Each successful op flips presence, so the counts differ by at most one
+            creates, deletes = ops.count('create'), ops.count('delete')
+            assert creates - deletes in (0, 1)
+            assert (repository.get_user(email) is not None) == (creates > deletes)
+        assert reads and max(reads) <= len(emails)
+        reloaded = UserRepository(repository.file_path)
+        assert set(reloaded.list_users()) == set(repository.list_users())
@@ -0,0 +1,77 @@
+import pytest
+from app import create_app
+from config import DevelopmentConfig
+
+
+@pytest.fixture
+def client(tmp_path):
+    class Config(DevelopmentConfig):
+        USERS_FILE = str(tmp_path / 'users.py')
+        RATE_LIMIT_IP = '4/60'
+        RATE_LIMIT_EMAIL = '2/60'
+        RATE_LIMIT_REDIS_URL = None
+
+    return create_app(Config).test_client()
+
+
+def login(client, email):
+    return client.post('/user/login', json={'email': email, 'password': 'Wrong#123'})
+
+
+def test_login_limited_per_email(client):
+    """Test a target email is locked out after its burst, whatever the letter case"""
+    assert login(client, 'victim@example.com').status_code == 401
+    assert login(client, 'Victim@Example.com ').status_code == 401
+    response = login(client, 'victim@example.com')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) == 30
+    assert login(client, 'other@example.com').status_code == 401
+
+
+def test_login_and_register_limited_per_ip(client):
+    """Test one client spraying many emails is stopped by the IP bucket"""
+    statuses = [login(client, f'user{i}@example.com').status_code for i in range(5)]
+    assert statuses == [401, 401, 401, 401, 429]
+    # Registration has its own buckets
+    response = client.post('/user/register', json={'email': 'new@example.com'})
+    assert response.status_code == 400
+
+
+def test_refused_attempt_takes_no_ip_token(client):
+    """Test an attempt refused for its email does not use up the client's IP budget"""
+    emails = ['victim@example.com'] * 3 + [f'user{i}@example.com' for i in range(3)]
+    statuses = [login(client, email).status_code for email in emails]
+    assert statuses == [401, 401, 429, 401, 401, 429]
+
+
+def test_throttled_before_admission(tmp_path):
+    """Test a throttled attempt is refused without entering the admission queue"""
+    class Config(DevelopmentConfig):
+        USERS_FILE = str(tmp_path / 'users.py')
+        RATE_LIMIT_IP = ''
+        RATE_LIMIT_EMAIL = '1/60'
+        RATE_LIMIT_REDIS_URL = None
+        ADMISSION_LIMITS = 'user_user_login=1:0'
+
+    app = create_app(Config)
+    client = app.test_client()
+    assert login(client, 'victim@example.com').status_code == 401
+    limiter = app.extensions['admission_limiters']['user_user_login']
+    limiter.acquire()  # a login in progress
+    try:
+        assert login(client, 'victim@example.com').status_code == 429
+        assert login(client, 'other@example.com').status_code == 503
+    finally:
+        limiter.release()
+
+
+def test_limits_can_be_disabled(tmp_path):
+    """Test empty limits let every attempt through"""
+    class Config(DevelopmentConfig):
+        USERS_FILE = str(tmp_path / 'users.py')
+        RATE_LIMIT_IP = ''
+        RATE_LIMIT_EMAIL = ''
+        RATE_LIMIT_REDIS_URL = None
+
+    client = create_app(Config).test_client()
+    assert {login(client, 'victim@example.com').status_code for _ in range(20)} == {401}
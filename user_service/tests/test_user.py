@@ -48,6 +48,28 @@ class TestUserDTO:
         assert 'email' not in safe_dict
         assert 'password_hash' not in safe_dict
 
+    def test_user_dto_has_no_instance_dict(self, sample_user):
+        """Test UserDTO is slotted and carries no per-instance __dict__"""
+        assert not hasattr(sample_user, '__dict__')
+        with pytest.raises(AttributeError):
+            sample_user.extra = 'value'
+
+    def test_from_record_shares_roles(self):
+        """Test from_record shares role objects but leaves unique names alone"""
+        first = UserDTO.from_record(
+            "a@example.com",
+            {'name': ('Shared Name ')[:-1], 'role': 'Admin',
+             'password': 'hash'}
+        )
+        second = UserDTO.from_record(
+            "b@example.com",
+            {'name': ('Shared Name ')[:-1], 'role': 'Admin',
+             'password': 'hash'}
+        )
+        assert first.role is second.role is UserRole.ADMIN
+        assert first.name == second.name
+        assert first.name is not second.name
+
 
 class TestUserRepository:
     @pytest.fixture
@@ -70,6 +70,111 @@ class TestUserController(unittest.TestCase):
         self.assertEqual(status_code, 400)
         self.assertIn('Invalid role', response['message'])
 
+    def test_register_user_non_string_fields(self):
+        # Arrange
+        data = {
+            'email': 'test@example.com',
+            'password': 12345678,
+            'name': ['Test', 'User'],
+            'role': 'User'
+        }
+
+        # Act
+        response, status_code = self.controller.register_user(data)
+
+        # Assert
+        self.assertEqual(status_code, 400)
+        self.assertIn('Fields must be strings', response['message'])
+        self.mock_user_service.hash_password.assert_not_called()
+        self.mock_user_repository.create_user.assert_not_called()
+
+    def test_register_user_save_failure(self):
+        # Arrange
+        data = {
+            'email': 'test@example.com',
+            'password': 'password123',
+            'name': 'Test User',
+            'role': 'User'
+        }
+        self.mock_user_service.hash_password.return_value = 'hashed_password'
+        self.mock_user_repository.create_user.side_effect = PermissionError('denied')
+
+        # Act
+        response, status_code = self.controller.register_user(data)
+
+        # Assert
+        self.assertEqual(status_code, 503)
+        self.assertIn('Could not save users', response['message'])
+
+    def test_register_users_batch(self):
+        # Arrange
+        records = [
+            {'email': 'new@example.com', 'password': 'pw1',
+             'name': 'New', 'role': 'User'},
+            {'email': 'bad@example.com', 'name': 'Bad', 'role': 'User'},
+            {'email': 'taken@example.com', 'password': 'pw2',
+             'name': 'Taken', 'role': 'Admin'},
+            {'email': 'new@example.com', 'password': 'pw3',
+             'name': 'Again', 'role': 'User'},
+        ]
+        self.mock_user_repository.get_user.side_effect = (
+            lambda email: object() if email == 'taken@example.com' else None
+        )
+        self.mock_user_repository.create_users.return_value = [True]
+        self.mock_user_service.hash_password.side_effect = (
+            lambda password: f'hashed-{password}'
+        )
+
+        # Act
+        response, status_code = self.controller.register_users_batch(records)
+
+        # Assert
+        self.assertEqual(status_code, 200)
+        self.assertEqual(response['registered'], 1)
+        self.assertEqual(response['failed'], 3)
+        self.assertEqual(
+            [r['status'] for r in response['results']], [201, 400, 409, 409]
+        )
+        self.mock_user_service.hash_password.assert_called_once_with('pw1')
+        (users,), _ = self.mock_user_repository.create_users.call_args
+        self.assertEqual([u.email for u in users], ['new@example.com'])
+        self.assertEqual(users[0].password_hash, 'hashed-pw1')
+
+    def test_register_users_batch_rejects_non_string_fields(self):
+        # Arrange
+        records = [
+            {'email': ['a@example.com'], 'password': 'pw1', 'name': 'A', 'role': 'User'},
+            {'email': 'b@example.com', 'password': 2, 'name': 'B', 'role': 'User'},
+            {'email': 'c@example.com', 'password': 'pw3', 'name': 'C', 'role': 'User'},
+        ]
+        self.mock_user_repository.get_user.return_value = None
+        self.mock_user_repository.create_users.return_value = [True]
+        self.mock_user_service.hash_password.side_effect = (
+            lambda password: f'hashed-{password}'
+        )
+
+        # Act
+        response, status_code = self.controller.register_users_batch(records)
+
+        # Assert
+        self.assertEqual(status_code, 200)
+        self.assertEqual(
+            [r['status'] for r in response['results']], [400, 400, 201]
+        )
+        self.mock_user_service.hash_password.assert_called_once_with('pw3')
+
+    def test_register_users_batch_too_large(self):
+        # Arrange
+        self.controller.max_batch_size = 1
+        records = [{'email': 'a@example.com'}, {'email': 'b@example.com'}]
+
+        # Act
+        response, status_code = self.controller.register_users_batch(records)
+
+        # Assert
+        self.assertEqual(status_code, 413)
+        self.mock_user_repository.create_users.assert_not_called()
+
     def test_login_user_success(self):
         # Arrange
         data = {'email': 'test@example.com', 'password': 'password123'}
@@ -144,6 +249,25 @@ class TestUserController(unittest.TestCase):
         self.assertIn('user1@example.com', response)
         self.assertIn('user2@example.com', response)
 
+    def test_get_all_users_with_fields(self):
+        self.mock_user_repository.list_users.return_value = {
+            'user1@example.com': {'role': 'Admin'}
+        }
+
+        response, status_code = self.controller.get_all_users(' role,role ')
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(response, {'user1@example.com': {'role': 'Admin'}})
+        self.mock_user_repository.list_users.assert_called_once_with(('role',))
+        self.mock_user_repository.get_all_users.assert_not_called()
+
+    def test_get_all_users_with_unknown_fields(self):
+        response, status_code = self.controller.get_all_users('name,password')
+
+        self.assertEqual(status_code, 400)
+        self.assertIn('password', response['message'])
+        self.mock_user_repository.list_users.assert_not_called()
+
     def test_get_user_profile_success(self):
         # Arrange
         token = 'mock_token'
@@ -104,9 +104,10 @@ class TestUserRepository:
         assert saved_user.role == user.role
         assert saved_user.password_hash == user.password_hash
 
-    def test_save_users_with_permission_error(self, empty_repository):
-        """Test saving users with insufficient permissions"""
-        empty_repository.file_path = "/root/test_users.py"
+    def test_save_users_with_permission_error(self, empty_repository, tmp_path):
+        """Test a failed write raises and leaves the user unregistered"""
+        # Unwritable even when the tests run as root
+        empty_repository.file_path = str(tmp_path / "missing" / "users.py")
 
         user = UserDTO(
             email="test@example.com",
@@ -115,8 +116,9 @@ class TestUserRepository:
             password_hash="hash"
         )
 
-        with pytest.raises(Exception):
+        with pytest.raises(OSError):
             empty_repository.create_user(user)
+        assert empty_repository.get_user("test@example.com") is None
 
     def test_get_user_existing(self, populated_repository):
         """Test retrieving an existing user"""
@@ -156,6 +158,34 @@ class TestUserRepository:
         with pytest.raises(ValueError, match="User already exists"):
             populated_repository.create_user(duplicate_user)
 
+    def test_create_users_saves_once(self, populated_repository, monkeypatch):
+        """Test bulk creation skips existing emails and persists once"""
+        saves = []
+        monkeypatch.setattr(
+            populated_repository, 'save_users', lambda: saves.append(True)
+        )
+        users = [
+            UserDTO("bulk1@example.com", "Bulk One", UserRole.USER, "h1"),
+            UserDTO("test@example.com", "Existing", UserRole.USER, "h2"),
+            UserDTO("bulk2@example.com", "Bulk Two", UserRole.ADMIN, "h3"),
+        ]
+
+        created = populated_repository.create_users(users)
+
+        assert created == [True, False, True]
+        assert len(saves) == 1
+        assert populated_repository.get_user("test@example.com").name == "Test User"
+        assert populated_repository.get_user("bulk2@example.com") == users[2]
+
+    def test_reload_picks_up_external_changes(self, populated_repository):
+        """Test reload re-reads users written by another process"""
+        other = UserRepository(populated_repository.file_path)
+        other.create_user(UserDTO("other@example.com", "Other", UserRole.USER, "h"))
+        assert populated_repository.get_user("other@example.com") is None
+
+        populated_repository.reload()
+        assert populated_repository.get_user("other@example.com") is not None
+
     def test_get_all_users(self, populated_repository, sample_user_data):
         """Test retrieving all users"""
         users = populated_repository.get_all_users()
@@ -164,6 +194,19 @@ class TestUserRepository:
         emails = [user.email for user in users]
         assert all(email in emails for email in sample_user_data.keys())
 
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_list_users_projects_fields(self, populated_file, compact):
+        """Test listings contain only the requested safe fields"""
+        repository = UserRepository(populated_file, compact=compact)
+        assert repository.list_users() == {
+            'test@example.com': {'name': 'Test User', 'role': 'User'},
+            'admin@example.com': {'name': 'Admin User', 'role': 'Admin'},
+        }
+        assert repository.list_users(('role',)) == {
+            'test@example.com': {'role': 'User'},
+            'admin@example.com': {'role': 'Admin'},
+        }
+
     @pytest.mark.parametrize("invalid_content", [
         "users = invalid_python_syntax",
         "users = None",
@@ -179,7 +222,7 @@ class TestUserRepository:
         repo = UserRepository(temp_file)
         assert len(repo.users) == 0
 
-    def test_logging(self, caplog, populated_file):
+    def test_logging(self, caplog, populated_file, tmp_path):
         """Test if proper logging messages are generated"""
         with caplog.at_level(logging.INFO):
             repo = UserRepository(populated_file)
@@ -197,7 +240,7 @@ class TestUserRepository:
 
         # Test logging for errors
         with caplog.at_level(logging.ERROR):
-            repo.file_path = "/root/test_users.py"
-            with pytest.raises(Exception):
+            repo.file_path = str(tmp_path / "missing" / "users.py")
+            with pytest.raises(OSError):
                 repo.save_users()
             assert "Error saving users:" in caplog.text